@@ -0,0 +1,109 @@
+"""Entry point for the Blossy benchmarks."""
+
+import tempfile
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from benchmarks.cases import Scale, get_benchmarks
+from benchmarks.runner import Result, compare, load_results, run_benchmark, save_results
+
+_BENCHMARKS_DIR = Path(__file__).parent
+
+app = typer.Typer(name="benchmarks", add_completion=False)
+
+
+@app.command()
+def main(
+    names: Annotated[
+        list[str] | None,
+        typer.Argument(show_default=False, help="Benchmarks to run (all of them by default)."),
+    ] = None,
+    scale: Annotated[Scale, typer.Option("--scale", help="Size of the corpora.")] = Scale.SMALL,
+    repeat: Annotated[int, typer.Option("--repeat", "-r", help="Runs of each benchmark.")] = 3,
+    workdir: Annotated[
+        Path,
+        typer.Option("--workdir", help="Directory where the corpora are generated and kept."),
+    ] = Path(tempfile.gettempdir())
+    / "blossy-benchmarks",
+    output: Annotated[
+        Path, typer.Option("--output", "-o", help="File to write the results to.")
+    ] = _BENCHMARKS_DIR
+    / "results.json",
+    baseline: Annotated[
+        Path | None,
+        typer.Option(
+            "--baseline",
+            show_default=False,
+            help="Results to compare to (the stored baseline of the scale by default).",
+        ),
+    ] = None,
+    save_baseline: Annotated[
+        bool, typer.Option("--save-baseline", help="Store the results as the new baseline.")
+    ] = False,
+    tolerance: Annotated[
+        float, typer.Option("--tolerance", help="Relative change accepted before a regression.")
+    ] = 0.1,
+):
+    """
+    Run the benchmarks over deterministic synthetic corpora, write their
+    throughput and peak memory to a JSON file and compare them to a baseline.
+
+    Exits with code 1 if any benchmark regressed beyond the tolerance.
+    """
+    if repeat < 1:
+        raise typer.BadParameter("Quantity of runs must be positive.")
+    if tolerance < 0:
+        raise typer.BadParameter("Tolerance can't be negative.")
+
+    benchmarks = get_benchmarks(workdir, scale)
+    unknown = set(names or ()) - {benchmark.name for benchmark in benchmarks}
+    if unknown:
+        raise typer.BadParameter(f"Unknown benchmarks: {', '.join(sorted(unknown))}.")
+
+    results: list[Result] = []
+    width = max(len(benchmark.name) for benchmark in benchmarks)
+    for benchmark in benchmarks:
+        if names and benchmark.name not in names:
+            continue
+        result = run_benchmark(benchmark, repeat)
+        results.append(result)
+        typer.echo(
+            f"{result.name:<{width}}  {result.secs:>8.3f}s  "
+            f"{result.throughput:>14,.1f} {result.unit}/s  {result.peak_mib:>9.2f} MiB peak"
+        )
+    save_results(output, results, scale)
+
+    baseline = baseline or _BENCHMARKS_DIR / f"baseline-{scale}.json"
+    if save_baseline:
+        save_results(baseline, results, scale)
+        typer.echo(f"Baseline stored in '{baseline}'.")
+        return
+    if not baseline.exists():
+        typer.echo(f"No baseline in '{baseline}' to compare to.")
+        return
+
+    if _compare(results, baseline, scale, tolerance):
+        raise typer.Exit(code=1)
+
+
+def _compare(results: list[Result], baseline: Path, scale: Scale, tolerance: float) -> bool:
+    metadata, base_results = load_results(baseline)
+    if metadata["scale"] != scale:
+        raise typer.BadParameter(f"'{baseline}' was measured at the '{metadata['scale']}' scale.")
+
+    typer.echo(f"\nCompared to the baseline of {metadata['created']} ({metadata['platform']}):")
+    comparisons = compare(results, base_results, tolerance)
+    width = max((len(comparison.name) for comparison in comparisons), default=0)
+    for comparison in comparisons:
+        typer.echo(
+            f"{comparison.name:<{width}}  {comparison.throughput_change:>+8.1%} throughput  "
+            f"{comparison.peak_change:>+8.1%} peak"
+            + ("  REGRESSION" if comparison.regressed else "")
+        )
+    return any(comparison.regressed for comparison in comparisons)
+
+
+if __name__ == "__main__":
+    app()
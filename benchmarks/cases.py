@@ -0,0 +1,210 @@
+"""Benchmarks of the hot paths of Blossy, run through the use case factories."""
+
+import shutil
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+from benchmarks.generators import (
+    generate_expressions,
+    make_files,
+    make_tree,
+    write_csv,
+    write_text,
+)
+from blossy.calc.service import ExpressionLexer, ExpressionParser
+from blossy.calc.use_case import CalculateUseCaseFactory, PostfixedExpressionParser
+from blossy.countc.use_case import CountCharactersUseCaseFactory
+from blossy.countl.use_case import CountLinesUseCaseFactory
+from blossy.perc.model import BatchOutputFormat
+from blossy.perc.use_case import PercentageUseCaseFactory
+from blossy.rand.model import OutputFormat, SamplingAlgorithm
+from blossy.rand.use_case import RandomUseCaseFactory
+from blossy.shared.adapter import FileAdapter
+from blossy.stddz.model import SortKey
+from blossy.stddz.repository import RenameJournal
+from blossy.stddz.use_case import StandardizeUseCaseFactory
+
+_SEED = 42
+_MIB = 1 << 20
+
+
+class Scale(StrEnum):
+    """Size of the synthetic corpora."""
+
+    SMALL = "small"
+    FULL = "full"
+
+
+@dataclass(frozen=True)
+class _Sizes:
+    """Sizes of the synthetic corpora of a scale."""
+
+    text_mib: int
+    qt_files: int
+    qt_dirs: int
+    qt_files_per_dir: int
+    qt_numbers: int
+    qt_rows: int
+    qt_expressions: int
+
+
+_SIZES = {
+    Scale.SMALL: _Sizes(32, 20_000, 100, 100, 500_000, 200_000, 5_000),
+    Scale.FULL: _Sizes(1024, 1_000_000, 2_000, 500, 50_000_000, 5_000_000, 100_000),
+}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """Hot path measured by running it over a synthetic corpus."""
+
+    name: str
+    unit: str
+    quantity: float
+    run: Callable[[], None]
+    setup: Callable[[], None] = lambda: None
+
+
+def get_benchmarks(workdir: Path, scale: Scale) -> list[Benchmark]:
+    """Get every benchmark, whose setup generates the corpora missing from the working directory."""
+    sizes = _SIZES[scale]
+    corpus_dir = workdir / scale
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    return [
+        *_get_count_benchmarks(corpus_dir, sizes),
+        *_get_stddz_benchmarks(corpus_dir, sizes),
+        *_get_rand_benchmarks(corpus_dir, sizes),
+        *_get_perc_benchmarks(corpus_dir, sizes),
+        *_get_calc_benchmarks(sizes),
+    ]
+
+
+def _get_count_benchmarks(corpus_dir: Path, sizes: _Sizes) -> list[Benchmark]:
+    text = corpus_dir / "text.txt"
+    file_adapter = FileAdapter()
+
+    def make_text() -> None:
+        write_text(text, sizes.text_mib * _MIB, _SEED)
+
+    def countc(ignore_unnec: bool, ignore_ws: bool, jobs: int) -> Callable[[], None]:
+        use_case = CountCharactersUseCaseFactory.get_use_case(
+            file_adapter, ignore_unnec, ignore_ws, False, jobs
+        )
+        return lambda: use_case.execute(text)
+
+    def countl(ignore_blank: bool) -> Callable[[], None]:
+        use_case = CountLinesUseCaseFactory.get_use_case(file_adapter, ignore_blank, False)
+        return lambda: use_case.execute(text)
+
+    return [
+        Benchmark("countc", "MiB", sizes.text_mib, countc(False, False, 1), make_text),
+        Benchmark("countc-ignore-ws", "MiB", sizes.text_mib, countc(False, True, 1), make_text),
+        Benchmark("countc-ignore-unnec", "MiB", sizes.text_mib, countc(True, False, 1), make_text),
+        Benchmark("countc-jobs-4", "MiB", sizes.text_mib, countc(True, False, 4), make_text),
+        Benchmark("countl", "MiB", sizes.text_mib, countl(False), make_text),
+        Benchmark("countl-ignore-blank", "MiB", sizes.text_mib, countl(True), make_text),
+    ]
+
+
+def _get_stddz_benchmarks(corpus_dir: Path, sizes: _Sizes) -> list[Benchmark]:
+    # renaming consumes the files, so every run gets a fresh copy of them
+    flat_dir = corpus_dir / "stddz-flat"
+    tree_dir = corpus_dir / "stddz-tree"
+    journal = RenameJournal(corpus_dir / "journal")
+    qt_tree_files = (sizes.qt_dirs + 1) * sizes.qt_files_per_dir
+
+    def make_flat() -> None:
+        shutil.rmtree(flat_dir, ignore_errors=True)
+        make_files(flat_dir, sizes.qt_files, _SEED)
+
+    def make_nested() -> None:
+        shutil.rmtree(tree_dir, ignore_errors=True)
+        make_tree(tree_dir, sizes.qt_dirs, sizes.qt_files_per_dir, _SEED)
+
+    flat = StandardizeUseCaseFactory.get_use_case(journal, SortKey.NAME)
+    natural = StandardizeUseCaseFactory.get_use_case(journal, SortKey.NATURAL)
+    nested = StandardizeUseCaseFactory.get_use_case(journal, SortKey.NAME, jobs=4, recursive=True)
+    return [
+        Benchmark("stddz", "files", sizes.qt_files, lambda: flat.execute("f", flat_dir), make_flat),
+        Benchmark(
+            "stddz-natural",
+            "files",
+            sizes.qt_files,
+            lambda: natural.execute("f", flat_dir),
+            make_flat,
+        ),
+        Benchmark(
+            "stddz-recursive-jobs-4",
+            "files",
+            qt_tree_files,
+            lambda: nested.execute("f", tree_dir),
+            make_nested,
+        ),
+    ]
+
+
+def _get_rand_benchmarks(corpus_dir: Path, sizes: _Sizes) -> list[Benchmark]:
+    output = corpus_dir / "numbers.out"
+    file_adapter = FileAdapter()
+    # each number of a Feistel permutation costs several rounds of hashing, so it gets fewer
+    qt_permuted = sizes.qt_numbers // 20
+
+    def rand(
+        output_format: OutputFormat,
+        jobs: int = 1,
+        algorithm: SamplingAlgorithm | None = None,
+        quantity: int = sizes.qt_numbers,
+    ) -> Callable[[], None]:
+        use_case = RandomUseCaseFactory.get_use_case(
+            file_adapter,
+            _SEED,
+            jobs,
+            unique=algorithm is not None,
+            algorithm=algorithm or SamplingAlgorithm.AUTO,
+            output_format=output_format,
+            output=output,
+        )
+        return lambda: use_case.execute(0, 2**62, quantity)
+
+    return [
+        Benchmark("rand-text", "numbers", sizes.qt_numbers, rand(OutputFormat.TEXT)),
+        Benchmark("rand-bin64", "numbers", sizes.qt_numbers, rand(OutputFormat.BIN64)),
+        Benchmark("rand-bin64-jobs-4", "numbers", sizes.qt_numbers, rand(OutputFormat.BIN64, 4)),
+        Benchmark(
+            "rand-unique-feistel",
+            "numbers",
+            qt_permuted,
+            rand(OutputFormat.BIN64, 1, SamplingAlgorithm.FEISTEL, qt_permuted),
+        ),
+    ]
+
+
+def _get_perc_benchmarks(corpus_dir: Path, sizes: _Sizes) -> list[Benchmark]:
+    table = corpus_dir / "table.csv"
+    use_case = PercentageUseCaseFactory.get_batch_use_case(
+        "whole", "part", None, BatchOutputFormat.CSV
+    )
+    return [
+        Benchmark(
+            "perc-batch",
+            "rows",
+            sizes.qt_rows,
+            lambda: use_case.execute(table),
+            lambda: write_csv(table, sizes.qt_rows, _SEED),
+        )
+    ]
+
+
+def _get_calc_benchmarks(sizes: _Sizes) -> list[Benchmark]:
+    expressions = generate_expressions(sizes.qt_expressions, _SEED)
+    use_case = CalculateUseCaseFactory.get_use_case(
+        ExpressionLexer(), ExpressionParser(), PostfixedExpressionParser(), False
+    )
+
+    def calc() -> None:
+        for expression in expressions:
+            use_case.execute(expression)
+
+    return [Benchmark("calc", "expressions", sizes.qt_expressions, calc)]
@@ -0,0 +1,117 @@
+"""Generators of deterministic synthetic corpora for the benchmarks."""
+
+import os
+import random
+import string
+from pathlib import Path
+
+_BLOCK_SIZE = 1 << 16
+_QT_BLOCKS = 64
+_WORDS = (
+    "blossy",
+    "puppy",
+    "meatloaf",
+    "favorite",
+    "somebody",
+    "say",
+    "is",
+    "my",
+    "café",
+    "naïve",
+    "日本語",
+    "🌸",
+)
+# runs of every kind of whitespace, so that the unnecessary whitespace rules all apply
+_WHITESPACE = (" ", " ", " ", "  ", "\t", " \t ", "\n", "\n", "\n\n", "   \n", "\r\n", "\n\n\n")
+_OPERATORS = ("+", "-", "*", "/")
+_EXTENSIONS = (".txt", ".jpg", ".png", ".md", "")
+
+
+def write_text(path: Path, size: int, seed: int) -> None:
+    """Write about SIZE bytes of words separated by varied whitespace, unless already written."""
+    if path.exists():
+        return
+
+    rng = random.Random(seed)
+    # shuffling a pool of blocks is much faster than drawing every word, and still looks random
+    blocks = [_generate_block(rng) for _ in range(_QT_BLOCKS)]
+    partial = path.with_name(f"{path.name}.partial")
+    with open(partial, "wb") as file:
+        written = 0
+        while written < size:
+            written += file.write(rng.choice(blocks))
+    partial.replace(path)
+
+
+def write_csv(path: Path, qt_rows: int, seed: int) -> None:
+    """Write a CSV file with 'whole' and 'part' columns, unless already written."""
+    if path.exists():
+        return
+
+    rng = random.Random(seed)
+    partial = path.with_name(f"{path.name}.partial")
+    with open(partial, "w", encoding="utf-8", newline="") as file:
+        file.write("id,whole,part\n")
+        for i in range(qt_rows):
+            whole = rng.uniform(1, 1_000_000)
+            file.write(f"{i},{whole:.2f},{rng.uniform(0, whole):.2f}\n")
+    partial.replace(path)
+
+
+def make_files(directory: Path, qt_files: int, seed: int) -> None:
+    """Create a directory of empty files with random names."""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    names: set[str] = set()
+    while len(names) < qt_files:
+        stem = "".join(rng.choices(string.ascii_lowercase + string.digits, k=12))
+        names.add(stem + rng.choice(_EXTENSIONS))
+    for name in names:
+        # creating the files through descriptors skips the buffered file objects
+        os.close(os.open(directory / name, os.O_CREAT | os.O_WRONLY, 0o644))
+
+
+def make_tree(root: Path, qt_dirs: int, qt_files: int, seed: int) -> None:
+    """Create a tree of directories, up to 3 levels deep, with QT_FILES files each."""
+    rng = random.Random(seed)
+    directories = [Path()]
+    for i in range(qt_dirs):
+        parent = rng.choice([directory for directory in directories if len(directory.parts) < 3])
+        directories.append(parent / f"dir{i:05}")
+    for directory in directories:
+        make_files(root / directory, qt_files, rng.randrange(1 << 32))
+
+
+def generate_expressions(qt_expressions: int, seed: int) -> list[str]:
+    """Generate valid CALCULATE expressions of numbers."""
+    rng = random.Random(seed)
+    return [_generate_expression(rng, 4) for _ in range(qt_expressions)]
+
+
+def _generate_block(rng: random.Random) -> bytes:
+    parts: list[str] = []
+    size = 0
+    while size < _BLOCK_SIZE:
+        part = rng.choice(_WORDS) + rng.choice(_WHITESPACE)
+        parts.append(part)
+        size += len(part.encode())
+    return "".join(parts).encode()
+
+
+def _generate_expression(rng: random.Random, depth: int) -> str:
+    if depth == 0 or rng.random() < 0.2:
+        return _generate_number(rng)
+    if rng.random() < 0.1:
+        return f"{_generate_number(rng)} ^ {rng.randint(1, 3)}"
+
+    left = _generate_expression(rng, depth - 1)
+    operator = rng.choice(_OPERATORS)
+    # dividing only by numbers keeps every expression away from a division by zero
+    right = _generate_number(rng) if operator == "/" else _generate_expression(rng, depth - 1)
+    expression = f"{left} {operator} {right}"
+    return f"({expression})" if rng.random() < 0.5 else expression
+
+
+def _generate_number(rng: random.Random) -> str:
+    number = rng.randint(1, 999)
+    return str(number) if rng.random() < 0.7 else f"{number}.{rng.randint(1, 99)}"
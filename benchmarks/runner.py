@@ -0,0 +1,124 @@
+"""Runner of the benchmarks, which records their results and compares them to a baseline."""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks.cases import Benchmark
+
+_MIB = 1 << 20
+
+
+@dataclass(frozen=True)
+class Result:
+    """Measurements of a benchmark."""
+
+    name: str
+    unit: str
+    quantity: float
+    secs: float
+    throughput: float
+    peak_mib: float
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Change of a benchmark's measurements since the baseline."""
+
+    name: str
+    throughput_change: float
+    peak_change: float
+    regressed: bool
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int) -> Result:
+    """Run a benchmark, keeping the median time of the runs."""
+    times: list[float] = []
+    for _ in range(repeat):
+        benchmark.setup()
+        gc.collect()
+        with _quiet():
+            start = time.perf_counter()
+            benchmark.run()
+            times.append(time.perf_counter() - start)
+
+    # tracing the allocations slows everything down, so the peak is measured in a run of its own
+    benchmark.setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with _quiet():
+            benchmark.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    secs = statistics.median(times)
+    return Result(
+        benchmark.name,
+        benchmark.unit,
+        benchmark.quantity,
+        secs,
+        benchmark.quantity / secs if secs > 0 else 0.0,
+        peak / _MIB,
+    )
+
+
+def save_results(path: Path, results: list[Result], scale: str) -> None:
+    """Write the results, along with the environment they were measured in."""
+    metadata = {
+        "scale": scale,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+    document = {"metadata": metadata, "results": [asdict(result) for result in results]}
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def load_results(path: Path) -> tuple[dict[str, Any], dict[str, Result]]:
+    """Read the results written by 'save_results', by benchmark name."""
+    document = json.loads(path.read_text(encoding="utf-8"))
+    results = (Result(**result) for result in document["results"])
+    return document["metadata"], {result.name: result for result in results}
+
+
+def compare(
+    results: list[Result], baseline: dict[str, Result], tolerance: float
+) -> list[Comparison]:
+    """Compare the results to the baseline, with the given tolerance of relative change."""
+    comparisons: list[Comparison] = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        throughput_change = _relative_change(result.throughput, base.throughput)
+        # tiny peaks move a lot in relative terms, so memory has to grow by a whole MiB as well
+        peak_change = _relative_change(result.peak_mib, base.peak_mib)
+        regressed = throughput_change < -tolerance or (
+            peak_change > tolerance and result.peak_mib - base.peak_mib >= 1
+        )
+        comparisons.append(Comparison(result.name, throughput_change, peak_change, regressed))
+    return comparisons
+
+
+def _relative_change(value: float, base: float) -> float:
+    return (value - base) / base if base > 0 else 0.0
+
+
+@contextmanager
+def _quiet() -> Iterator[None]:
+    # the use cases print their results, which would only measure the terminal
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        yield
@@ -1 +1,6 @@
 """A lil' bud that helps you with stuff (it's a utility CLI)."""
+
+import time
+
+# taken before anything else is imported, so profiling can tell how long the import took
+IMPORT_STARTED_AT = time.perf_counter()
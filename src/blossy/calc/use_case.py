@@ -6,6 +6,7 @@ from typing import Protocol
 
 from blossy.calc.model import Time, VisualCalcStep
 from blossy.calc.service import ExpressionLexer, ExpressionParser, PostfixedExpressionParser
+from blossy.shared import tracing
 
 
 class CalculateUseCase(Protocol):
@@ -44,8 +45,10 @@ class _CalculateUseCaseOption1:
 
     def execute(self, expression: str) -> None:
         """Execute the use case."""
-        token_generator = self._lexer.tokenize(expression)
-        parser_response = self._parser.parse(token_generator)
+        with tracing.span("calc.lex"):
+            tokens = list(self._lexer.tokenize(expression))
+        with tracing.span("calc.parse", tokens=len(tokens)):
+            parser_response = self._parser.parse(iter(tokens))
         if not isinstance(parser_response, list):
             raise RuntimeError("Expected parser response to be a list of strings.")
 
@@ -213,8 +216,10 @@ class _CalculateUseCaseOption2:
 
     def execute(self, expression: str) -> None:
         """Execute the use case."""
-        token_generator = self._lexer.tokenize(expression)
-        result = self._parser.parse(token_generator)
+        with tracing.span("calc.lex"):
+            tokens = list(self._lexer.tokenize(expression))
+        with tracing.span("calc.parse", tokens=len(tokens)):
+            result = self._parser.parse(iter(tokens))
         if not isinstance(result, (int, float)):
             raise RuntimeError("Expected parser response to be a number.")
 
@@ -0,0 +1,20 @@
+"""Module for CLONE models."""
+
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class CloneFilter(StrEnum):
+    """Partial clone filter, leaving the filtered objects to be fetched on demand."""
+
+    BLOBLESS = "blob:none"
+    TREELESS = "tree:0"
+
+
+@dataclass(frozen=True)
+class CloneOptions:
+    """Options that limit what a clone fetches and checks out."""
+
+    depth: int | None = None
+    partial_filter: CloneFilter | None = None
+    sparse_paths: tuple[str, ...] = ()
@@ -0,0 +1,140 @@
+"""Module for CLONE repositories."""
+
+import hashlib
+import os
+import secrets
+import shutil
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Protocol
+
+import platformdirs
+
+from blossy.shared.model import ProcessResult
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # pylint: disable=invalid-name
+
+
+class SubprocessAdapter(Protocol):
+    """Adapter for subprocess operations."""
+
+    def capture(self, *args: str) -> ProcessResult:
+        """Run a subprocess with the given arguments, capturing its output instead of raising."""
+        ...
+
+
+class MirrorCache:
+    """Repository for the bare mirrors that new working copies are cloned from."""
+
+    _subprocess_adapter: SubprocessAdapter
+    _cache_dir: Path
+    _size_limit: int
+
+    def __init__(
+        self,
+        subprocess_adapter: SubprocessAdapter,
+        size_limit: int,
+        cache_dir: Path | None = None,
+    ) -> None:
+        if cache_dir is None:
+            data_dir = platformdirs.user_data_dir(appname="blossy", appauthor="ravensakurai")
+            cache_dir = Path(data_dir) / "mirrors"
+        self._subprocess_adapter = subprocess_adapter
+        self._cache_dir = cache_dir
+        self._size_limit = size_limit
+
+    def clone(self, url: str, destination: Path, args: Sequence[str] = ()) -> ProcessResult:
+        """Clone a repository through its mirror, which is created or updated first."""
+        mirror = self.get_mirror_path(url)
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+        results: list[ProcessResult] = []
+        with self._lock(mirror):
+            temp_path = mirror.with_name(f"{mirror.name}.{secrets.token_hex(4)}.tmp")
+            is_new = not mirror.exists()
+            if is_new:
+                steps = [("git", "clone", "--mirror", "--quiet", url, str(temp_path))]
+            else:
+                # only the objects that are new upstream are transferred
+                steps = [("git", f"--git-dir={mirror}", "fetch", "--prune", "--quiet", "origin")]
+            if not self._run(steps, results):
+                shutil.rmtree(temp_path, ignore_errors=True)
+                return ProcessResult.merge(results)
+            if is_new:
+                # a mirror only shows up once it's complete, so a crash never leaves half of one
+                os.replace(temp_path, mirror)
+            os.utime(mirror)
+
+            # a local clone hardlinks the mirror's objects instead of copying or downloading them
+            self._run(
+                [
+                    ("git", "clone", "--quiet", *args, str(mirror), str(destination)),
+                    ("git", "-C", str(destination), "remote", "set-url", "origin", url),
+                ],
+                results,
+            )
+        return ProcessResult.merge(results)
+
+    def evict(self, keep: set[Path] | None = None) -> list[Path]:
+        """Delete the least recently used mirrors until the cache fits its size limit."""
+        if not self._cache_dir.is_dir():
+            return []
+
+        keep = keep or set()
+        mirrors = sorted(
+            (path for path in self._cache_dir.iterdir() if path.suffix == ".git"),
+            key=lambda path: path.stat().st_mtime_ns,
+        )
+        sizes = {mirror: _get_size(mirror) for mirror in mirrors}
+        total_size = sum(sizes.values())
+
+        evicted: list[Path] = []
+        for mirror in mirrors:
+            if total_size <= self._size_limit:
+                break
+            if mirror in keep:
+                continue
+            with self._lock(mirror):
+                shutil.rmtree(mirror, ignore_errors=True)
+            total_size -= sizes[mirror]
+            evicted.append(mirror)
+        return evicted
+
+    def get_mirror_path(self, url: str) -> Path:
+        """Get the path of the mirror of a repository."""
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        name = url.rstrip("/").rsplit("/", 1)[-1].rsplit(":", 1)[-1].removesuffix(".git")
+        return self._cache_dir / f"{name}-{digest}.git"
+
+    def _run(self, steps: list[tuple[str, ...]], results: list[ProcessResult]) -> bool:
+        for step in steps:
+            results.append(self._subprocess_adapter.capture(*step))
+            if results[-1].returncode != 0:
+                return False
+        return True
+
+    @contextmanager
+    def _lock(self, mirror: Path) -> Iterator[None]:
+        # another blossy process may be using the same mirror
+        if fcntl is None:
+            yield
+            return
+
+        with open(mirror.with_suffix(".lock"), "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _get_size(directory: Path) -> int:
+    size = 0
+    for dir_path, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            size += os.lstat(os.path.join(dir_path, file_name)).st_size
+    return size
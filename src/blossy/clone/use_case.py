@@ -1,9 +1,15 @@
 """Module for CLONE use cases."""
 
-from typing import Protocol
+from collections.abc import Callable
+from concurrent.futures import Future, as_completed
+from pathlib import Path
+from typing import Any, Protocol
 
-from blossy.shared.error import ConfigError
-from blossy.shared.model import TomlValue
+from blossy.clone.model import CloneFilter, CloneOptions
+from blossy.clone.repository import MirrorCache
+from blossy.shared import tracing
+from blossy.shared.error import ConfigError, SubprocessError
+from blossy.shared.model import ProcessResult, TomlValue
 
 _URL_TEMPLATE = "{prefix}{user}/{repository}.git"
 _PREFIX_SSH = "git@github.com:"
@@ -17,6 +23,10 @@ class ConfigRepository(Protocol):
         """Get a property value for a subcommand."""
         ...
 
+    def get_section(self, subcommand: str) -> dict[str, TomlValue]:
+        """Get all property values for a subcommand."""
+        ...
+
     def set_property(self, subcommand: str, property_name: str, value: TomlValue) -> None:
         """Set a property value for a subcommand."""
         ...
@@ -29,6 +39,18 @@ class SubprocessAdapter(Protocol):
         """Run a subprocess with the given arguments."""
         ...
 
+    def capture(self, *args: str) -> ProcessResult:
+        """Run a subprocess with the given arguments, capturing its output instead of raising."""
+        ...
+
+    def submit[T](self, task: Callable[..., T], *args: Any) -> Future[T]:
+        """Run a task that shells out on the adapter's bounded pool."""
+        ...
+
+    def cancel(self) -> None:
+        """Drop the tasks still waiting in the pool and kill every running subprocess."""
+        ...
+
 
 class CloneUseCase(Protocol):
     """Use case for cloning GitHub repositories."""
@@ -41,10 +63,19 @@ class CloneUseCaseFactory:
 
     @staticmethod
     def get_use_case(
-        config_repository: ConfigRepository, subprocess_adapter: SubprocessAdapter
+        config_repository: ConfigRepository,
+        subprocess_adapter: SubprocessAdapter,
+        jobs: int = 1,
+        mirror_cache: MirrorCache | None = None,
+        options: CloneOptions = CloneOptions(),
+        sync: bool = False,
     ) -> CloneUseCase:
         """Get an instance of the CLONE use case based on the flags."""
-        return _CloneUseCaseOption1(config_repository, subprocess_adapter)
+        if jobs == 1 and mirror_cache is None and not sync:
+            return _CloneUseCaseOption1(config_repository, subprocess_adapter, options)
+        return _CloneUseCaseOption2(
+            config_repository, subprocess_adapter, jobs, mirror_cache, options, sync
+        )
 
 
 class _CloneUseCaseOption1:
@@ -52,16 +83,23 @@ class _CloneUseCaseOption1:
 
     _config_repository: ConfigRepository
     _subprocess_adapter: SubprocessAdapter
+    _options: CloneOptions
 
     def __init__(
-        self, config_repository: ConfigRepository, subprocess_adapter: SubprocessAdapter
+        self,
+        config_repository: ConfigRepository,
+        subprocess_adapter: SubprocessAdapter,
+        options: CloneOptions,
     ) -> None:
         self._config_repository = config_repository
         self._subprocess_adapter = subprocess_adapter
+        self._options = options
 
     def execute(self, repositories: list[str], use_https: bool) -> None:
         prefix = _PREFIX_HTTPS if use_https else _PREFIX_SSH
-        user = self._load_configured_user()
+        user = _load_configured_user(self._config_repository)
+        section = self._config_repository.get_section("clone")
+        defaults = _load_options(section, self._options)
 
         for repo in repositories:
             repo_url = _URL_TEMPLATE.format(
@@ -69,17 +107,212 @@ class _CloneUseCaseOption1:
                 user=user,
                 repository=repo,
             )
+            options = _load_options(section, self._options, defaults, repo)
+
+            with tracing.span("clone.repository", repository=repo):
+                self._subprocess_adapter.run("git", "clone", *_build_clone_args(options), repo_url)
+                if options.sparse_paths:
+                    self._subprocess_adapter.run(
+                        "git", "-C", repo, "sparse-checkout", "set", *options.sparse_paths
+                    )
+
+
+class _CloneUseCaseOption2:
+    """Use case for cloning (or syncing) GitHub repositories concurrently."""
+
+    _config_repository: ConfigRepository
+    _subprocess_adapter: SubprocessAdapter
+    _jobs: int
+    _mirror_cache: MirrorCache | None
+    _options: CloneOptions
+    _sync: bool
+
+    def __init__(
+        self,
+        config_repository: ConfigRepository,
+        subprocess_adapter: SubprocessAdapter,
+        jobs: int,
+        mirror_cache: MirrorCache | None,
+        options: CloneOptions,
+        sync: bool,
+    ) -> None:
+        self._config_repository = config_repository
+        self._subprocess_adapter = subprocess_adapter
+        self._jobs = jobs
+        self._mirror_cache = mirror_cache
+        self._options = options
+        self._sync = sync
+
+    def execute(self, repositories: list[str], use_https: bool) -> None:
+        if self._jobs < 1:
+            raise ValueError("Quantity of jobs must be positive.")
+
+        clones = self._plan_clones(repositories, use_https)
+        results: dict[str, tuple[str, ProcessResult]] = {}
+        # the adapter's pool bounds how many repositories are handled at once
+        futures = {
+            self._subprocess_adapter.submit(self._sync_or_clone, url, repo, options): repo
+            for repo, (url, options) in clones.items()
+        }
+        try:
+            # each repository's output is shown whole once it's done, so nothing interleaves
+            for future in as_completed(futures):
+                repo = futures[future]
+                results[repo] = future.result()
+                tracing.counter("clone.repositories", done=len(results))
+                for line in results[repo][1].output.splitlines():
+                    print(f"[{repo}] {line}")
+        except BaseException:
+            # on Ctrl+C, the git commands still running are killed instead of left behind
+            self._subprocess_adapter.cancel()
+            raise
+
+        self._print_summary(repositories, results)
+        if self._mirror_cache is not None:
+            keep = {self._mirror_cache.get_mirror_path(url) for url, _ in clones.values()}
+            self._mirror_cache.evict(keep)
+
+        failed = [repo for repo in repositories if results[repo][1].returncode != 0]
+        if failed:
+            raise SubprocessError(
+                f"{len(failed)} of {len(repositories)} repositories failed to "
+                f"{'sync' if self._sync else 'clone'} ({', '.join(failed)})."
+            )
+
+    def _plan_clones(
+        self, repositories: list[str], use_https: bool
+    ) -> dict[str, tuple[str, CloneOptions]]:
+        prefix = _PREFIX_HTTPS if use_https else _PREFIX_SSH
+        user = _load_configured_user(self._config_repository)
+        section = self._config_repository.get_section("clone")
+        defaults = _load_options(section, self._options)
+        return {
+            repo: (
+                _URL_TEMPLATE.format(prefix=prefix, user=user, repository=repo),
+                _load_options(section, self._options, defaults, repo),
+            )
+            for repo in repositories
+        }
+
+    def _sync_or_clone(
+        self, url: str, repo: str, options: CloneOptions
+    ) -> tuple[str, ProcessResult]:
+        with tracing.span("clone.repository", repository=repo):
+            if not self._sync or not Path(repo).exists():
+                return "ok", self._clone(url, repo, options)
+
+            # asking for the remote HEAD is a single round-trip, much cheaper than a fetch
+            remote = self._subprocess_adapter.capture(
+                "git", "-C", repo, "ls-remote", "origin", "HEAD"
+            )
+            if remote.returncode != 0:
+                return "failed", remote
+            local = self._subprocess_adapter.capture(
+                "git", "-C", repo, "rev-parse", "--verify", "--quiet", "refs/remotes/origin/HEAD"
+            )
+            remote_head = remote.output.split("\t", 1)[0].strip()
+            local_head = local.output.strip() if local.returncode == 0 else ""
+            checks = ProcessResult(0, "", remote.elapsed_secs + local.elapsed_secs)
+            if remote_head == local_head:
+                return "skipped", checks
+
+            pull = self._subprocess_adapter.capture(
+                "git", "-C", repo, "pull", "--ff-only", "--quiet"
+            )
+            return "updated", ProcessResult.merge([checks, pull])
+
+    def _clone(self, url: str, repo: str, options: CloneOptions) -> ProcessResult:
+        if self._mirror_cache is None:
+            result = self._subprocess_adapter.capture(
+                "git", "clone", *_build_clone_args(options), url
+            )
+        else:
+            # a local clone gets every object by hardlinking, so only sparseness still matters
+            sparse_args = ("--sparse",) if options.sparse_paths else ()
+            result = self._mirror_cache.clone(url, Path(repo), sparse_args)
+        if result.returncode != 0 or not options.sparse_paths:
+            return result
 
-            self._subprocess_adapter.run("git", "clone", repo_url)
+        sparse_result = self._subprocess_adapter.capture(
+            "git", "-C", repo, "sparse-checkout", "set", *options.sparse_paths
+        )
+        return ProcessResult.merge([result, sparse_result])
 
-    def _load_configured_user(self) -> str:
-        user = self._config_repository.get_property("clone", "github-user")
-        if not user:
-            raise ConfigError(
-                "GitHub user is not configured for 'clone' subcommand. "
-                "Use 'blossy config clone github-user <username>' to set it."
+    def _print_summary(
+        self, repositories: list[str], results: dict[str, tuple[str, ProcessResult]]
+    ) -> None:
+        statuses = {repo: _status(status, result) for repo, (status, result) in results.items()}
+        times = {repo: f"{result.elapsed_secs:.2f}s" for repo, (_, result) in results.items()}
+        width = max(len("Repository"), *(len(repo) for repo in repositories))
+        status_width = max(len("Status"), *(len(status) for status in statuses.values()))
+        time_width = max(len("Time"), *(len(time) for time in times.values()))
+        print()
+        print(f"{'Repository':<{width}}  {'Status':<{status_width}}  {'Time':<{time_width}}  CPU")
+        for repo in repositories:
+            print(
+                f"{repo:<{width}}  {statuses[repo]:<{status_width}}  {times[repo]:<{time_width}}  "
+                f"{results[repo][1].cpu_secs:.2f}s"
             )
-        if not isinstance(user, str):
-            raise ConfigError("GitHub user configuration is not a string.")
 
-        return user
+
+def _status(status: str, result: ProcessResult) -> str:
+    if result.timed_out:
+        return "timed out"
+    return status if result.returncode == 0 else "failed"
+
+
+def _load_configured_user(config_repository: ConfigRepository) -> str:
+    user = config_repository.get_property("clone", "github-user")
+    if not user:
+        raise ConfigError(
+            "GitHub user is not configured for 'clone' subcommand. "
+            "Use 'blossy config clone github-user <username>' to set it."
+        )
+    if not isinstance(user, str):
+        raise ConfigError("GitHub user configuration is not a string.")
+
+    return user
+
+
+def _load_options(
+    section: dict[str, TomlValue],
+    options: CloneOptions,
+    defaults: CloneOptions | None = None,
+    repo: str | None = None,
+) -> CloneOptions:
+    # the given options win over the repository's configuration, which wins over the defaults
+    key_prefix = "" if repo is None else f"{repo}."
+    depth = section.get(f"{key_prefix}depth")
+    partial_filter = section.get(f"{key_prefix}filter")
+    sparse_paths = section.get(f"{key_prefix}sparse")
+
+    if depth is not None and (not isinstance(depth, int) or isinstance(depth, bool) or depth < 1):
+        raise ConfigError(f"'{key_prefix}depth' configuration is not a positive integer.")
+    if partial_filter is not None and partial_filter not in tuple(CloneFilter):
+        raise ConfigError(f"'{key_prefix}filter' configuration is not a supported filter.")
+    if sparse_paths is not None and not (
+        isinstance(sparse_paths, list) and all(isinstance(path, str) for path in sparse_paths)
+    ):
+        raise ConfigError(f"'{key_prefix}sparse' configuration is not a list of paths.")
+
+    defaults = defaults or CloneOptions()
+    return CloneOptions(
+        depth=options.depth or depth or defaults.depth,
+        partial_filter=(
+            options.partial_filter
+            or (CloneFilter(partial_filter) if partial_filter is not None else None)
+            or defaults.partial_filter
+        ),
+        sparse_paths=options.sparse_paths or tuple(sparse_paths or ()) or defaults.sparse_paths,
+    )
+
+
+def _build_clone_args(options: CloneOptions) -> list[str]:
+    args: list[str] = []
+    if options.depth is not None:
+        args.append(f"--depth={options.depth}")
+    if options.partial_filter is not None:
+        args.append(f"--filter={options.partial_filter}")
+    if options.sparse_paths:
+        args.append("--sparse")
+    return args
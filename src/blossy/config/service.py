@@ -1,42 +1,157 @@
 """Module for CONFIGURE services."""
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any
 
-from blossy.shared.error import InternalError
-
 
 @dataclass(frozen=True)
 class _Property:
+    subcommand: str
     name: str
     value_type: type
+    per_repository: bool = False
+    choices: frozenset[str] | None = None
+    item_type: type | None = None
+    min_value: int | None = None
+
+
+def _index(properties: Iterable[_Property]) -> dict[tuple[str, str], _Property]:
+    return {(prop.subcommand, prop.name): prop for prop in properties}
 
 
 class ConfigValidator:
     """Service for validating configuration rules."""
 
-    _COMMANDS = frozenset({"clone"})
-    _PROPERTIES = frozenset(
-        {
+    # settings under 'global' apply to every subcommand
+    _PROPERTIES = _index(
+        [
+            _Property(
+                subcommand="global",
+                name="cache-size",
+                value_type=int,
+                min_value=0,
+            ),
             _Property(
+                subcommand="clone",
                 name="github-user",
                 value_type=str,
             ),
-        }
+            _Property(
+                subcommand="clone",
+                name="jobs",
+                value_type=int,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="clone",
+                name="depth",
+                value_type=int,
+                per_repository=True,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="clone",
+                name="filter",
+                value_type=str,
+                per_repository=True,
+                choices=frozenset({"blob:none", "tree:0"}),
+            ),
+            _Property(
+                subcommand="clone",
+                name="sparse",
+                value_type=list,
+                per_repository=True,
+                item_type=str,
+            ),
+            _Property(
+                subcommand="countc",
+                name="jobs",
+                value_type=int,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="countc",
+                name="chunk-size",
+                value_type=int,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="countl",
+                name="chunk-size",
+                value_type=int,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="rand",
+                name="jobs",
+                value_type=int,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="rand",
+                name="buffer-size",
+                value_type=int,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="randl",
+                name="memory",
+                value_type=int,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="randl",
+                name="buffer-size",
+                value_type=int,
+                min_value=1,
+            ),
+            _Property(
+                subcommand="stddz",
+                name="jobs",
+                value_type=int,
+                min_value=1,
+            ),
+        ]
     )
+    _COMMANDS = frozenset(subcommand for subcommand, _ in _PROPERTIES)
 
     def is_subcommand_supported(self, subcommand: str) -> bool:
         """Check if the subcommand is supported for configuration."""
-        return subcommand.lower() in (cmd.lower() for cmd in self._COMMANDS)
+        return subcommand.lower() in self._COMMANDS
+
+    def is_key_supported(self, subcommand: str, key: str) -> bool:
+        """Check if the configuration key is supported by the subcommand."""
+        return self._find_property(subcommand, key) is not None
+
+    def is_value_type_valid(self, subcommand: str, key: str, value: Any) -> bool:
+        """Check if the value type for the given key of the subcommand is valid."""
+        prop = self._find_property(subcommand, key)
+        if prop is None:
+            return False
 
-    def is_key_supported(self, key: str) -> bool:
-        """Check if the configuration key is supported."""
-        return key.lower() in (prop.name.lower() for prop in self._PROPERTIES)
+        # 'bool' is a subclass of 'int', but 'true' is no depth
+        if not isinstance(value, prop.value_type) or (
+            isinstance(value, bool) and prop.value_type is not bool
+        ):
+            return False
+        if prop.choices is not None and value not in prop.choices:
+            return False
+        if prop.item_type is not None and not (
+            isinstance(value, list) and all(isinstance(item, prop.item_type) for item in value)
+        ):
+            return False
+        if prop.min_value is not None and not (isinstance(value, int) and value >= prop.min_value):
+            return False
+        return True
 
-    def is_value_type_valid(self, key: str, value: Any) -> bool:
-        """Check if the value type for the given key is valid."""
-        matching_props = [prop for prop in self._PROPERTIES if prop.name.lower() == key.lower()]
-        if len(matching_props) > 1:
-            raise InternalError("Multiple properties found for the same key.")
+    def _find_property(self, subcommand: str, key: str) -> _Property | None:
+        # per-repository properties may also be set for a single one, as '{repository}.{name}'
+        subcommand, name = subcommand.lower(), key.lower()
+        prop = self._PROPERTIES.get((subcommand, name))
+        if prop is not None:
+            return prop
 
-        return isinstance(value, matching_props[0].value_type) if matching_props else False
+        _, dot, suffix = name.rpartition(".")
+        prop = self._PROPERTIES.get((subcommand, suffix)) if dot else None
+        return prop if prop is not None and prop.per_repository else None
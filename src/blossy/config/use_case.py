@@ -1,9 +1,13 @@
 """Module for CONFIGURE use cases."""
 
+import json
+import tomllib
+from collections.abc import Mapping
+from pathlib import Path
 from typing import Any, Protocol
 
 from blossy.shared.error import ConfigError
-from blossy.shared.repository import TomlValue
+from blossy.shared.repository import TomlValue, flatten_table
 
 
 class ConfigValidator(Protocol):
@@ -13,12 +17,12 @@ class ConfigValidator(Protocol):
         """Check if the subcommand is supported for configuration."""
         ...
 
-    def is_key_supported(self, key: str) -> bool:
-        """Check if the configuration key is supported."""
+    def is_key_supported(self, subcommand: str, key: str) -> bool:
+        """Check if the configuration key is supported by the subcommand."""
         ...
 
-    def is_value_type_valid(self, key: str, value: Any) -> bool:
-        """Check if the value type for the given key is valid."""
+    def is_value_type_valid(self, subcommand: str, key: str, value: Any) -> bool:
+        """Check if the value type for the given key of the subcommand is valid."""
         ...
 
 
@@ -29,6 +33,10 @@ class ConfigRepository(Protocol):
         """Set a property value for a subcommand."""
         ...
 
+    def set_properties(self, properties: Mapping[str, Mapping[str, TomlValue]]) -> None:
+        """Set property values for several subcommands in a single write."""
+        ...
+
 
 class ConfigureUseCase(Protocol):
     """Use case for setting configurations."""
@@ -36,6 +44,14 @@ class ConfigureUseCase(Protocol):
     def execute(self, subcommand: str, key: str, value: TomlValue) -> None: ...
 
 
+class ConfigureBatchUseCase(Protocol):
+    """Use case for setting every configuration listed in a TOML or JSON file."""
+
+    def execute(self, file: Path) -> None:
+        """Execute the use case."""
+        ...
+
+
 class ConfigureUseCaseFactory:
     """Factory for creating CONFIGURE use cases."""
 
@@ -44,6 +60,13 @@ class ConfigureUseCaseFactory:
         """Get an instance of the CONFIGURE use case based on the flags."""
         return _ConfigureUseCaseOption1(validator, repository)
 
+    @staticmethod
+    def get_batch_use_case(
+        validator: ConfigValidator, repository: ConfigRepository
+    ) -> ConfigureBatchUseCase:
+        """Get an instance of the batch CONFIGURE use case based on the flags."""
+        return _ConfigureBatchUseCaseOption1(validator, repository)
+
 
 class _ConfigureUseCaseOption1:
     """Use case for setting configurations."""
@@ -56,11 +79,46 @@ class _ConfigureUseCaseOption1:
         self._repository = repository
 
     def execute(self, subcommand: str, key: str, value: TomlValue) -> None:
-        if not self._validator.is_subcommand_supported(subcommand):
-            raise ConfigError(f"No configuration available for '{subcommand}' subcommand.")
-        if not self._validator.is_key_supported(key):
-            raise ConfigError(f"The '{key}' configuration key is not supported.")
-        if not self._validator.is_value_type_valid(key, value):
-            raise ConfigError(f"Invalid type for '{key}' value.")
-
+        _validate(self._validator, subcommand, key, value)
         self._repository.set_property(subcommand, key, value)
+
+
+class _ConfigureBatchUseCaseOption1:
+    """Use case for setting every configuration listed in a TOML or JSON file."""
+
+    _validator: ConfigValidator
+    _repository: ConfigRepository
+
+    def __init__(self, validator: ConfigValidator, repository: ConfigRepository) -> None:
+        self._validator = validator
+        self._repository = repository
+
+    def execute(self, file: Path) -> None:
+        """Execute the use case."""
+        content = file.read_text(encoding="utf-8")
+        try:
+            document = json.loads(content) if file.suffix == ".json" else tomllib.loads(content)
+        except (json.JSONDecodeError, tomllib.TOMLDecodeError) as e:
+            raise ConfigError(f"'{file}' could not be parsed ({e}).") from e
+
+        properties: dict[str, dict[str, TomlValue]] = {}
+        for subcommand, table in document.items():
+            if not isinstance(table, dict):
+                raise ConfigError(f"'{subcommand}' must be a table of configurations.")
+            properties[subcommand] = flatten_table(table)
+
+        # every entry is checked before anything is written, so the batch applies entirely or not
+        for subcommand, values in properties.items():
+            for key, value in values.items():
+                _validate(self._validator, subcommand, key, value)
+
+        self._repository.set_properties(properties)
+
+
+def _validate(validator: ConfigValidator, subcommand: str, key: str, value: TomlValue) -> None:
+    if not validator.is_subcommand_supported(subcommand):
+        raise ConfigError(f"No configuration available for '{subcommand}' subcommand.")
+    if not validator.is_key_supported(subcommand, key):
+        raise ConfigError(f"The '{key}' configuration key is not supported.")
+    if not validator.is_value_type_valid(subcommand, key, value):
+        raise ConfigError(f"Invalid type for '{key}' value.")
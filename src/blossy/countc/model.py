@@ -0,0 +1,42 @@
+"""Module for COUNT CHARACTERS models."""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CharacterCount:
+    """Character counts of a piece of text, which can be merged with the following piece."""
+
+    total: int = 0
+    non_whitespace: int = 0
+    whitespace_runs: int = 0
+    starts_with_whitespace: bool = False
+    ends_with_whitespace: bool = False
+
+    @property
+    def necessary(self) -> int:
+        """Characters left after collapsing whitespace runs and trimming both ends."""
+        # the trimming matches counting one character per run and discarding whitespace ends
+        return (
+            self.non_whitespace
+            + self.whitespace_runs
+            - self.starts_with_whitespace
+            - self.ends_with_whitespace
+        )
+
+    def merge(self, following: "CharacterCount") -> "CharacterCount":
+        """Combine with the counts of the text right after this one."""
+        if self.total == 0:
+            return following
+        if following.total == 0:
+            return self
+
+        # a run split between both pieces is still a single run
+        joined = self.ends_with_whitespace and following.starts_with_whitespace
+        return CharacterCount(
+            self.total + following.total,
+            self.non_whitespace + following.non_whitespace,
+            self.whitespace_runs + following.whitespace_runs - joined,
+            self.starts_with_whitespace,
+            following.ends_with_whitespace,
+        )
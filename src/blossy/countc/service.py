@@ -0,0 +1,52 @@
+"""Module for COUNT CHARACTERS services."""
+
+from blossy.countc.model import CharacterCount
+
+_MAX_CHAR_SIZE = 4
+
+
+def count_text(text: str) -> CharacterCount:
+    """Count the characters of a text, with its newlines already translated."""
+    if not text:
+        return CharacterCount()
+
+    words = text.split()
+    non_whitespace = sum(map(len, words))
+    starts_with_whitespace = text[0].isspace()
+    ends_with_whitespace = text[-1].isspace()
+    if non_whitespace == len(text):
+        runs = 0
+    elif not words:
+        runs = 1
+    else:
+        runs = len(words) - 1 + starts_with_whitespace + ends_with_whitespace
+
+    return CharacterCount(
+        len(text), non_whitespace, runs, starts_with_whitespace, ends_with_whitespace
+    )
+
+
+def count_bytes(content: bytes) -> CharacterCount:
+    """Count the characters of UTF-8 bytes that were split at character boundaries."""
+    # the same translation text mode does, so that '\r\n' counts as a single character
+    text = content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    return count_text(text)
+
+
+def split_ranges(content: memoryview, chunk_size: int) -> list[tuple[int, int]]:
+    """Split a UTF-8 file in byte ranges of about the chunk size, never inside a character."""
+    size = len(content)
+    boundaries = [0]
+    for offset in range(chunk_size, size, chunk_size):
+        window = content[offset - 1 : offset + _MAX_CHAR_SIZE].tobytes()
+        shift = 1
+        # continuation bytes, and a '\n' right after a '\r', belong to the previous range
+        while shift < len(window) and (
+            window[shift] & 0xC0 == 0x80 or window[shift - 1 : shift + 1] == b"\r\n"
+        ):
+            shift += 1
+        boundary = offset + shift - 1
+        if boundaries[-1] < boundary < size:
+            boundaries.append(boundary)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
@@ -1,8 +1,33 @@
 """Module for COUNT CHARACTERS use cases."""
 
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AbstractContextManager
+from itertools import repeat
 from pathlib import Path
 from typing import Protocol
 
+import typer
+
+from blossy.countc.model import CharacterCount
+from blossy.countc.service import count_bytes, count_text, split_ranges
+from blossy.shared import tracing
+from blossy.shared.tracing import TraceEvent
+
+_CHUNK_SIZE = 1 << 20
+
+
+class FileAdapter(Protocol):
+    """Adapter for file operations."""
+
+    def read_text_chunks(self, path: Path, block_size: int) -> Iterator[str]:
+        """Read a UTF-8 file in pieces of up to the given size, translating newlines to '\\n'."""
+        ...
+
+    def map_view(self, path: Path) -> AbstractContextManager[memoryview]:
+        """Map a file into memory, viewing its bytes without copying them."""
+        ...
+
 
 class CountCharactersUseCase(Protocol):
     """Protocol for a COUNT CHARACTERS use case."""
@@ -17,103 +42,145 @@ class CountCharactersUseCaseFactory:
 
     @staticmethod
     def get_use_case(
+        file_adapter: FileAdapter,
         ignore_unnec: bool,
         ignore_ws: bool,
         full_msg: bool,
+        jobs: int = 1,
+        chunk_size: int = _CHUNK_SIZE,
     ) -> CountCharactersUseCase:
         """Get an instance of the COUNT CHARACTERS use case based on the flags."""
         if ignore_unnec:
-            return _CountCharactersUseCaseOption1(full_msg)
+            return _CountCharactersUseCaseOption1(file_adapter, full_msg, jobs, chunk_size)
         if ignore_ws:
-            return _CountCharactersUseCaseOption2(full_msg)
+            return _CountCharactersUseCaseOption2(file_adapter, full_msg, jobs, chunk_size)
 
-        return _CountCharactersUseCaseOption3(full_msg)
+        return _CountCharactersUseCaseOption3(file_adapter, full_msg, jobs, chunk_size)
 
 
 class _CountCharactersUseCaseOption1:
     """Use case for counting characters while ignoring unnecessary whitespace."""
 
+    _file_adapter: FileAdapter
     _full_msg: bool
+    _jobs: int
+    _chunk_size: int
 
-    def __init__(self, full_msg: bool) -> None:
+    def __init__(
+        self, file_adapter: FileAdapter, full_msg: bool, jobs: int, chunk_size: int
+    ) -> None:
+        self._file_adapter = file_adapter
         self._full_msg = full_msg
+        self._jobs = jobs
+        self._chunk_size = chunk_size
 
     def execute(self, file: Path):
         """Execute the use case."""
         current_dir = Path.cwd()
         file_abs_path = current_dir / file
 
-        with open(file_abs_path, "r", encoding="utf-8") as f:
-            char_count = 0
-            first_char = ""
-            prev_char = ""
-            while True:
-                char = f.read(1)
-                if not char:
-                    break
-
-                if not (char.isspace() and prev_char.isspace()):
-                    char_count += 1
-
-                if prev_char == "":
-                    first_char = char
-                prev_char = char
-
-            last_char = prev_char
-            if first_char.isspace():
-                char_count -= 1
-            if last_char.isspace():
-                char_count -= 1
-
-            print(f"Character count: {char_count}" if self._full_msg else char_count)
+        char_count = _count(
+            self._file_adapter, file_abs_path, self._jobs, self._chunk_size
+        ).necessary
+        print(f"Character count: {char_count}" if self._full_msg else char_count)
 
 
 class _CountCharactersUseCaseOption2:
     """Use case for counting characters while ignoring all whitespace."""
 
+    _file_adapter: FileAdapter
     _full_msg: bool
+    _jobs: int
+    _chunk_size: int
 
-    def __init__(self, full_msg: bool) -> None:
+    def __init__(
+        self, file_adapter: FileAdapter, full_msg: bool, jobs: int, chunk_size: int
+    ) -> None:
+        self._file_adapter = file_adapter
         self._full_msg = full_msg
+        self._jobs = jobs
+        self._chunk_size = chunk_size
 
     def execute(self, file: Path):
         """Execute the use case."""
         current_dir = Path.cwd()
         file_abs_path = current_dir / file
 
-        with open(file_abs_path, "r", encoding="utf-8") as f:
-            char_count = 0
-            while True:
-                char = f.read(1)
-                if not char:
-                    break
-
-                if not char.isspace():
-                    char_count += 1
-
-            print(f"Character count: {char_count}" if self._full_msg else char_count)
+        char_count = _count(
+            self._file_adapter, file_abs_path, self._jobs, self._chunk_size
+        ).non_whitespace
+        print(f"Character count: {char_count}" if self._full_msg else char_count)
 
 
 class _CountCharactersUseCaseOption3:
     """Use case for counting characters while ignoring nothing."""
 
+    _file_adapter: FileAdapter
     _full_msg: bool
+    _jobs: int
+    _chunk_size: int
 
-    def __init__(self, full_msg: bool) -> None:
+    def __init__(
+        self, file_adapter: FileAdapter, full_msg: bool, jobs: int, chunk_size: int
+    ) -> None:
+        self._file_adapter = file_adapter
         self._full_msg = full_msg
+        self._jobs = jobs
+        self._chunk_size = chunk_size
 
     def execute(self, file: Path):
         """Execute the use case."""
         current_dir = Path.cwd()
         file_abs_path = current_dir / file
 
-        with open(file_abs_path, "r", encoding="utf-8") as f:
-            char_count = 0
-            while True:
-                char = f.read(1)
-                if not char:
-                    break
-
-                char_count += 1
-
-            print(f"Character count: {char_count}" if self._full_msg else char_count)
+        char_count = _count(self._file_adapter, file_abs_path, self._jobs, self._chunk_size).total
+        print(f"Character count: {char_count}" if self._full_msg else char_count)
+
+
+def _count(file_adapter: FileAdapter, file: Path, jobs: int, chunk_size: int) -> CharacterCount:
+    if jobs < 1:
+        raise typer.BadParameter("Quantity of jobs must be positive.")
+    if chunk_size < 1:
+        raise typer.BadParameter("Chunk size must be positive.")
+
+    if jobs == 1:
+        count = CharacterCount()
+        chunks = tracing.traced("countc.chunk", file_adapter.read_text_chunks(file, chunk_size))
+        for chunk in chunks:
+            count = count.merge(count_text(chunk))
+        return count
+
+    with file_adapter.map_view(file) as content:
+        ranges = split_ranges(content, chunk_size)
+
+    # every worker counts its own byte range, and the counts are merged in the file's order
+    starts = [start for start, _ in ranges]
+    ends = [end for _, end in ranges]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            _count_range,
+            repeat(file_adapter),
+            repeat(file),
+            starts,
+            ends,
+            repeat(tracing.is_enabled()),
+            chunksize=max(1, len(ranges) // (4 * jobs)),
+        )
+        count = CharacterCount()
+        for range_count, events in results:
+            tracing.record(events)
+            count = count.merge(range_count)
+        return count
+
+
+def _count_range(
+    file_adapter: FileAdapter, file: Path, start: int, end: int, traced: bool
+) -> tuple[CharacterCount, list[TraceEvent]]:
+    with tracing.capture(traced) as events:
+        with (
+            tracing.span("countc.chunk", start=start, size=end - start),
+            file_adapter.map_view(file) as content,
+            content[start:end] as piece,
+        ):
+            count = count_bytes(piece.tobytes())
+    return count, events
@@ -0,0 +1,28 @@
+"""Module for COUNT LINES services."""
+
+from collections.abc import Iterable
+
+
+def count_lines(chunks: Iterable[str], ignore_blank: bool) -> int:
+    """Count the lines of a text read in consecutive chunks, with its newlines translated."""
+    count = 0
+    # whether the line that is still unfinished is counted when it ends
+    pending = False
+    for chunk in chunks:
+        if not ignore_blank:
+            count += chunk.count("\n")
+            pending = not chunk.endswith("\n")
+            continue
+
+        lines = chunk.split("\n")
+        if len(lines) > 1:
+            count += pending or _is_filled(lines[0])
+            count += sum(1 for line in lines[1:-1] if _is_filled(line))
+            pending = False
+        pending = pending or _is_filled(lines[-1])
+
+    return count + pending
+
+
+def _is_filled(line: str) -> bool:
+    return bool(line) and not line.isspace()
@@ -1,9 +1,25 @@
 """Module for COUNT LINES use cases."""
 
 import os
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Protocol
 
+import typer
+
+from blossy.countl.service import count_lines
+from blossy.shared import tracing
+
+_CHUNK_SIZE = 1 << 20
+
+
+class FileAdapter(Protocol):
+    """Adapter for file operations."""
+
+    def read_text_chunks(self, path: Path, block_size: int) -> Iterator[str]:
+        """Read a UTF-8 file in pieces of up to the given size, translating newlines to '\\n'."""
+        ...
+
 
 class CountLinesUseCase(Protocol):
     """Protocol for a COUNT LINES use case."""
@@ -18,54 +34,68 @@ class CountLinesUseCaseFactory:
 
     @staticmethod
     def get_use_case(
+        file_adapter: FileAdapter,
         ignore_blank: bool,
         full_msg: bool,
+        chunk_size: int = _CHUNK_SIZE,
     ) -> CountLinesUseCase:
         """Get an instance of the COUNT LINES use case based on the flags."""
         if ignore_blank:
-            return _CountLinesUseCaseOption1(full_msg)
-        return _CountLinesUseCaseOption2(full_msg)
+            return _CountLinesUseCaseOption1(file_adapter, full_msg, chunk_size)
+        return _CountLinesUseCaseOption2(file_adapter, full_msg, chunk_size)
 
 
 class _CountLinesUseCaseOption1:
     """Use case for counting lines while ignoring blank ones."""
 
+    _file_adapter: FileAdapter
     _full_msg: bool
+    _chunk_size: int
 
-    def __init__(self, full_msg: bool) -> None:
+    def __init__(self, file_adapter: FileAdapter, full_msg: bool, chunk_size: int) -> None:
+        self._file_adapter = file_adapter
         self._full_msg = full_msg
+        self._chunk_size = chunk_size
 
     def execute(self, file: Path):
         """Execute the use case."""
         current_dir = os.getcwd()
         file_abs_path = os.path.join(current_dir, file)
 
-        with open(file_abs_path, "r", encoding="utf-8") as f:
-            line_count = 0
-            for line in f:
-                if line.isspace() or len(line) == 0:
-                    continue
-                line_count += 1
+        if self._chunk_size < 1:
+            raise typer.BadParameter("Chunk size must be positive.")
 
-            print(f"Line count: {line_count}" if self._full_msg else line_count)
+        chunks = tracing.traced(
+            "countl.chunk",
+            self._file_adapter.read_text_chunks(Path(file_abs_path), self._chunk_size),
+        )
+        line_count = count_lines(chunks, ignore_blank=True)
+        print(f"Line count: {line_count}" if self._full_msg else line_count)
 
 
 class _CountLinesUseCaseOption2:
     """Use case for counting lines while ignoring nothing."""
 
+    _file_adapter: FileAdapter
     _full_msg: bool
+    _chunk_size: int
 
-    def __init__(self, full_msg: bool) -> None:
+    def __init__(self, file_adapter: FileAdapter, full_msg: bool, chunk_size: int) -> None:
+        self._file_adapter = file_adapter
         self._full_msg = full_msg
+        self._chunk_size = chunk_size
 
     def execute(self, file: Path):
         """Execute the use case."""
         current_dir = os.getcwd()
         file_abs_path = os.path.join(current_dir, file)
 
-        with open(file_abs_path, "r", encoding="utf-8") as f:
-            line_count = 0
-            for _ in f:
-                line_count += 1
+        if self._chunk_size < 1:
+            raise typer.BadParameter("Chunk size must be positive.")
 
-            print(f"Line count: {line_count}" if self._full_msg else line_count)
+        chunks = tracing.traced(
+            "countl.chunk",
+            self._file_adapter.read_text_chunks(Path(file_abs_path), self._chunk_size),
+        )
+        line_count = count_lines(chunks, ignore_blank=False)
+        print(f"Line count: {line_count}" if self._full_msg else line_count)
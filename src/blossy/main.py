@@ -1,28 +1,135 @@
 """Entry point for the Blossy CLI."""
 
+import functools
+import shlex
+import sys
+import time
+import tomllib
+from collections.abc import Callable
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
-import tomlkit
+import click
 import typer
+from click.core import ParameterSource
+from typer.core import TyperGroup
 
+from blossy import IMPORT_STARTED_AT
 from blossy.calc.service import ExpressionLexer, ExpressionParser
 from blossy.calc.use_case import CalculateUseCaseFactory, PostfixedExpressionParser
+from blossy.clone.model import CloneFilter, CloneOptions
+from blossy.clone.repository import MirrorCache
 from blossy.clone.use_case import CloneUseCaseFactory
 from blossy.config.service import ConfigValidator
 from blossy.config.use_case import ConfigureUseCaseFactory
 from blossy.countc.use_case import CountCharactersUseCaseFactory
 from blossy.countl.use_case import CountLinesUseCaseFactory
+from blossy.perc.model import BatchOutputFormat
 from blossy.perc.use_case import PercentageUseCaseFactory
+from blossy.rand.model import OutputFormat, SamplingAlgorithm
 from blossy.rand.use_case import RandomUseCaseFactory
+from blossy.randl.use_case import RandomLinesUseCaseFactory
+from blossy.shared import tracing
 from blossy.shared.adapter import FileAdapter, SubprocessAdapter
-from blossy.shared.model import SUPPORTED_CONFIG_TYPES, TomlValue
+from blossy.shared.error import ConfigError
+from blossy.shared.model import SUPPORTED_CONFIG_TYPES, ProfilingMode, TomlValue
 from blossy.shared.repository import ConfigRepository
+from blossy.shared.service import Profiler
+from blossy.stddz.model import DedupMode, SortKey
+from blossy.stddz.repository import RenameJournal
 from blossy.stddz.use_case import StandardizeUseCaseFactory
 
 # pylint: disable=broad-exception-caught
 
-app = typer.Typer(name="blossy", help="A lil' bud that helps you with stuff (it's a utility CLI).")
+_IMPORTED_AT = time.perf_counter()
+
+
+class _BlossyGroup(TyperGroup):
+    """Group of Blossy commands."""
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        # a bare '--profile' would take the command that follows it as its value
+        for i, arg in enumerate(args):
+            if arg in self.commands:
+                break
+            if arg == "--profile" and (i + 1 == len(args) or args[i + 1] not in ProfilingMode):
+                args = [*args[:i], f"--profile={ProfilingMode.BOTH}", *args[i + 1 :]]
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(
+    name="blossy",
+    help="A lil' bud that helps you with stuff (it's a utility CLI).",
+    cls=_BlossyGroup,
+)
+
+# settings whose option isn't named after them
+_PROFILE_OPTIONS = {"cache-size": "cache_limit"}
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profiling_mode: Annotated[
+        ProfilingMode | None,
+        typer.Option(
+            "--profile",
+            is_flag=False,
+            flag_value=ProfilingMode.BOTH,
+            show_default=False,
+            help="Profile the command's CPU time, memory or both (the default).",
+        ),
+    ] = None,
+    profiling_output: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile-output",
+            show_default=False,
+            help="File to write the profiling report to, instead of stderr.",
+        ),
+    ] = None,
+    trace_output: Annotated[
+        Path | None,
+        typer.Option(
+            "--trace",
+            envvar="BLOSSY_TRACE",
+            show_default=False,
+            help="File to write a trace of the command to (JSONL if it ends in '.jsonl').",
+        ),
+    ] = None,
+):
+    """
+    A lil' bud that helps you with stuff (it's a utility CLI).
+
+    With '--profile', a report of the command is written to stderr (or to
+    '--profile-output') once it finishes: the time and peak memory of each
+    phase (import, parsing, construction and execute), the functions that
+    took the most time and the largest allocations.
+
+    With '--trace' (or the BLOSSY_TRACE environment variable), the spans and
+    counters of the command are written to a file in the Chrome trace event
+    format, which can be opened in Perfetto, or as JSONL.
+    """
+    # the commands of a script run through this callback again, and share its trace and profiler
+    if trace_output is not None and not tracing.is_enabled():
+        tracing.enable()
+        ctx.call_on_close(lambda: tracing.export(trace_output))
+    if profiling_mode is None or isinstance(ctx.obj, Profiler):
+        return
+
+    profiler = Profiler(profiling_mode, IMPORT_STARTED_AT, _IMPORTED_AT)
+    ctx.obj = profiler
+    # the command was already resolved, so its start marks the end of the parsing
+    group = ctx.command
+    command = (
+        group.get_command(ctx, ctx.invoked_subcommand or "")
+        if isinstance(group, click.Group)
+        else None
+    )
+    if command is not None and command.callback is not None:
+        command.callback = _marked(profiler, "construction", command.callback)
+    ctx.call_on_close(lambda: _write_report(profiler.stop(), profiling_output))
+    profiler.start()
 
 
 @app.command()
@@ -76,63 +183,233 @@ def calc(
         use_case = CalculateUseCaseFactory.get_use_case(
             lexer, regular_parser, postfixed_parser, visualize
         )
+        _mark_phase("execute")
         use_case.execute(expression)
     except Exception as e:
         raise typer.BadParameter(str(e)) from e
 
 
 @app.command()
-def clone(
+def clone(  # pylint: disable=too-many-locals
+    ctx: typer.Context,
     repositories: Annotated[
-        list[str],
-        typer.Argument(help="GitHub repository names to clone."),
-    ],
+        list[str] | None,
+        typer.Argument(show_default=False, help="GitHub repository names to clone."),
+    ] = None,
     use_https: Annotated[
         bool,
         typer.Option("--https", help="Use HTTPS protocol instead of SSH."),
     ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", help="Maximum quantity of concurrent clones."),
+    ] = 1,
+    use_cache: Annotated[
+        bool,
+        typer.Option("--cache", help="Clone through local mirrors, updated incrementally."),
+    ] = False,
+    cache_limit: Annotated[
+        int,
+        typer.Option("--cache-limit", help="Size limit of the mirror cache, in MiB."),
+    ] = 10240,
+    depth: Annotated[
+        int | None,
+        typer.Option("--depth", show_default=False, help="Clone only the last DEPTH commits."),
+    ] = None,
+    partial_filter: Annotated[
+        CloneFilter | None,
+        typer.Option(
+            "--filter", show_default=False, help="Leave blobs or trees to be fetched on demand."
+        ),
+    ] = None,
+    sparse_paths: Annotated[
+        list[str] | None,
+        typer.Option("--sparse", show_default=False, help="Check out only this directory."),
+    ] = None,
+    manifest: Annotated[
+        Path | None,
+        typer.Option(
+            "--manifest", show_default=False, help="File listing repository names, one per line."
+        ),
+    ] = None,
+    sync: Annotated[
+        bool,
+        typer.Option("--sync", help="Update the repositories that were already cloned."),
+    ] = False,
+    timeout: Annotated[
+        float | None,
+        typer.Option(
+            "--timeout", show_default=False, help="Seconds after which a git command is killed."
+        ),
+    ] = None,
 ):
     """
     CLONE
 
     Clone one or more GitHub repositories from the configured user account.
+
+    With '--jobs', the output of each clone is prefixed with its repository,
+    a failed clone doesn't stop the others and a summary table is shown.
+
+    With '--cache', each repository is mirrored in Blossy's data directory and
+    only new objects are fetched; the least recently used mirrors are deleted
+    once the cache exceeds '--cache-limit'.
+
+    '--depth', '--filter' and '--sparse' (which can be repeated) override the
+    'depth', 'filter' and 'sparse' configurations, which can be set for all
+    repositories or for a single one (e.g. 'blossy-cli.depth'). With '--cache',
+    only '--sparse' applies.
+
+    With '--sync', repositories that already exist are fast-forwarded instead
+    (skipped if their remote HEAD didn't change) and only the missing ones are
+    cloned. In a manifest, blank lines and '#' comments are ignored.
+
+    With '--timeout', a git command still running after that many seconds is
+    killed and its repository is reported as timed out.
     """
     try:
-        file_adapter = FileAdapter()
-        subprocess_adapter = SubprocessAdapter()
-        repository = ConfigRepository(file_adapter)
-        use_case = CloneUseCaseFactory.get_use_case(repository, subprocess_adapter)
-        use_case.execute(repositories, use_https)
+        repository = _get_config_repository()
+        profile = _load_profile(ctx, "clone", repository)
+        cache_limit = profile.get("cache_limit", cache_limit)
+        if depth is not None and depth < 1:
+            raise typer.BadParameter("Depth must be positive.")
+        if timeout is not None and timeout <= 0:
+            raise typer.BadParameter("Timeout must be positive.")
+        jobs = profile.get("jobs", jobs)
+        if jobs < 1:
+            raise typer.BadParameter("Quantity of jobs must be positive.")
+        subprocess_adapter = SubprocessAdapter(max_workers=jobs, timeout=timeout)
+        use_case = CloneUseCaseFactory.get_use_case(
+            repository,
+            subprocess_adapter,
+            jobs,
+            MirrorCache(subprocess_adapter, cache_limit << 20) if use_cache else None,
+            CloneOptions(depth, partial_filter, tuple(sparse_paths or ())),
+            sync,
+        )
+        _mark_phase("execute")
+        use_case.execute(_gather_repositories(repositories, manifest), use_https)
     except Exception as e:
         typer.echo(str(e), err=True)
         raise typer.Exit(code=1) from e
 
 
+def _marked(profiler: Profiler, phase: str, callback: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(callback)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler.mark(phase)
+        return callback(*args, **kwargs)
+
+    return wrapper
+
+
+def _mark_phase(phase: str) -> None:
+    ctx = click.get_current_context(silent=True)
+    profiler = ctx.find_object(Profiler) if ctx is not None else None
+    if profiler is not None:
+        profiler.mark(phase)
+
+
+def _write_report(report: str, output: Path | None) -> None:
+    if output is None:
+        typer.echo(report, err=True, nl=False)
+    else:
+        output.write_text(report, encoding="utf-8")
+
+
+@functools.cache
+def _get_config_repository() -> ConfigRepository:
+    # a single repository keeps the parsed configuration warm for every command that 'run' runs
+    return ConfigRepository(FileAdapter())
+
+
+def _load_profile(
+    ctx: typer.Context, subcommand: str, repository: ConfigRepository | None = None
+) -> dict[str, Any]:
+    # configured settings replace the defaults of their options, but not the given ones
+    repository = repository or _get_config_repository()
+    validator = ConfigValidator()
+    profile: dict[str, Any] = {}
+    try:
+        for section in ("global", subcommand):
+            for key, value in repository.get_section(section).items():
+                # settings this version doesn't know (or can't use) don't stop the command
+                if not validator.is_key_supported(section, key):
+                    typer.echo(f"Ignoring unknown '{key}' setting of '{section}'.", err=True)
+                    continue
+                if not validator.is_value_type_valid(section, key, value):
+                    typer.echo(f"Ignoring invalid '{key}' value of '{section}'.", err=True)
+                    continue
+                option = _PROFILE_OPTIONS.get(key, key.replace("-", "_"))
+                if ctx.get_parameter_source(option) == ParameterSource.DEFAULT:
+                    profile[option] = value
+    except ConfigError as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1) from e
+    return profile
+
+
+def _gather_repositories(repositories: list[str] | None, manifest: Path | None) -> list[str]:
+    gathered = list(repositories or [])
+    if manifest is not None:
+        for line in manifest.read_text(encoding="utf-8").splitlines():
+            name = line.split("#", 1)[0].strip()
+            if name:
+                gathered.append(name)
+    if not gathered:
+        raise typer.BadParameter("No repositories to clone.")
+
+    # a repository listed twice would be cloned twice into the same directory
+    return list(dict.fromkeys(gathered))
+
+
 @app.command()
 def config(
-    subcommand: Annotated[str, typer.Argument(help="Subcommand to configure.")],
+    subcommand: Annotated[
+        str | None, typer.Argument(show_default=False, help="Subcommand to configure.")
+    ] = None,
     key: Annotated[
-        str,
-        typer.Argument(help="Configuration key to set."),
-    ],
+        str | None,
+        typer.Argument(show_default=False, help="Configuration key to set."),
+    ] = None,
     value: Annotated[
-        str,
-        typer.Argument(help="Value to assign to the configuration key."),
-    ],
+        str | None,
+        typer.Argument(show_default=False, help="Value to assign to the configuration key."),
+    ] = None,
+    batch: Annotated[
+        Path | None,
+        typer.Option(
+            "--batch",
+            show_default=False,
+            help="TOML or JSON file with configurations to set at once.",
+        ),
+    ] = None,
 ):
     """
     CONFIGURE
 
-    Set a configuration value for a specific subcommand.
+    Set a configuration value for a specific subcommand. With a batch file,
+    every configuration in it is set in a single write, or none is.
     """
 
     try:
-        file_adapter = FileAdapter()
         validator = ConfigValidator()
-        repository = ConfigRepository(file_adapter)
+        repository = _get_config_repository()
+
+        if batch is not None:
+            if subcommand is not None:
+                raise typer.BadParameter("A batch file replaces the subcommand, key and value.")
+            batch_use_case = ConfigureUseCaseFactory.get_batch_use_case(validator, repository)
+            _mark_phase("execute")
+            batch_use_case.execute(batch)
+            return
+
+        if subcommand is None or key is None or value is None:
+            raise typer.BadParameter("Missing subcommand, key or value.")
         use_case = ConfigureUseCaseFactory.get_use_case(validator, repository)
 
         parsed_value = _parse_value(value)
+        _mark_phase("execute")
         use_case.execute(subcommand, key, parsed_value)
     except Exception as e:
         typer.echo(str(e), err=True)
@@ -141,9 +418,7 @@ def config(
 
 def _parse_value(value: str) -> TomlValue:
     try:
-        parsed = tomlkit.parse(f"value = {value}")
-        toml_item = parsed["value"]
-        unwrapped = toml_item.unwrap()
+        unwrapped = tomllib.loads(f"value = {value}")["value"]
         return unwrapped if isinstance(unwrapped, tuple(SUPPORTED_CONFIG_TYPES)) else value
     except Exception:  # pylint: disable=broad-exception-caught
         return value
@@ -151,6 +426,7 @@ def _parse_value(value: str) -> TomlValue:
 
 @app.command()
 def countc(
+    ctx: typer.Context,
     file: Annotated[Path, typer.Argument(show_default=False, help="Relative path to the file.")],
     ignore_unnec: Annotated[
         bool,
@@ -158,14 +434,36 @@ def countc(
     ] = False,
     ignore_ws: Annotated[bool, typer.Option("--ignore-ws", help="Ignore all whitespace.")] = False,
     full_msg: Annotated[bool, typer.Option(help="Show full message.")] = True,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", help="Quantity of worker processes."),
+    ] = 1,
+    chunk_size: Annotated[
+        int,
+        typer.Option(
+            "--chunk-size", help="Size of the pieces of the file counted at a time, in bytes."
+        ),
+    ] = 1
+    << 20,
 ):
     """
     COUNT CHARACTERS
 
     Count the amount of characters in a text file.
+
+    With '--jobs', pieces of the file are counted in parallel.
     """
+    profile = _load_profile(ctx, "countc")
     try:
-        use_case = CountCharactersUseCaseFactory.get_use_case(ignore_unnec, ignore_ws, full_msg)
+        use_case = CountCharactersUseCaseFactory.get_use_case(
+            FileAdapter(),
+            ignore_unnec,
+            ignore_ws,
+            full_msg,
+            profile.get("jobs", jobs),
+            profile.get("chunk_size", chunk_size),
+        )
+        _mark_phase("execute")
         use_case.execute(file)
     except FileNotFoundError as e:
         raise typer.BadParameter(f"'{file}' does not exist.") from e
@@ -175,17 +473,29 @@ def countc(
 
 @app.command()
 def countl(
+    ctx: typer.Context,
     file: Annotated[Path, typer.Argument(show_default=False, help="Relative path to the file.")],
     ignore_blank: Annotated[bool, typer.Option(help="Ignore all blank lines.")] = True,
     full_msg: Annotated[bool, typer.Option(help="Show full message.")] = True,
+    chunk_size: Annotated[
+        int,
+        typer.Option(
+            "--chunk-size", help="Size of the pieces of the file read at a time, in bytes."
+        ),
+    ] = 1
+    << 20,
 ):
     """
     COUNT LINES
 
     Count the amount of lines in a code source file.
     """
+    profile = _load_profile(ctx, "countl")
     try:
-        use_case = CountLinesUseCaseFactory.get_use_case(ignore_blank, full_msg)
+        use_case = CountLinesUseCaseFactory.get_use_case(
+            FileAdapter(), ignore_blank, full_msg, profile.get("chunk_size", chunk_size)
+        )
+        _mark_phase("execute")
         use_case.execute(file)
     except FileNotFoundError as e:
         raise typer.BadParameter(f"'{file}' does not exist.") from e
@@ -199,18 +509,56 @@ def perc(
     part: Annotated[float | None, typer.Option("--part", "-p", show_default=False)] = None,
     ratio: Annotated[float | None, typer.Option("--ratio", "-r", show_default=False)] = None,
     full_msg: Annotated[bool, typer.Option(help="Show full message.")] = True,
+    input_file: Annotated[
+        Path | None,
+        typer.Option("--input", "-i", show_default=False, help="CSV file to solve row by row."),
+    ] = None,
+    whole_col: Annotated[
+        str | None, typer.Option("--whole-col", show_default=False, help="Column of wholes.")
+    ] = None,
+    part_col: Annotated[
+        str | None, typer.Option("--part-col", show_default=False, help="Column of parts.")
+    ] = None,
+    ratio_col: Annotated[
+        str | None, typer.Option("--ratio-col", show_default=False, help="Column of ratios.")
+    ] = None,
+    output_format: Annotated[
+        BatchOutputFormat,
+        typer.Option("--output-format", help="Format of the rows solved from '--input'."),
+    ] = BatchOutputFormat.CSV,
 ):
     """
     PERCENTAGE
 
     Take two of the three percentage-related options and calculate the remaining one.
 
+    With '--input', take two of the three column options instead, and calculate the
+    remaining one for every row of the CSV file.
+
     Example:\n
     $ blossy perc --whole 100 --part 25\n
     Ratio: 0.25
     """
+    if input_file is not None:
+        if whole is not None or part is not None or ratio is not None:
+            raise typer.BadParameter("'--input' takes column options instead of values.")
+        try:
+            batch_use_case = PercentageUseCaseFactory.get_batch_use_case(
+                whole_col, part_col, ratio_col, output_format
+            )
+            _mark_phase("execute")
+            batch_use_case.execute(input_file)
+        except FileNotFoundError as e:
+            raise typer.BadParameter(f"'{input_file}' does not exist.") from e
+        except IsADirectoryError as e:
+            raise typer.BadParameter(f"'{input_file}' is not a file.") from e
+        return
+
+    if whole_col is not None or part_col is not None or ratio_col is not None:
+        raise typer.BadParameter("Column options need '--input'.")
     try:
         use_case = PercentageUseCaseFactory.get_use_case(full_msg)
+        _mark_phase("execute")
         use_case.execute(whole, part, ratio)
     except typer.BadParameter as e:
         raise e
@@ -218,6 +566,7 @@ def perc(
 
 @app.command()
 def rand(
+    ctx: typer.Context,
     lower: Annotated[
         int,
         typer.Argument(show_default=False, help="Lower limit (inclusive)."),
@@ -230,21 +579,134 @@ def rand(
         int,
         typer.Option("--quantity", "-q", help="Quantity of random numbers to generate."),
     ] = 1,
+    seed: Annotated[
+        int | None,
+        typer.Option("--seed", show_default=False, help="Seed for reproducible output."),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", help="Quantity of worker processes."),
+    ] = 1,
+    unique: Annotated[
+        bool,
+        typer.Option("--unique", "-u", help="Generate distinct numbers (no repetition)."),
+    ] = False,
+    algorithm: Annotated[
+        SamplingAlgorithm,
+        typer.Option("--unique-algo", help="Algorithm used to generate distinct numbers."),
+    ] = SamplingAlgorithm.AUTO,
+    output_format: Annotated[
+        OutputFormat,
+        typer.Option("--format", "-f", help="Format of the output."),
+    ] = OutputFormat.TEXT,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", show_default=False, help="File to write the output to."),
+    ] = None,
+    buffer_size: Annotated[
+        int,
+        typer.Option("--buffer-size", help="Size of the output file's buffer, in bytes."),
+    ] = 1
+    << 20,
 ):
     """
     RANDOM
 
     Generate a random number between 'lower' and 'upper'.
+
+    With '--seed', the output is the same for every run, regardless of '--jobs'.
+
+    Algorithms for distinct numbers:\n
+    • floyd - Sparse samples, memory proportional to the quantity\n
+    • shuffle - Dense samples, memory proportional to the range\n
+    • feistel - Keyed permutation, constant memory, parallelizable\n
+    • auto - Pick one of the above based on the quantity and the range\n
+
+    Only feistel runs in parallel with '--jobs'; floyd and shuffle ignore it.
+
+    Output formats:\n
+    • text - Numbers separated by spaces\n
+    • csv - One number per row, under a 'value' header\n
+    • bin64 - Raw little-endian 64-bit signed integers\n
+    • npy - NumPy array file, ready to be memory-mapped\n
     """
+    profile = _load_profile(ctx, "rand")
     try:
-        use_case = RandomUseCaseFactory.get_use_case()
+        use_case = RandomUseCaseFactory.get_use_case(
+            FileAdapter(),
+            seed,
+            profile.get("jobs", jobs),
+            unique,
+            algorithm,
+            output_format,
+            output,
+            profile.get("buffer_size", buffer_size),
+        )
+        _mark_phase("execute")
         use_case.execute(lower, upper, quantity)
     except typer.BadParameter as e:
         raise e
 
 
+@app.command()
+def randl(
+    ctx: typer.Context,
+    file: Annotated[Path, typer.Argument(show_default=False, help="Relative path to the file.")],
+    sample: Annotated[
+        int | None,
+        typer.Option("--sample", "-k", show_default=False, help="Quantity of lines to sample."),
+    ] = None,
+    seed: Annotated[
+        int | None,
+        typer.Option("--seed", show_default=False, help="Seed for reproducible output."),
+    ] = None,
+    memory: Annotated[
+        int,
+        typer.Option("--memory", "-m", help="Memory budget for shuffling, in MiB."),
+    ] = 256,
+    temp_dir: Annotated[
+        Path | None,
+        typer.Option("--temp-dir", show_default=False, help="Directory for temporary files."),
+    ] = None,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", show_default=False, help="File to write the output to."),
+    ] = None,
+    buffer_size: Annotated[
+        int,
+        typer.Option("--buffer-size", help="Size of the input and output buffers, in bytes."),
+    ] = 1
+    << 20,
+):
+    """
+    RANDOM LINES
+
+    Shuffle the lines of a text file, even if it's larger than the available memory.
+
+    With '--sample', pick that many random lines in a single pass instead.
+    """
+    profile = _load_profile(ctx, "randl")
+    try:
+        use_case = RandomLinesUseCaseFactory.get_use_case(
+            FileAdapter(),
+            seed,
+            sample,
+            profile.get("memory", memory) << 20,
+            temp_dir,
+            output,
+            profile.get("buffer_size", buffer_size),
+        )
+        _mark_phase("execute")
+        use_case.execute(file)
+    except FileNotFoundError as e:
+        raise typer.BadParameter(f"'{file}' does not exist.") from e
+    except IsADirectoryError as e:
+        raise typer.BadParameter(f"'{file}' is not a file.") from e
+
+
 @app.command()
 def stddz(
+    ctx: typer.Context,
     prefix: Annotated[str, typer.Argument(show_default=False, help="Prefix of the files.")],
     directory: Annotated[
         Path, typer.Argument(show_default=False, help="Relative path to the directory.")
@@ -256,17 +718,151 @@ def stddz(
         int,
         typer.Option("--digits", "-d", help="Quantity of digits used to represent the ID."),
     ] = 3,
+    sort_key: Annotated[
+        SortKey,
+        typer.Option("--sort", help="Order in which the files receive their IDs."),
+    ] = SortKey.NAME,
+    dry_run: Annotated[
+        bool,
+        typer.Option("--dry-run", help="Show the planned renames without renaming anything."),
+    ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", help="Maximum quantity of concurrent renames."),
+    ] = 1,
+    undo: Annotated[
+        bool,
+        typer.Option("--undo", help="Revert the last standardization of the directory."),
+    ] = False,
+    recursive: Annotated[
+        bool,
+        typer.Option("--recursive", "-r", help="Standardize every directory inside DIRECTORY too."),
+    ] = False,
+    global_seq: Annotated[
+        bool,
+        typer.Option(
+            "--global-seq", help="Number the files of the whole tree as a single sequence."
+        ),
+    ] = False,
+    dedup_mode: Annotated[
+        DedupMode | None,
+        typer.Option(
+            "--dedup", show_default=False, help="Find files with the same content before renaming."
+        ),
+    ] = None,
 ) -> None:
     """
     STANDARDIZE
 
     Rename all files in a DIRECTORY to '{PREFIX}-{ID}', in which the ID is
-    calculated incrementally.
+    calculated incrementally, following the order of the files.
+
+    Orders:\n
+    • name - Alphabetical order of the names\n
+    • natural - Like 'name', but numbers are compared by value (2 before 10)\n
+    • mtime - Modification time, oldest first\n
+    • size - Size, smallest first\n
+    • none - Directory order (fastest for huge directories)\n
+
+    On network filesystems, '--jobs' runs independent renames concurrently.
+
+    Renames are journaled, so an interrupted run is resumed by running the
+    command again, and '--undo' reverts the last run (PREFIX is ignored).
+
+    With '--recursive', every directory of the tree gets its own sequence of
+    IDs (or a single one, with '--global-seq'), and '--jobs' standardizes
+    that many directories at the same time.
+
+    Deduplication modes:\n
+    • report - Only list the duplicates\n
+    • delete - Delete the duplicates\n
+    • hardlink - Replace the duplicates with hard links to the original\n
+
+    Deleted or hard-linked duplicates don't receive IDs of their own.
     """
+    profile = _load_profile(ctx, "stddz")
     try:
-        use_case = StandardizeUseCaseFactory.get_use_case()
+        use_case = StandardizeUseCaseFactory.get_use_case(
+            RenameJournal(),
+            sort_key,
+            dry_run,
+            profile.get("jobs", jobs),
+            undo,
+            recursive,
+            global_seq,
+            dedup_mode,
+        )
+        _mark_phase("execute")
         use_case.execute(prefix, directory, start_idx, qt_digits)
     except FileNotFoundError as e:
         raise typer.BadParameter(f"'{directory}' does not exist.") from e
     except NotADirectoryError as e:
         raise typer.BadParameter(f"'{directory}' is not a directory.") from e
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+
+
+@app.command()
+def run(
+    ctx: typer.Context,
+    script: Annotated[
+        typer.FileText,
+        typer.Argument(
+            show_default=False, help="File with one command per line, or '-' to read from stdin."
+        ),
+    ],
+    fail_fast: Annotated[
+        bool, typer.Option("--fail-fast", help="Stop at the first command that fails.")
+    ] = False,
+) -> None:
+    """
+    RUN
+
+    Run many commands in a single process, one per line of a SCRIPT (without
+    the 'blossy' prefix), so that starting Blossy is paid only once.
+
+    Lines are split like in a shell, and blank lines and '#' comments are
+    ignored. The commands run in order, and the errors are written to stderr
+    along with their line numbers. If any command fails, the exit code is 1.
+    """
+    root = ctx.find_root()
+    qt_failed = 0
+    _mark_phase("execute")
+    for line_num, line in enumerate(script, start=1):
+        try:
+            args = shlex.split(line, comments=True)
+        except ValueError as e:
+            error: str | None = f"{e}."
+        else:
+            error = _run_command(root.command, args, root.obj) if args else None
+        if error is None:
+            continue
+
+        typer.echo(f"Line {line_num}: {error}", err=True)
+        qt_failed += 1
+        if fail_fast:
+            break
+
+    if qt_failed:
+        raise typer.Exit(code=1)
+
+
+def _run_command(group: click.Command, args: list[str], obj: Any) -> str | None:
+    if args[0] == run.__name__:
+        return "Scripts can't run other scripts."
+
+    try:
+        # without the standalone mode, errors are raised instead of exiting the whole process
+        exit_code = group.main(args, prog_name="blossy", standalone_mode=False, obj=obj)
+    except click.ClickException as e:
+        return e.format_message()
+    except click.Abort:
+        return "Aborted."
+    except Exception as e:
+        return str(e) or type(e).__name__
+    finally:
+        sys.stdout.flush()
+
+    if isinstance(exit_code, int) and exit_code != 0:
+        return f"Exited with code {exit_code}."
+    return None
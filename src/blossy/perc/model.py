@@ -0,0 +1,10 @@
+"""Module for PERCENTAGE models."""
+
+from enum import StrEnum
+
+
+class BatchOutputFormat(StrEnum):
+    """Format used to write the rows solved in batch mode."""
+
+    CSV = "csv"
+    JSONL = "jsonl"
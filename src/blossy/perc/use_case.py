@@ -1,9 +1,25 @@
 """Module for PERCENTAGE use cases."""
 
+import csv
+import json
+import math
+import sys
+from collections.abc import Callable, Sequence
+from itertools import batched
+from pathlib import Path
 from typing import Protocol
 
 import typer
 
+from blossy.perc.model import BatchOutputFormat
+
+_CHUNK_SIZE = 1 << 13
+_INVALID_NUMBER = "Invalid number."
+_NO_RESULT = "Result does not exist."
+
+# operations return either the solved value or the reason why the row has no result
+type _Operation = Callable[[float | None, float | None], float | str]
+
 
 class PercentageUseCase(Protocol):
     """Use case for calculating percentages."""
@@ -13,6 +29,14 @@ class PercentageUseCase(Protocol):
         ...
 
 
+class PercentageBatchUseCase(Protocol):
+    """Use case for calculating percentages for every row of a CSV file."""
+
+    def execute(self, file: Path) -> None:
+        """Execute the use case."""
+        ...
+
+
 class PercentageUseCaseFactory:
     """Factory for creating PERCENTAGE use cases."""
 
@@ -23,6 +47,16 @@ class PercentageUseCaseFactory:
         """Get an instance of the PERCENTAGE use case based on the flags."""
         return _PercentageUseCaseOption1(full_msg)
 
+    @staticmethod
+    def get_batch_use_case(
+        whole_col: str | None,
+        part_col: str | None,
+        ratio_col: str | None,
+        output_format: BatchOutputFormat,
+    ) -> PercentageBatchUseCase:
+        """Get an instance of the batch PERCENTAGE use case based on the flags."""
+        return _PercentageBatchUseCaseOption1(whole_col, part_col, ratio_col, output_format)
+
 
 class _PercentageUseCaseOption1:
     """Use case for calculating percentages."""
@@ -52,3 +86,134 @@ class _PercentageUseCaseOption1:
 
         else:
             raise typer.BadParameter("Less than two parameters passed.")
+
+
+class _PercentageBatchUseCaseOption1:
+    """Use case for calculating percentages for every row of a CSV file, chunk by chunk."""
+
+    _whole_col: str | None
+    _part_col: str | None
+    _ratio_col: str | None
+    _output_format: BatchOutputFormat
+
+    def __init__(
+        self,
+        whole_col: str | None,
+        part_col: str | None,
+        ratio_col: str | None,
+        output_format: BatchOutputFormat,
+    ) -> None:
+        self._whole_col = whole_col
+        self._part_col = part_col
+        self._ratio_col = ratio_col
+        self._output_format = output_format
+
+    def execute(self, file: Path) -> None:
+        """Execute the use case."""
+        operation, columns, result_col = self._get_operation()
+
+        with open(file, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                raise typer.BadParameter(f"'{file}' is empty.")
+            idx_1, idx_2 = (self._get_column_idx(header, column) for column in columns)
+
+            out_header = header if result_col in header else header + [result_col]
+            write = self._get_writer(out_header)
+
+            row_num = 1
+            for chunk in batched(reader, _CHUNK_SIZE):
+                # each column is converted and solved as a whole, instead of row by row
+                results = list(
+                    map(
+                        operation,
+                        _to_floats(_column(chunk, idx_1)),
+                        _to_floats(_column(chunk, idx_2)),
+                    )
+                )
+                write(self._build_rows(chunk, results, out_header, result_col, row_num))
+                row_num += len(chunk)
+
+    def _get_operation(self) -> tuple[_Operation, tuple[str, str], str]:
+        if self._whole_col is not None and self._part_col is not None:
+            return _divide, (self._part_col, self._whole_col), "ratio"
+        if self._whole_col is not None and self._ratio_col is not None:
+            return _multiply, (self._whole_col, self._ratio_col), "part"
+        if self._part_col is not None and self._ratio_col is not None:
+            return _divide, (self._part_col, self._ratio_col), "whole"
+        raise typer.BadParameter("Less than two columns passed.")
+
+    def _get_column_idx(self, header: list[str], column: str) -> int:
+        if column not in header:
+            raise typer.BadParameter(f"Column '{column}' does not exist.")
+        return header.index(column)
+
+    def _build_rows(
+        self,
+        rows: Sequence[list[str]],
+        results: list[float | str],
+        header: list[str],
+        result_col: str,
+        first_row_num: int,
+    ) -> list[list[str | float | None]]:
+        idx_result = header.index(result_col)
+        out_rows: list[list[str | float | None]] = []
+        for row_num, (row, result) in enumerate(zip(rows, results), start=first_row_num):
+            # infinite or NaN results (e.g. from 'inf' inputs or overflows) aren't numbers either
+            if isinstance(result, float) and not math.isfinite(result):
+                result = _NO_RESULT
+            out_row: list[str | float | None] = list(row)
+            out_row.extend([None] * (len(header) - len(row)))
+            if isinstance(result, str):
+                print(f"Row {row_num}: {result}", file=sys.stderr)
+                out_row[idx_result] = None
+            else:
+                out_row[idx_result] = result
+            out_rows.append(out_row)
+        return out_rows
+
+    def _get_writer(self, header: list[str]) -> Callable[[list[list[str | float | None]]], None]:
+        if self._output_format == BatchOutputFormat.CSV:
+            writer = csv.writer(sys.stdout, lineterminator="\n")
+            writer.writerow(header)
+            return writer.writerows
+
+        def write_jsonl(rows: list[list[str | float | None]]) -> None:
+            sys.stdout.write(
+                "".join(json.dumps(dict(zip(header, row)), allow_nan=False) + "\n" for row in rows)
+            )
+
+        return write_jsonl
+
+
+def _divide(dividend: float | None, divisor: float | None) -> float | str:
+    if dividend is None or divisor is None:
+        return _INVALID_NUMBER
+    if divisor == 0:
+        return _NO_RESULT
+    return dividend / divisor
+
+
+def _multiply(factor_1: float | None, factor_2: float | None) -> float | str:
+    if factor_1 is None or factor_2 is None:
+        return _INVALID_NUMBER
+    return factor_1 * factor_2
+
+
+def _column(rows: Sequence[Sequence[str]], idx: int) -> list[str]:
+    return [row[idx] if idx < len(row) else "" for row in rows]
+
+
+def _to_floats(values: list[str]) -> list[float | None]:
+    try:
+        return list(map(float, values))
+    except ValueError:
+        return list(map(_to_float, values))
+
+
+def _to_float(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
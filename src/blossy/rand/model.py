@@ -0,0 +1,21 @@
+"""Module for RANDOM models."""
+
+from enum import StrEnum
+
+
+class SamplingAlgorithm(StrEnum):
+    """Algorithm used to sample numbers without replacement."""
+
+    AUTO = "auto"
+    FLOYD = "floyd"
+    SHUFFLE = "shuffle"
+    FEISTEL = "feistel"
+
+
+class OutputFormat(StrEnum):
+    """Format used to write the generated numbers."""
+
+    TEXT = "text"
+    BIN64 = "bin64"
+    NPY = "npy"
+    CSV = "csv"
@@ -0,0 +1,266 @@
+"""Module for RANDOM services."""
+
+import hashlib
+import random
+import secrets
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import BinaryIO, Protocol
+
+from blossy.rand.model import OutputFormat
+
+
+class SeedSequence:
+    """Deterministic source of seeds for independent, non-overlapping random streams."""
+
+    _entropy: int
+    _spawn_key: tuple[int, ...]
+    _qt_spawned: int
+
+    def __init__(self, entropy: int | None = None, spawn_key: tuple[int, ...] = ()) -> None:
+        self._entropy = secrets.randbits(128) if entropy is None else entropy
+        self._spawn_key = spawn_key
+        self._qt_spawned = 0
+
+    @property
+    def entropy(self) -> int:
+        """Root entropy shared by the whole tree of sequences."""
+        return self._entropy
+
+    @property
+    def spawn_key(self) -> tuple[int, ...]:
+        """Path from the root sequence to this one."""
+        return self._spawn_key
+
+    def spawn(self, quantity: int) -> list["SeedSequence"]:
+        """Create child sequences, each one yielding a different stream."""
+        children = [
+            SeedSequence(self._entropy, self._spawn_key + (self._qt_spawned + i,))
+            for i in range(quantity)
+        ]
+        self._qt_spawned += quantity
+        return children
+
+    def generate_state(self) -> int:
+        """Derive the 256-bit seed for this sequence."""
+        key = ",".join(map(str, (self._entropy,) + self._spawn_key))
+        digest = hashlib.blake2b(key.encode(), digest_size=32, person=b"blossy-rand").digest()
+        return int.from_bytes(digest, "little")
+
+
+def generate_chunk(state: int, lower: int, upper: int, size: int) -> list[int]:
+    """Generate a chunk of random numbers in [lower, upper] from a seed state."""
+    randrange = random.Random(state).randrange
+    stop = upper + 1
+    return [randrange(lower, stop) for _ in range(size)]
+
+
+def floyd_sample(rng: random.Random, size: int, quantity: int) -> list[int]:
+    """Sample distinct offsets in [0, size) using Floyd's algorithm, in O(quantity) memory."""
+    chosen: set[int] = set()
+    for j in range(size - quantity, size):
+        candidate = rng.randrange(j + 1)
+        chosen.add(j if candidate in chosen else candidate)
+
+    # Floyd's algorithm picks a uniform subset, but not a uniform order
+    sample = list(chosen)
+    rng.shuffle(sample)
+    return sample
+
+
+def shuffle_sample(rng: random.Random, size: int, quantity: int) -> Iterator[int]:
+    """Stream distinct offsets in [0, size) using a partial Fisher-Yates shuffle."""
+    pool = list(range(size))
+    for i in range(quantity):
+        j = rng.randrange(i, size)
+        pool[i], pool[j] = pool[j], pool[i]
+        yield pool[i]
+
+
+class FeistelPermutation:
+    """Keyed bijection over [0, size), computed in O(1) memory."""
+
+    _QT_ROUNDS = 6
+    _MASK_64 = (1 << 64) - 1
+
+    _size: int
+    _half_bits: int
+    _half_mask: int
+    _keys: tuple[int, ...]
+
+    def __init__(self, size: int, state: int) -> None:
+        self._size = size
+        self._half_bits = (max(2, (size - 1).bit_length()) + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        self._keys = tuple((state >> (i * 32)) & self._MASK_64 for i in range(self._QT_ROUNDS))
+
+    def permute(self, index: int) -> int:
+        """Map an index in [0, size) to its position in the permutation."""
+        value = self._encrypt(index)
+        # cycle-walking: the cipher domain is a power of 4, so walk until back inside the range
+        while value >= self._size:
+            value = self._encrypt(value)
+        return value
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self._half_bits) | right
+
+    def _round(self, value: int, key: int) -> int:
+        if self._half_bits > 64:
+            data = value.to_bytes((self._half_bits + 7) // 8, "little")
+            digest = hashlib.blake2b(data, key=key.to_bytes(8, "little")).digest()
+            return int.from_bytes(digest, "little") & self._half_mask
+
+        # splitmix64 finalizer
+        mixed = ((value ^ key) + 0x9E3779B97F4A7C15) & self._MASK_64
+        mixed = ((mixed ^ (mixed >> 30)) * 0xBF58476D1CE4E5B9) & self._MASK_64
+        mixed = ((mixed ^ (mixed >> 27)) * 0x94D049BB133111EB) & self._MASK_64
+        return (mixed ^ (mixed >> 31)) & self._half_mask
+
+
+def permute_chunk(state: int, lower: int, upper: int, start: int, stop: int) -> list[int]:
+    """Generate the numbers at positions [start, stop) of a seeded permutation of [lower, upper]."""
+    permute = FeistelPermutation(upper - lower + 1, state).permute
+    return [lower + permute(i) for i in range(start, stop)]
+
+
+def encode_chunk(output_format: OutputFormat, chunk: Sequence[int]) -> bytes:
+    """Encode a chunk of numbers in an output format, ready to be given to its writer."""
+    # encoding costs as much as generating, so it's done by the workers, not by the writer
+    match output_format:
+        case OutputFormat.TEXT:
+            return " ".join(map(str, chunk)).encode("ascii")
+        case OutputFormat.CSV:
+            return "".join(map("{}\n".format, chunk)).encode("ascii")
+        case OutputFormat.BIN64 | OutputFormat.NPY:
+            buffer = array("q", chunk)
+            if sys.byteorder == "big":
+                buffer.byteswap()
+            return buffer.tobytes()
+
+
+class NumberWriter(Protocol):
+    """Writer that frames chunks of numbers, encoded by 'encode_chunk', into a binary stream."""
+
+    def begin(self) -> None:
+        """Write whatever precedes the numbers."""
+        ...
+
+    def write(self, chunk: bytes) -> None:
+        """Write an encoded chunk of numbers."""
+        ...
+
+    def end(self) -> None:
+        """Write whatever follows the numbers."""
+        ...
+
+
+class NumberWriterFactory:
+    """Factory for creating number writers."""
+
+    @staticmethod
+    def get_writer(output_format: OutputFormat, stream: BinaryIO, quantity: int) -> NumberWriter:
+        """Get the writer for the given output format."""
+        match output_format:
+            case OutputFormat.TEXT:
+                return _TextNumberWriter(stream)
+            case OutputFormat.CSV:
+                return _CsvNumberWriter(stream)
+            case OutputFormat.BIN64:
+                return _Bin64NumberWriter(stream)
+            case OutputFormat.NPY:
+                return _NpyNumberWriter(stream, quantity)
+
+
+class _TextNumberWriter:
+    """Writer for space-separated numbers in a single line."""
+
+    _stream: BinaryIO
+    _separator: bytes
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._separator = b""
+
+    def begin(self) -> None:
+        """Write whatever precedes the numbers."""
+        self._separator = b""
+
+    def write(self, chunk: bytes) -> None:
+        """Write an encoded chunk of numbers."""
+        self._stream.write(self._separator)
+        self._stream.write(chunk)
+        self._separator = b" "
+
+    def end(self) -> None:
+        """Write whatever follows the numbers."""
+        # no numbers make no line at all
+        if self._separator:
+            self._stream.write(b"\n")
+
+
+class _CsvNumberWriter:
+    """Writer for a single-column CSV, one number per row."""
+
+    _stream: BinaryIO
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+
+    def begin(self) -> None:
+        """Write whatever precedes the numbers."""
+        self._stream.write(b"value\n")
+
+    def write(self, chunk: bytes) -> None:
+        """Write an encoded chunk of numbers."""
+        self._stream.write(chunk)
+
+    def end(self) -> None:
+        """Write whatever follows the numbers."""
+
+
+class _Bin64NumberWriter:
+    """Writer for raw little-endian signed 64-bit integers."""
+
+    _stream: BinaryIO
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+
+    def begin(self) -> None:
+        """Write whatever precedes the numbers."""
+
+    def write(self, chunk: bytes) -> None:
+        """Write an encoded chunk of numbers."""
+        self._stream.write(chunk)
+
+    def end(self) -> None:
+        """Write whatever follows the numbers."""
+
+
+class _NpyNumberWriter(_Bin64NumberWriter):
+    """Writer for a one-dimensional NumPy array file ('.npy', format version 1.0)."""
+
+    _MAGIC = b"\x93NUMPY\x01\x00"
+    _ALIGNMENT = 64
+
+    _quantity: int
+
+    def __init__(self, stream: BinaryIO, quantity: int) -> None:
+        super().__init__(stream)
+        self._quantity = quantity
+
+    def begin(self) -> None:
+        """Write whatever precedes the numbers."""
+        header = f"{{'descr': '<i8', 'fortran_order': False, 'shape': ({self._quantity},), }}"
+        # magic + header length + header + newline must be aligned for mmap-friendly reads
+        unpadded_len = len(self._MAGIC) + 2 + len(header) + 1
+        header += " " * (-unpadded_len % self._ALIGNMENT) + "\n"
+
+        self._stream.write(self._MAGIC)
+        self._stream.write(len(header).to_bytes(2, "little"))
+        self._stream.write(header.encode("latin1"))
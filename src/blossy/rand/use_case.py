@@ -1,10 +1,43 @@
 """Module for RANDOM use cases."""
 
+import functools
 import random
-from typing import Protocol
+import sys
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import batched
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol
 
 import typer
 
+from blossy.rand.model import OutputFormat, SamplingAlgorithm
+from blossy.rand.service import (
+    NumberWriterFactory,
+    SeedSequence,
+    encode_chunk,
+    floyd_sample,
+    generate_chunk,
+    permute_chunk,
+    shuffle_sample,
+)
+
+_CHUNK_SIZE = 1 << 17
+_SHUFFLE_MAX_SIZE = 1 << 24
+_FLOYD_MAX_QUANTITY = 1 << 22
+_BUFFER_SIZE = 1 << 20
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class FileAdapter(Protocol):
+    """Adapter for file operations."""
+
+    def open_writer(self, path: Path, buffer_size: int) -> BinaryIO:
+        """Open a file for binary writing through a buffer of the given size."""
+        ...
+
 
 class RandomUseCase(Protocol):
     """Use case for generating random numbers."""
@@ -18,9 +51,24 @@ class RandomUseCaseFactory:
     """Factory for creating RANDOM use cases."""
 
     @staticmethod
-    def get_use_case() -> RandomUseCase:
+    def get_use_case(
+        file_adapter: FileAdapter,
+        seed: int | None = None,
+        jobs: int = 1,
+        unique: bool = False,
+        algorithm: SamplingAlgorithm = SamplingAlgorithm.AUTO,
+        output_format: OutputFormat = OutputFormat.TEXT,
+        output: Path | None = None,
+        buffer_size: int = _BUFFER_SIZE,
+    ) -> RandomUseCase:
         """Get an instance of the RANDOM use case based on the flags."""
-        return _RandomUseCaseOption1()
+        if unique:
+            return _RandomUseCaseOption3(
+                file_adapter, seed, jobs, algorithm, output_format, output, buffer_size
+            )
+        if seed is None and jobs == 1 and output_format == OutputFormat.TEXT and output is None:
+            return _RandomUseCaseOption1()
+        return _RandomUseCaseOption2(file_adapter, seed, jobs, output_format, output, buffer_size)
 
 
 class _RandomUseCaseOption1:
@@ -35,3 +83,222 @@ class _RandomUseCaseOption1:
             number = random.randint(lower, upper)
             end_char = " " if i < (quantity - 1) else "\n"
             print(number, end=end_char)
+
+
+class _RandomUseCaseOption2:
+    """Use case for generating random numbers from seeded streams, optionally in parallel."""
+
+    _file_adapter: FileAdapter
+    _seed: int | None
+    _jobs: int
+    _output_format: OutputFormat
+    _output: Path | None
+    _buffer_size: int
+
+    def __init__(
+        self,
+        file_adapter: FileAdapter,
+        seed: int | None,
+        jobs: int,
+        output_format: OutputFormat,
+        output: Path | None,
+        buffer_size: int,
+    ) -> None:
+        self._file_adapter = file_adapter
+        self._seed = seed
+        self._jobs = jobs
+        self._output_format = output_format
+        self._output = output
+        self._buffer_size = buffer_size
+
+    def execute(self, lower: int, upper: int, quantity: int = 1) -> None:
+        """Execute the use case."""
+        _validate(lower, upper, self._jobs, self._output_format)
+        if quantity <= 0:
+            # an empty output must still be a valid file of its format, like an '.npy' header
+            _write_numbers(
+                self._file_adapter, [], 0, self._output_format, self._output, self._buffer_size
+            )
+            return
+
+        # every chunk owns a stream, so the output doesn't depend on how chunks are scheduled
+        sizes = [min(_CHUNK_SIZE, quantity - start) for start in range(0, quantity, _CHUNK_SIZE)]
+        streams = SeedSequence(self._seed).spawn(len(sizes))
+        tasks = [
+            (stream.generate_state(), lower, upper, size) for stream, size in zip(streams, sizes)
+        ]
+
+        chunks = _map_ordered(_encoded(generate_chunk, self._output_format), tasks, self._jobs)
+        _write_numbers(
+            self._file_adapter,
+            chunks,
+            quantity,
+            self._output_format,
+            self._output,
+            self._buffer_size,
+        )
+
+
+class _RandomUseCaseOption3:
+    """Use case for generating distinct random numbers (sampling without replacement)."""
+
+    _file_adapter: FileAdapter
+    _seed: int | None
+    _jobs: int
+    _algorithm: SamplingAlgorithm
+    _output_format: OutputFormat
+    _output: Path | None
+    _buffer_size: int
+
+    def __init__(
+        self,
+        file_adapter: FileAdapter,
+        seed: int | None,
+        jobs: int,
+        algorithm: SamplingAlgorithm,
+        output_format: OutputFormat,
+        output: Path | None,
+        buffer_size: int,
+    ) -> None:
+        self._file_adapter = file_adapter
+        self._seed = seed
+        self._jobs = jobs
+        self._algorithm = algorithm
+        self._output_format = output_format
+        self._output = output
+        self._buffer_size = buffer_size
+
+    def execute(self, lower: int, upper: int, quantity: int = 1) -> None:
+        """Execute the use case."""
+        _validate(lower, upper, self._jobs, self._output_format)
+
+        size = upper - lower + 1
+        if quantity > size:
+            raise typer.BadParameter(
+                f"Quantity exceeds the {size} distinct numbers available in the range."
+            )
+        if quantity <= 0:
+            # an empty output must still be a valid file of its format, like an '.npy' header
+            _write_numbers(
+                self._file_adapter, [], 0, self._output_format, self._output, self._buffer_size
+            )
+            return
+
+        state = SeedSequence(self._seed).generate_state()
+        match self._choose_algorithm(size, quantity):
+            case SamplingAlgorithm.FLOYD:
+                offsets = floyd_sample(random.Random(state), size, quantity)
+                chunks = self._encode(lower + offset for offset in offsets)
+            case SamplingAlgorithm.SHUFFLE:
+                offsets = shuffle_sample(random.Random(state), size, quantity)
+                chunks = self._encode(lower + offset for offset in offsets)
+            case _:
+                tasks = [
+                    (state, lower, upper, start, min(start + _CHUNK_SIZE, quantity))
+                    for start in range(0, quantity, _CHUNK_SIZE)
+                ]
+                chunks = _map_ordered(
+                    _encoded(permute_chunk, self._output_format), tasks, self._jobs
+                )
+
+        _write_numbers(
+            self._file_adapter,
+            chunks,
+            quantity,
+            self._output_format,
+            self._output,
+            self._buffer_size,
+        )
+
+    def _encode(self, numbers: Iterable[int]) -> Iterator[bytes]:
+        for chunk in batched(numbers, _CHUNK_SIZE):
+            yield encode_chunk(self._output_format, chunk)
+
+    def _choose_algorithm(self, size: int, quantity: int) -> SamplingAlgorithm:
+        # shuffling holds the whole range in memory
+        if self._algorithm == SamplingAlgorithm.SHUFFLE and size > _SHUFFLE_MAX_SIZE:
+            raise typer.BadParameter(
+                f"Range is too big to shuffle (at most {_SHUFFLE_MAX_SIZE} numbers)."
+            )
+        if self._algorithm != SamplingAlgorithm.AUTO:
+            return self._algorithm
+
+        if size <= 4 * quantity and size <= _SHUFFLE_MAX_SIZE:
+            return SamplingAlgorithm.SHUFFLE
+        if quantity <= _FLOYD_MAX_QUANTITY:
+            return SamplingAlgorithm.FLOYD
+        return SamplingAlgorithm.FEISTEL
+
+
+def _encoded(
+    function: Callable[..., Sequence[int]], output_format: OutputFormat
+) -> Callable[..., bytes]:
+    # the workers encode their own chunks, leaving only the writing to the main process
+    return functools.partial(_generate_encoded, function, output_format)
+
+
+def _generate_encoded(
+    function: Callable[..., Sequence[int]], output_format: OutputFormat, *args: Any
+) -> bytes:
+    return encode_chunk(output_format, function(*args))
+
+
+def _map_ordered[T](
+    function: Callable[..., T], tasks: Sequence[tuple[int, ...]], jobs: int
+) -> Iterator[T]:
+    if jobs == 1:
+        for task in tasks:
+            yield function(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: deque[Future[T]] = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, *task))
+            # bounded window keeps memory flat while preserving the output order
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _validate(lower: int, upper: int, jobs: int, output_format: OutputFormat) -> None:
+    if lower > upper:
+        raise typer.BadParameter("Invalid range.")
+    if jobs < 1:
+        raise typer.BadParameter("Quantity of jobs must be positive.")
+    if output_format in (OutputFormat.BIN64, OutputFormat.NPY) and (
+        lower < _INT64_MIN or upper > _INT64_MAX
+    ):
+        raise typer.BadParameter(f"Range does not fit in the '{output_format}' format.")
+
+
+def _write_numbers(
+    file_adapter: FileAdapter,
+    chunks: Iterable[bytes],
+    quantity: int,
+    output_format: OutputFormat,
+    output: Path | None,
+    buffer_size: int,
+) -> None:
+    if output is None:
+        sys.stdout.flush()
+        _write_to_stream(chunks, quantity, output_format, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return
+
+    with file_adapter.open_writer(output, buffer_size) as stream:
+        _write_to_stream(chunks, quantity, output_format, stream)
+
+
+def _write_to_stream(
+    chunks: Iterable[bytes],
+    quantity: int,
+    output_format: OutputFormat,
+    stream: BinaryIO,
+) -> None:
+    writer = NumberWriterFactory.get_writer(output_format, stream, quantity)
+    writer.begin()
+    for chunk in chunks:
+        writer.write(chunk)
+    writer.end()
@@ -0,0 +1 @@
+"""Package for the RANDOM LINES command."""
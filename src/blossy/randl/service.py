@@ -0,0 +1,143 @@
+"""Module for RANDOM LINES services."""
+
+import math
+import random
+import sys
+import tempfile
+from collections.abc import Iterable
+from contextlib import ExitStack
+from pathlib import Path
+from typing import BinaryIO
+
+_READ_HINT = 1 << 20
+_BUCKET_BUFFER_SIZE = 1 << 16
+# every bucket is an open file while scattering, so they must stay well below 'ulimit -n'
+_MAX_BUCKETS = 256
+# besides its content, each line held in memory costs a bytes object's header, the list's
+# pointer to it and the allocator's rounding, which dwarfs short lines
+_LINE_OVERHEAD = sys.getsizeof(b"") + 8 + 7
+
+
+class ExternalShuffler:
+    """Shuffles lines of arbitrarily large files within a memory budget."""
+
+    _rng: random.Random
+    _memory_budget: int
+    _temp_dir: Path | None
+
+    def __init__(self, rng: random.Random, memory_budget: int, temp_dir: Path | None) -> None:
+        self._rng = rng
+        self._memory_budget = memory_budget
+        self._temp_dir = temp_dir
+
+    def shuffle(self, file: Path, output: BinaryIO) -> None:
+        """Write the lines of the file to the output in a uniformly random order."""
+        size = file.stat().st_size
+        self._shuffle(file, output, size, _estimate_lines(file, size), None)
+
+    def _shuffle(
+        self, file: Path, output: BinaryIO, size: int, qt_lines: int, parent_size: int | None
+    ) -> None:
+        footprint = size + qt_lines * _LINE_OVERHEAD
+        # a single line, or a bucket as big as its parent, can't be split any further
+        if footprint <= self._memory_budget or qt_lines <= 1 or size == parent_size:
+            with open(file, "rb") as source:
+                lines = _terminated(source.readlines())
+            self._rng.shuffle(lines)
+            output.writelines(lines)
+            return
+
+        # half of the budget per bucket leaves room for the unlucky, bigger ones
+        qt_buckets = min(math.ceil(2 * footprint / self._memory_budget), _MAX_BUCKETS)
+        with tempfile.TemporaryDirectory(prefix="blossy-randl-", dir=self._temp_dir) as temp_dir:
+            buckets = [Path(temp_dir) / f"{i}.bucket" for i in range(qt_buckets)]
+            counts = self._scatter(file, buckets)
+            for bucket, count in zip(buckets, counts):
+                # a bucket that still doesn't fit (e.g. due to the cap) is scattered again
+                self._shuffle(bucket, output, *count, size)
+                bucket.unlink()
+
+    def _scatter(self, file: Path, buckets: list[Path]) -> list[tuple[int, int]]:
+        # the size and quantity of lines of each bucket are counted along the way, so deciding
+        # whether it fits doesn't take another pass
+        qt_buckets = len(buckets)
+        sizes = [0] * qt_buckets
+        qts_lines = [0] * qt_buckets
+        randrange = self._rng.randrange
+        with ExitStack() as stack:
+            files = [
+                stack.enter_context(open(bucket, "wb", buffering=_BUCKET_BUFFER_SIZE))
+                for bucket in buckets
+            ]
+            source = stack.enter_context(open(file, "rb"))
+            while lines := source.readlines(_READ_HINT):
+                batches: list[list[bytes]] = [[] for _ in range(qt_buckets)]
+                for line in _terminated(lines):
+                    batches[randrange(qt_buckets)].append(line)
+                for i, batch in enumerate(batches):
+                    files[i].writelines(batch)
+                    sizes[i] += sum(map(len, batch))
+                    qts_lines[i] += len(batch)
+        return list(zip(sizes, qts_lines))
+
+
+class ReservoirSampler:
+    """Samples lines uniformly from a stream of unknown length, in a single pass."""
+
+    _rng: random.Random
+
+    def __init__(self, rng: random.Random) -> None:
+        self._rng = rng
+
+    def sample(self, lines: Iterable[bytes], quantity: int) -> list[bytes]:
+        """Pick the given quantity of lines (or all of them), in a random order."""
+        if quantity <= 0:
+            return []
+
+        iterator = iter(lines)
+        reservoir = [line for _, line in zip(range(quantity), iterator)]
+        if len(reservoir) == quantity:
+            self._fill(reservoir, iterator)
+
+        self._rng.shuffle(reservoir)
+        return [line if line.endswith(b"\n") else line + b"\n" for line in reservoir]
+
+    def _fill(self, reservoir: list[bytes], iterator: Iterable[bytes]) -> None:
+        # Li's "Algorithm L": jump straight to the next replaced line instead of
+        # drawing a random number for every single line
+        quantity = len(reservoir)
+        weight = math.exp(math.log(self._random()) / quantity)
+        skip = math.floor(math.log(self._random()) / math.log(1.0 - weight))
+
+        for line in iterator:
+            if skip > 0:
+                skip -= 1
+                continue
+
+            reservoir[self._rng.randrange(quantity)] = line
+            weight *= math.exp(math.log(self._random()) / quantity)
+            skip = math.floor(math.log(self._random()) / math.log(1.0 - weight))
+
+    def _random(self) -> float:
+        # in (0, 1), so that logarithms stay finite
+        value = self._rng.random()
+        while value == 0.0:
+            value = self._rng.random()
+        return value
+
+
+def _terminated(lines: list[bytes]) -> list[bytes]:
+    # only the last line of a file may lack the line break
+    if lines and not lines[-1].endswith(b"\n"):
+        lines[-1] += b"\n"
+    return lines
+
+
+def _estimate_lines(file: Path, size: int) -> int:
+    # counted exactly in small files, and extrapolated from the beginning of bigger ones
+    with open(file, "rb") as source:
+        sample = source.read(_READ_HINT)
+    qt_lines = sample.count(b"\n") + (not sample.endswith(b"\n") and len(sample) == size)
+    if not sample or len(sample) == size:
+        return qt_lines
+    return math.ceil(qt_lines * size / len(sample))
@@ -0,0 +1,153 @@
+"""Module for RANDOM LINES use cases."""
+
+import random
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+import typer
+
+from blossy.rand.service import SeedSequence
+from blossy.randl.service import ExternalShuffler, ReservoirSampler
+
+_BUFFER_SIZE = 1 << 20
+
+
+class FileAdapter(Protocol):
+    """Adapter for file operations."""
+
+    def open_writer(self, path: Path, buffer_size: int) -> BinaryIO:
+        """Open a file for binary writing through a buffer of the given size."""
+        ...
+
+
+class RandomLinesUseCase(Protocol):
+    """Use case for shuffling or sampling the lines of a file."""
+
+    def execute(self, file: Path) -> None:
+        """Execute the use case."""
+        ...
+
+
+class RandomLinesUseCaseFactory:
+    """Factory for creating RANDOM LINES use cases."""
+
+    @staticmethod
+    def get_use_case(
+        file_adapter: FileAdapter,
+        seed: int | None = None,
+        sample: int | None = None,
+        memory_budget: int = 256 << 20,
+        temp_dir: Path | None = None,
+        output: Path | None = None,
+        buffer_size: int = _BUFFER_SIZE,
+    ) -> RandomLinesUseCase:
+        """Get an instance of the RANDOM LINES use case based on the flags."""
+        rng = random.Random(SeedSequence(seed).generate_state())
+        if sample is not None:
+            return _RandomLinesUseCaseOption1(
+                file_adapter, ReservoirSampler(rng), sample, output, buffer_size
+            )
+        return _RandomLinesUseCaseOption2(
+            file_adapter,
+            ExternalShuffler(rng, memory_budget, temp_dir),
+            memory_budget,
+            output,
+            buffer_size,
+        )
+
+
+class _RandomLinesUseCaseOption1:
+    """Use case for sampling lines of a file with reservoir sampling."""
+
+    _file_adapter: FileAdapter
+    _sampler: ReservoirSampler
+    _quantity: int
+    _output: Path | None
+    _buffer_size: int
+
+    def __init__(
+        self,
+        file_adapter: FileAdapter,
+        sampler: ReservoirSampler,
+        quantity: int,
+        output: Path | None,
+        buffer_size: int,
+    ) -> None:
+        self._file_adapter = file_adapter
+        self._sampler = sampler
+        self._quantity = quantity
+        self._output = output
+        self._buffer_size = buffer_size
+
+    def execute(self, file: Path) -> None:
+        """Execute the use case."""
+        if self._quantity < 0:
+            raise typer.BadParameter("Negative sample size.")
+
+        with open(file, "rb", buffering=self._buffer_size) as source:
+            lines = self._sampler.sample(source, self._quantity)
+
+        _write_output(
+            self._file_adapter,
+            self._output,
+            self._buffer_size,
+            lambda output: output.writelines(lines),
+        )
+
+
+class _RandomLinesUseCaseOption2:
+    """Use case for shuffling all lines of a file, spilling to disk when needed."""
+
+    _file_adapter: FileAdapter
+    _shuffler: ExternalShuffler
+    _memory_budget: int
+    _output: Path | None
+    _buffer_size: int
+
+    def __init__(
+        self,
+        file_adapter: FileAdapter,
+        shuffler: ExternalShuffler,
+        memory_budget: int,
+        output: Path | None,
+        buffer_size: int,
+    ) -> None:
+        self._file_adapter = file_adapter
+        self._shuffler = shuffler
+        self._memory_budget = memory_budget
+        self._output = output
+        self._buffer_size = buffer_size
+
+    def execute(self, file: Path) -> None:
+        """Execute the use case."""
+        if self._memory_budget <= 0:
+            raise typer.BadParameter("Memory budget must be positive.")
+        if not file.exists():
+            raise FileNotFoundError(file)
+        if file.is_dir():
+            raise IsADirectoryError(file)
+
+        _write_output(
+            self._file_adapter,
+            self._output,
+            self._buffer_size,
+            lambda output: self._shuffler.shuffle(file, output),
+        )
+
+
+def _write_output(
+    file_adapter: FileAdapter,
+    output: Path | None,
+    buffer_size: int,
+    write: Callable[[BinaryIO], None],
+) -> None:
+    if output is None:
+        sys.stdout.flush()
+        write(sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return
+
+    with file_adapter.open_writer(output, buffer_size) as stream:
+        write(stream)
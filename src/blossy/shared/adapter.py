@@ -1,30 +1,313 @@
 """Shared adapters for Blossy."""
 
+import asyncio
+import codecs
+import io
+import mmap
+import os
+import signal
+import stat
 import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, BinaryIO
+
+from blossy.shared.model import ProcessResult
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # pylint: disable=invalid-name
+
+_LOCK_POLL_SECS = 0.05
 
 
 class FileAdapter:
     """Adapter for file operations."""
 
-    def create_if_not_exists(self, path: Path) -> None:
-        """Create an empty file at the given path."""
-        if not path.exists():
-            path.touch()
+    def stat(self, path: Path) -> tuple[int, int] | None:
+        """Get the modification time (in nanoseconds) and the size of a file, if it exists."""
+        try:
+            result = path.stat()
+        except FileNotFoundError:
+            return None
+        return result.st_mtime_ns, result.st_size
 
     def read_text(self, path: Path) -> str:
         """Read text from a file at the given path."""
-        return path.read_text()
+        return path.read_text(encoding="utf-8")
 
     def write_text(self, path: Path, content: str) -> None:
-        """Write text to a file at the given path."""
-        path.write_text(content)
+        """Write text to a file at the given path, replacing it atomically."""
+        _replace(path, content.encode())
+
+    def read_bytes(self, path: Path) -> bytes:
+        """Read bytes from a file at the given path."""
+        return path.read_bytes()
+
+    def write_bytes(self, path: Path, content: bytes) -> None:
+        """Write bytes to a file at the given path, replacing it atomically."""
+        _replace(path, content)
+
+    def read_chunks(self, path: Path, block_size: int) -> Iterator[bytes]:
+        """Read a file in blocks of up to the given size, from start to end."""
+        with open(path, "rb", buffering=0) as stream:
+            _advise_sequential(stream.fileno())
+            while block := stream.read(block_size):
+                yield block
+
+    def read_text_chunks(self, path: Path, block_size: int) -> Iterator[str]:
+        """Read a UTF-8 file in pieces of up to the given size, translating newlines to '\\n'."""
+        # the same translation text mode does, even for a '\r\n' split between two blocks
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(), translate=True
+        )
+        for block in self.read_chunks(path, block_size):
+            if text := decoder.decode(block):
+                yield text
+        if text := decoder.decode(b"", final=True):
+            yield text
+
+    @contextmanager
+    def map_view(self, path: Path) -> Iterator[memoryview]:
+        """Map a file into memory, viewing its bytes without copying them."""
+        with open(path, "rb") as stream:
+            # empty files can't be mapped
+            if os.fstat(stream.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mapped) as view:
+                    yield view
+
+    def open_writer(self, path: Path, buffer_size: int) -> BinaryIO:
+        """Open a file for binary writing through a buffer of the given size."""
+        return open(path, "wb", buffering=buffer_size)
+
+    @contextmanager
+    def lock(self, path: Path, timeout: float) -> Iterator[None]:
+        """Hold an advisory lock on the file at the given path, waiting up to the timeout."""
+        if fcntl is None:
+            yield
+            return
+
+        with open(path, "a", encoding="utf-8") as lock_file:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError as e:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Timed out waiting for the lock on '{path}'.") from e
+                    time.sleep(_LOCK_POLL_SECS)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 
 class SubprocessAdapter:
-    """Adapter for subprocess operations."""
+    """Adapter for subprocess operations, with a bounded pool to run them concurrently."""
+
+    _timeout: float | None
+    _executor: ThreadPoolExecutor
+    _futures: set[Future[Any]]
+    _running: dict[object, "subprocess.Popen[str]"]
+    _cancelled: set[object]
+    _lock: threading.Lock
+
+    def __init__(self, max_workers: int | None = None, timeout: float | None = None) -> None:
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = set()
+        self._running = {}
+        self._cancelled = set()
+        self._lock = threading.Lock()
 
     def run(self, *args: str) -> None:
         """Run a subprocess with the given arguments."""
 
-        subprocess.run(args, check=True)
+        subprocess.run(args, check=True, timeout=self._timeout)
+
+    def capture(self, *args: str, on_output: Callable[[str], None] | None = None) -> ProcessResult:
+        """Run a subprocess with the given arguments, capturing its output instead of raising."""
+        return self._capture(args, on_output, object())
+
+    def submit[T](self, task: Callable[..., T], *args: Any) -> Future[T]:
+        """Run a task that shells out (e.g. a few captures in a row) on the bounded pool."""
+        future = self._executor.submit(task, *args)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    async def capture_async(
+        self, *args: str, on_output: Callable[[str], None] | None = None
+    ) -> ProcessResult:
+        """Capture a subprocess on the bounded pool, killing it if its task is cancelled."""
+        token = object()
+        future = self.submit(self._capture, args, on_output, token)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            self._kill(token)
+            raise
+
+    def cancel(self) -> None:
+        """Drop the tasks still waiting in the pool and kill every running subprocess."""
+        with self._lock:
+            futures = list(self._futures)
+            tokens = list(self._running)
+        for future in futures:
+            future.cancel()
+        for token in tokens:
+            self._kill(token)
+
+    def shutdown(self) -> None:
+        """Cancel everything still pending or running, and release the pool."""
+        self.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _capture(
+        self,
+        args: tuple[str, ...],
+        on_output: Callable[[str], None] | None,
+        token: object,
+    ) -> ProcessResult:
+        # without a terminal to answer prompts, a subprocess waiting for input would hang forever;
+        # its own session lets a timeout kill the processes it spawns too (like git's ssh), which
+        # would otherwise keep the output open
+        start = time.perf_counter()
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            start_new_session=True,
+        )
+        with self._lock:
+            self._running[token] = process
+            cancelled = token in self._cancelled
+        if cancelled:
+            _kill_group(process)
+
+        expired = threading.Event()
+        timer = None
+        if self._timeout is not None:
+            timer = threading.Timer(self._timeout, _expire, (process, expired))
+            timer.start()
+
+        lines: list[str] = []
+        try:
+            assert process.stdout is not None
+            with process.stdout:
+                for line in process.stdout:
+                    lines.append(line)
+                    if on_output is not None:
+                        on_output(line)
+            cpu_secs = self._wait(process, timer, token)
+        except BaseException:
+            # being in a session of its own, the subprocess doesn't get the user's Ctrl+C
+            if process.returncode is None:
+                _kill_group(process)
+                process.wait()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            with self._lock:
+                self._running.pop(token, None)
+                self._cancelled.discard(token)
+
+        return ProcessResult(
+            process.returncode,
+            "".join(lines),
+            time.perf_counter() - start,
+            cpu_secs,
+            expired.is_set(),
+        )
+
+    def _wait(
+        self, process: "subprocess.Popen[str]", timer: threading.Timer | None, token: object
+    ) -> float:
+        if not hasattr(os, "wait4") or not hasattr(os, "waitid"):  # pragma: no cover - Windows
+            process.wait()
+            return 0.0
+
+        # until it's reaped, an exited subprocess keeps its PID (and process group), so nothing
+        # can kill some other process that reused them as long as it's stopped before reaping
+        os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+        if timer is not None:
+            timer.cancel()
+            timer.join()
+        with self._lock:
+            self._running.pop(token, None)
+
+        # reaping the subprocess ourselves is the only way to get its own resource usage
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return usage.ru_utime + usage.ru_stime
+
+    def _kill(self, token: object) -> None:
+        # killing under the lock keeps the subprocess from being reaped in the meantime
+        with self._lock:
+            process = self._running.get(token)
+            if process is None:
+                # the subprocess hasn't started yet, so it's killed as soon as it does
+                self._cancelled.add(token)
+            else:
+                _kill_group(process)
+
+    def _forget(self, future: Future[Any]) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+
+def _expire(process: "subprocess.Popen[str]", expired: threading.Event) -> None:
+    expired.set()
+    _kill_group(process)
+
+
+def _kill_group(process: "subprocess.Popen[str]") -> None:
+    if not hasattr(os, "killpg"):  # pragma: no cover - not available on Windows
+        process.kill()
+        return
+
+    # Popen.kill() would reap an exited subprocess, which only the waiting thread may do
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _advise_sequential(fd: int) -> None:
+    # a hint for the kernel to read ahead more aggressively
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _replace(path: Path, content: bytes) -> None:
+    # readers see either the old file or the new one, never a partially written one
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        if path.exists():
+            os.fchmod(fd, stat.S_IMODE(path.stat().st_mode))
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(content)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
@@ -13,3 +13,10 @@ class InternalError(Exception):
 
     def __init__(self, message: str) -> None:
         super().__init__(f"Internal error: {message}")
+
+
+class SubprocessError(Exception):
+    """Error for subprocesses that failed."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Subprocess error: {message}")
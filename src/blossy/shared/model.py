@@ -1,8 +1,41 @@
 """Shared models for Blossy."""
 
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import date, datetime, time
+from enum import StrEnum
 from typing import Any
 
 TomlValue = str | int | float | bool | datetime | date | time | list[Any]
 
 SUPPORTED_CONFIG_TYPES = frozenset({str, int, float, bool, datetime, date, time, list})
+
+
+@dataclass(frozen=True)
+class ProcessResult:
+    """Outcome of a subprocess whose output was captured."""
+
+    returncode: int
+    output: str
+    elapsed_secs: float
+    cpu_secs: float = 0.0
+    timed_out: bool = False
+
+    @staticmethod
+    def merge(results: Sequence["ProcessResult"]) -> "ProcessResult":
+        """Merge the results of subprocesses run one after the other, up to the last one."""
+        return ProcessResult(
+            results[-1].returncode if results else 0,
+            "".join(result.output for result in results),
+            sum(result.elapsed_secs for result in results),
+            sum(result.cpu_secs for result in results),
+            any(result.timed_out for result in results),
+        )
+
+
+class ProfilingMode(StrEnum):
+    """What is measured when profiling a command."""
+
+    CPU = "cpu"
+    MEM = "mem"
+    BOTH = "both"
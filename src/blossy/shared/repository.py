@@ -1,19 +1,28 @@
 """Shared repositories for Blossy."""
 
+import functools
+import json
+import tomllib
+from collections.abc import Mapping
+from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import Protocol
+from typing import Any, Protocol
 
 import platformdirs
-import tomlkit
 
+from blossy.shared.error import ConfigError
 from blossy.shared.model import TomlValue
 
+_ConfigSignature = tuple[int, int]
+
+_LOCK_TIMEOUT_SECS = 10.0
+
 
 class FileAdapter(Protocol):
     """Adapter for file operations."""
 
-    def create_if_not_exists(self, path: Path) -> None:
-        """Create an empty file at the given path."""
+    def stat(self, path: Path) -> tuple[int, int] | None:
+        """Get the modification time (in nanoseconds) and the size of a file, if it exists."""
         ...
 
     def read_text(self, path: Path) -> str:
@@ -24,42 +33,148 @@ class FileAdapter(Protocol):
         """Write text to a file at the given path."""
         ...
 
+    def read_bytes(self, path: Path) -> bytes:
+        """Read bytes from a file at the given path."""
+        ...
+
+    def write_bytes(self, path: Path, content: bytes) -> None:
+        """Write bytes to a file at the given path."""
+        ...
+
+    def lock(self, path: Path, timeout: float) -> AbstractContextManager[None]:
+        """Hold an advisory lock on the file at the given path, waiting up to the timeout."""
+        ...
+
 
 class ConfigRepository:
     """Repository for handling configurations."""
 
     _file_adapter: FileAdapter
+    _lock_timeout: float
     _config_file: Path
+    _cache_file: Path
+    _document: dict[str, Any] | None
+    _signature: _ConfigSignature | None
 
-    def __init__(self, file_adapter: FileAdapter) -> None:
+    def __init__(self, file_adapter: FileAdapter, lock_timeout: float = _LOCK_TIMEOUT_SECS) -> None:
         self._file_adapter = file_adapter
-
-        config_dir_str = platformdirs.user_config_dir(
-            appname="blossy", appauthor="ravensakurai", ensure_exists=True
-        )
-        config_file = Path(config_dir_str) / "config.toml"
-        self._file_adapter.create_if_not_exists(config_file)
-
-        self._config_file = config_file
+        self._lock_timeout = lock_timeout
+        self._config_file, self._cache_file = _get_config_files()
+        self._document = None
+        self._signature = None
 
     def get_property(self, subcommand: str, property_name: str) -> TomlValue | None:
         """Get a property value for a subcommand."""
-        config_str = self._file_adapter.read_text(self._config_file)
-        config = tomlkit.loads(config_str)
-        return config.get(subcommand, {}).get(property_name)
+        return self.get_section(subcommand).get(property_name)
+
+    def get_section(self, subcommand: str) -> dict[str, TomlValue]:
+        """Get all property values for a subcommand, with nested tables as dotted keys."""
+        table = self._load().get(subcommand, {})
+        return flatten_table(table) if isinstance(table, dict) else {}
 
     def set_property(self, subcommand: str, property_name: str, value: TomlValue) -> None:
         """Set a property value for a subcommand."""
-        config_str = self._file_adapter.read_text(self._config_file)
-        document = tomlkit.loads(config_str)
-
-        subcommand_table = document.get(subcommand)
-        if subcommand_table is None:
-            new_table = tomlkit.table()
-            document.add(subcommand, new_table)
-            subcommand_table = new_table
+        self.set_properties({subcommand: {property_name: value}})
+
+    def set_properties(self, properties: Mapping[str, Mapping[str, TomlValue]]) -> None:
+        """Set property values for several subcommands in a single write."""
+        # only writes need a parser that keeps the file's comments and formatting
+        import tomlkit  # pylint: disable=import-outside-toplevel
+
+        # the file is read again under the lock so that concurrent writers don't lose updates
+        lock_file = self._config_file.with_name(f"{self._config_file.name}.lock")
+        try:
+            with self._file_adapter.lock(lock_file, self._lock_timeout):
+                signature = self._file_adapter.stat(self._config_file)
+                config_str = (
+                    "" if signature is None else self._file_adapter.read_text(self._config_file)
+                )
+                document = tomlkit.loads(config_str)
+
+                for subcommand, values in properties.items():
+                    subcommand_table = document.get(subcommand)
+                    if subcommand_table is None:
+                        new_table = tomlkit.table()
+                        document.add(subcommand, new_table)
+                        subcommand_table = new_table
+
+                    subcommand_table.update(values)
+
+                document_str = tomlkit.dumps(document)
+                self._file_adapter.write_text(self._config_file, document_str)
+                self._store(document.unwrap(), self._file_adapter.stat(self._config_file))
+        except TimeoutError as e:
+            raise ConfigError(
+                f"Timed out after {self._lock_timeout}s waiting for another process to "
+                "finish writing the configuration."
+            ) from e
+
+    def _load(self) -> dict[str, Any]:
+        # a changed modification time or size means someone else wrote the file in the meantime
+        signature = self._file_adapter.stat(self._config_file)
+        if self._document is not None and signature == self._signature:
+            return self._document
+        if signature is None:
+            self._document, self._signature = {}, None
+            return self._document
+
+        cached = self._read_cache()
+        if cached is not None and cached[0] == signature:
+            self._document, self._signature = cached[1], signature
+            return self._document
 
-        subcommand_table.update({property_name: value})
-
-        document_str = tomlkit.dumps(document)
-        self._file_adapter.write_text(self._config_file, document_str)
+        config_str = self._file_adapter.read_text(self._config_file)
+        try:
+            document = tomllib.loads(config_str)
+        except tomllib.TOMLDecodeError as e:
+            raise ConfigError(f"'{self._config_file}' is not valid TOML ({e}).") from e
+
+        self._store(document, signature)
+        return document
+
+    def _read_cache(self) -> tuple[_ConfigSignature, dict[str, Any]] | None:
+        # the cache holds plain data only, and anything unexpected in it counts as a miss
+        try:
+            cached = json.loads(self._file_adapter.read_bytes(self._cache_file))
+        except (OSError, ValueError):
+            return None
+        match cached:
+            case {"signature": [int() as mtime_ns, int() as size], "document": dict() as document}:
+                return (mtime_ns, size), document
+            case _:
+                return None
+
+    def _store(self, document: dict[str, Any], signature: _ConfigSignature | None) -> None:
+        self._document, self._signature = document, signature
+        if signature is None:
+            return
+
+        try:
+            content = json.dumps({"signature": signature, "document": document})
+            self._file_adapter.write_bytes(self._cache_file, content.encode())
+        except (OSError, TypeError):
+            # the cache only saves parsing time, so the configuration works without it (dates
+            # and times aren't JSON, so such files are parsed every time)
+            pass
+
+
+def flatten_table(table: Mapping[str, Any], prefix: str = "") -> dict[str, TomlValue]:
+    """Flatten the nested tables of a TOML table into dotted keys, like 'big-monorepo.depth'."""
+    values: dict[str, TomlValue] = {}
+    for key, value in table.items():
+        if isinstance(value, dict):
+            values.update(flatten_table(value, f"{prefix}{key}."))
+        else:
+            values[f"{prefix}{key}"] = value
+    return values
+
+
+@functools.cache
+def _get_config_files() -> tuple[Path, Path]:
+    config_dir_str = platformdirs.user_config_dir(
+        appname="blossy", appauthor="ravensakurai", ensure_exists=True
+    )
+    cache_dir_str = platformdirs.user_cache_dir(
+        appname="blossy", appauthor="ravensakurai", ensure_exists=True
+    )
+    return Path(config_dir_str) / "config.toml", Path(cache_dir_str) / "config.json"
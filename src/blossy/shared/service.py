@@ -0,0 +1,115 @@
+"""Shared services for Blossy."""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+
+from blossy.shared.model import ProfilingMode
+
+_TOP_FUNCTIONS = 25
+_TOP_ALLOCATIONS = 10
+
+
+class Profiler:
+    """Service for profiling the CPU time and memory of a command, phase by phase."""
+
+    _mode: ProfilingMode
+    _phases: list[tuple[str, float]]
+    _peaks: dict[str, int]
+    _cpu_profile: cProfile.Profile | None
+
+    def __init__(self, mode: ProfilingMode, started_at: float, imported_at: float) -> None:
+        # importing happens before any profiler can run, so it only gets its wall time
+        self._mode = mode
+        self._phases = [("import", started_at), ("parsing", imported_at)]
+        self._peaks = {}
+        self._cpu_profile = None
+
+    def start(self) -> None:
+        """Start measuring the current phase."""
+        if self._mode in (ProfilingMode.MEM, ProfilingMode.BOTH):
+            tracemalloc.start()
+        if self._mode in (ProfilingMode.CPU, ProfilingMode.BOTH):
+            self._cpu_profile = cProfile.Profile()
+            self._cpu_profile.enable()
+
+    def mark(self, phase: str) -> None:
+        """End the current phase and start the given one (staying in it does nothing)."""
+        # the commands of a script mark the phase the script is already in
+        if self._phases[-1][0] == phase:
+            return
+        self._end_phase()
+        self._phases.append((phase, time.perf_counter()))
+
+    def stop(self) -> str:
+        """Stop measuring and get the report."""
+        if self._cpu_profile is not None:
+            self._cpu_profile.disable()
+        self._end_phase()
+        finished_at = time.perf_counter()
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        tracemalloc.stop()
+
+        sections = [self._report_phases(finished_at)]
+        if self._cpu_profile is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._cpu_profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(_TOP_FUNCTIONS)
+            sections.append(stream.getvalue().strip("\n"))
+        if snapshot is not None:
+            sections.append(_report_allocations(snapshot))
+        return "\n\n".join(sections) + "\n"
+
+    def _end_phase(self) -> None:
+        if tracemalloc.is_tracing():
+            self._peaks[self._phases[-1][0]] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+
+    def _report_phases(self, finished_at: float) -> str:
+        ends = [start for _, start in self._phases[1:]] + [finished_at]
+        rows = [
+            (phase, f"{end - start:.3f}s", _format_peak(self._peaks.get(phase)))
+            for (phase, start), end in zip(self._phases, ends)
+        ]
+        peaks = list(self._peaks.values())
+        rows.append(
+            (
+                "total",
+                f"{finished_at - self._phases[0][1]:.3f}s",
+                _format_peak(max(peaks) if peaks else None),
+            )
+        )
+
+        width = max(len("Phase"), *(len(phase) for phase, _, _ in rows))
+        time_width = max(len("Time"), *(len(elapsed) for _, elapsed, _ in rows))
+        lines = [f"{'Phase':<{width}}  {'Time':>{time_width}}  Peak memory"]
+        lines.extend(
+            f"{phase:<{width}}  {elapsed:>{time_width}}  {peak}" for phase, elapsed, peak in rows
+        )
+        return "\n".join(lines)
+
+
+def _report_allocations(snapshot: tracemalloc.Snapshot) -> str:
+    # the profiler's own frames would only add noise to the biggest allocations
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    lines = [f"Largest allocations still alive (top {_TOP_ALLOCATIONS}):"]
+    for statistic in snapshot.statistics("lineno")[:_TOP_ALLOCATIONS]:
+        frame = statistic.traceback[0]
+        lines.append(
+            f"  {statistic.size / (1 << 10):>10.1f} KiB  {statistic.count:>8} blocks  "
+            f"{frame.filename}:{frame.lineno}"
+        )
+    return "\n".join(lines)
+
+
+def _format_peak(size: int | None) -> str:
+    if size is None:
+        return "-"
+    return f"{size / (1 << 20):.2f} MiB"
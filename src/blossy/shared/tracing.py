@@ -0,0 +1,148 @@
+"""Module for tracing spans and counters, exported as Chrome trace events."""
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+TraceEvent = dict[str, Any]
+
+# a disabled tracer must cost next to nothing, so every span shares the same no-op
+_NO_SPAN = nullcontext()
+
+
+class _Tracer:
+    """Recorder of the trace events of a process."""
+
+    events: list[TraceEvent]
+
+    def __init__(self) -> None:
+        self.events = []
+
+    def add(self, phase: str, name: str, start_ns: int, args: dict[str, Any]) -> TraceEvent:
+        """Record an event of the given phase type, starting at the given time."""
+        event = {
+            "name": name,
+            "ph": phase,
+            "ts": start_ns // 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": args,
+        }
+        # appending to a list is atomic, so threads don't need a lock
+        self.events.append(event)
+        return event
+
+
+class _Span:
+    """Span of time measured as a complete trace event, which nests the spans inside it."""
+
+    __slots__ = ("_tracer", "_name", "_args", "_start_ns")
+
+    _tracer: _Tracer
+    _name: str
+    _args: dict[str, Any]
+    _start_ns: int
+
+    def __init__(self, tracer: _Tracer, name: str, args: dict[str, Any]) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._args = args
+        self._start_ns = 0
+
+    def __enter__(self) -> None:
+        self._start_ns = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info: object) -> None:
+        end_ns = time.perf_counter_ns()
+        event = self._tracer.add("X", self._name, self._start_ns, self._args)
+        event["dur"] = (end_ns - self._start_ns) // 1000
+
+
+_tracer: _Tracer | None = None  # pylint: disable=invalid-name
+
+
+def enable() -> None:
+    """Start recording trace events in this process."""
+    global _tracer  # pylint: disable=global-statement
+    if _tracer is None:
+        _tracer = _Tracer()
+
+
+def is_enabled() -> bool:
+    """Check whether trace events are being recorded."""
+    return _tracer is not None
+
+
+def span(name: str, **args: Any) -> AbstractContextManager[None]:
+    """Measure the block inside the context as a span, with the given arguments."""
+    if _tracer is None:
+        return _NO_SPAN
+    return _Span(_tracer, name, args)
+
+
+def counter(name: str, **values: float) -> None:
+    """Record the current values of a counter."""
+    if _tracer is not None:
+        _tracer.add("C", name, time.perf_counter_ns(), values)
+
+
+def traced[T](name: str, items: Iterable[T]) -> Iterable[T]:
+    """Measure each item as a span, from fetching it until the next one is asked for."""
+    if _tracer is None:
+        return items
+    return _trace_items(_tracer, name, items)
+
+
+@contextmanager
+def capture(enabled: bool) -> Iterator[list[TraceEvent]]:
+    """Record the events of the block apart, so a worker process can send them back."""
+    global _tracer  # pylint: disable=global-statement
+    if not enabled:
+        yield []
+        return
+
+    # a forked worker inherits the parent's events, which must not be sent back again
+    previous, _tracer = _tracer, _Tracer()
+    try:
+        yield _tracer.events
+    finally:
+        _tracer = previous
+
+
+def record(events: Iterable[TraceEvent]) -> None:
+    """Record events captured by a worker process."""
+    if _tracer is not None:
+        _tracer.events.extend(events)
+
+
+def export(path: Path) -> None:
+    """Stop recording and write the events as JSONL (for '.jsonl' files) or a Chrome trace."""
+    global _tracer  # pylint: disable=global-statement
+    events, _tracer = (_tracer.events if _tracer is not None else []), None
+
+    with open(path, "w", encoding="utf-8") as file:
+        if path.suffix == ".jsonl":
+            file.writelines(json.dumps(event, default=str) + "\n" for event in events)
+        else:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file, default=str)
+
+
+def _trace_items[T](tracer: _Tracer, name: str, items: Iterable[T]) -> Iterator[T]:
+    iterator = iter(items)
+    for index in itertools.count():
+        start_ns = time.perf_counter_ns()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        try:
+            yield item
+        finally:
+            event = tracer.add("X", name, start_ns, {"index": index})
+            event["dur"] = (time.perf_counter_ns() - start_ns) // 1000
@@ -0,0 +1,106 @@
+"""Module for STANDARDIZE models."""
+
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+
+class SortKey(StrEnum):
+    """Order in which files receive their IDs."""
+
+    NAME = "name"
+    NATURAL = "natural"
+    MTIME = "mtime"
+    SIZE = "size"
+    NONE = "none"
+
+
+class DedupMode(StrEnum):
+    """What to do with files whose content duplicates another file's."""
+
+    REPORT = "report"
+    DELETE = "delete"
+    HARDLINK = "hardlink"
+
+
+@dataclass(frozen=True, slots=True)
+class ScannedFile:
+    """File found while scanning a directory, with the metadata gathered for it."""
+
+    name: str
+    size: int | None = None
+    mtime_ns: int | None = None
+    # device and inode numbers, which hard links to the same file share
+    inode: tuple[int, int] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Rename:
+    """Renaming of a single file, by name, inside the plan's directory."""
+
+    source: str
+    target: str
+
+
+@dataclass(frozen=True)
+class DuplicateGroup:
+    """Files with the same content, the original being the first one in the directory's order."""
+
+    original: str
+    duplicates: tuple[str, ...]
+    size: int
+
+
+@dataclass(frozen=True)
+class RenamePlan:
+    """Renames needed to standardize a directory, grouped in independent ordered chains."""
+
+    directory: Path
+    chains: tuple[tuple[Rename, ...], ...]
+    qt_skipped: int
+
+    @property
+    def qt_renames(self) -> int:
+        """Quantity of renames in the plan (including the ones through temporary names)."""
+        return sum(len(chain) for chain in self.chains)
+
+
+class JournalKind(StrEnum):
+    """What a journaled plan was made for."""
+
+    RUN = "run"
+    UNDO = "undo"
+
+
+@dataclass(frozen=True)
+class JournalState:
+    """Plan recorded in a journal, along with the renames already done."""
+
+    kind: JournalKind
+    plan: RenamePlan
+    done: tuple[Rename, ...]
+    complete: bool
+
+    @property
+    def pending_plan(self) -> RenamePlan:
+        """Plan with only the renames not done yet."""
+        done = set(self.done)
+        chains = tuple(
+            pending
+            for chain in self.plan.chains
+            if (pending := tuple(step for step in chain if step not in done))
+        )
+        return RenamePlan(self.plan.directory, chains, self.plan.qt_skipped)
+
+
+@dataclass(frozen=True)
+class RenameStats:
+    """Measurements of an executed rename plan."""
+
+    qt_renames: int
+    elapsed_secs: float
+
+    @property
+    def throughput(self) -> float:
+        """Renames per second."""
+        return self.qt_renames / self.elapsed_secs if self.elapsed_secs > 0 else 0.0
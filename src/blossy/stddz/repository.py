@@ -0,0 +1,130 @@
+"""Module for STANDARDIZE repositories."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import platformdirs
+
+from blossy.shared.error import InternalError
+from blossy.stddz.model import JournalKind, JournalState, Rename, RenamePlan
+
+
+class RenameJournal:
+    """Repository for the append-only journal of a directory's renames."""
+
+    _SYNC_EVERY_RECORDS = 256
+    _SYNC_EVERY_SECS = 1.0
+
+    _journal_dir: Path
+    _lock: threading.Lock
+    _fd: int | None
+    _qt_unsynced: int
+    _last_sync: float
+
+    def __init__(self, journal_dir: Path | None = None) -> None:
+        if journal_dir is None:
+            state_dir = platformdirs.user_state_dir(appname="blossy", appauthor="ravensakurai")
+            journal_dir = Path(state_dir) / "stddz"
+        self._journal_dir = journal_dir
+        self._lock = threading.Lock()
+        self._fd = None
+        self._qt_unsynced = 0
+        self._last_sync = 0.0
+
+    def fork(self) -> "RenameJournal":
+        """Get a journal with the same storage, to journal another directory concurrently."""
+        return RenameJournal(self._journal_dir)
+
+    def load(self, directory: Path) -> JournalState | None:
+        """Load the journal of a directory, if there's one."""
+        path = self._get_path(directory)
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return None
+        if not lines:
+            return None
+
+        header = json.loads(lines[0])
+        plan = RenamePlan(
+            Path(header["directory"]),
+            tuple(tuple(Rename(*step) for step in chain) for chain in header["chains"]),
+            header["qt_skipped"],
+        )
+        done: list[Rename] = []
+        complete = False
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a crash may leave a half-written record behind
+                continue
+            if "done" in record:
+                done.append(Rename(*record["done"]))
+            elif record.get("complete"):
+                complete = True
+
+        return JournalState(JournalKind(header["kind"]), plan, tuple(done), complete)
+
+    def begin(self, kind: JournalKind, plan: RenamePlan) -> None:
+        """Start a new journal for the plan, replacing the previous one of its directory."""
+        header = {
+            "kind": kind,
+            "directory": str(plan.directory),
+            "chains": [[[step.source, step.target] for step in chain] for chain in plan.chains],
+            "qt_skipped": plan.qt_skipped,
+        }
+        self._journal_dir.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(
+            self._get_path(plan.directory), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        self._append(header)
+        self._sync()
+
+    def resume(self, directory: Path) -> None:
+        """Reopen the journal of a directory to keep appending to it."""
+        self._fd = os.open(self._get_path(directory), os.O_WRONLY | os.O_APPEND)
+        # drop a possibly half-written last record by starting on a fresh line
+        os.write(self._fd, b"\n")
+
+    def record(self, step: Rename) -> None:
+        """Record that a rename was done."""
+        with self._lock:
+            self._append({"done": [step.source, step.target]})
+            self._qt_unsynced += 1
+            if (
+                self._qt_unsynced >= self._SYNC_EVERY_RECORDS
+                or time.monotonic() - self._last_sync >= self._SYNC_EVERY_SECS
+            ):
+                self._sync()
+
+    def end(self, complete: bool) -> None:
+        """Stop appending to the journal, marking it as complete or not."""
+        if self._fd is None:
+            return
+        if complete:
+            self._append({"complete": True})
+        self._sync()
+        os.close(self._fd)
+        self._fd = None
+
+    def _append(self, record: Mapping[str, object]) -> None:
+        # a single unbuffered write per record, so a killed process loses nothing
+        if self._fd is None:
+            raise InternalError("Journal is not open.")
+        os.write(self._fd, (json.dumps(record) + "\n").encode("utf-8"))
+
+    def _sync(self) -> None:
+        if self._fd is not None:
+            os.fsync(self._fd)
+        self._qt_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _get_path(self, directory: Path) -> Path:
+        digest = hashlib.sha256(str(directory).encode("utf-8")).hexdigest()[:32]
+        return self._journal_dir / f"{digest}.jsonl"
@@ -0,0 +1,335 @@
+"""Module for STANDARDIZE services."""
+
+import hashlib
+import os
+import re
+import secrets
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from blossy.shared.error import InternalError
+from blossy.stddz.model import (
+    DedupMode,
+    DuplicateGroup,
+    Rename,
+    RenamePlan,
+    RenameStats,
+    ScannedFile,
+    SortKey,
+)
+
+_DIGITS_REGEX = re.compile(r"(\d+)")
+
+
+class DirectoryScanner:
+    """Service for listing the files of a directory with as few system calls as possible."""
+
+    def scan(
+        self, directory: Path, sort_key: SortKey, with_stat: bool = False
+    ) -> list[ScannedFile]:
+        """List the files (not directories) of a directory, in the given order."""
+        files, _ = self._list(directory, sort_key, with_stat)
+        return files
+
+    def scan_tree(
+        self, root: Path, sort_key: SortKey, with_stat: bool = False
+    ) -> list[tuple[Path, list[ScannedFile]]]:
+        """List the files of every directory of a tree in a single walk, parents first."""
+        # each directory is listed once, and that listing also yields its subdirectories
+        tree: list[tuple[Path, list[ScannedFile]]] = []
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            files, subdirs = self._list(directory, sort_key, with_stat)
+            tree.append((directory, files))
+            pending.extend(sorted(subdirs, reverse=True))
+        return tree
+
+    def _list(
+        self, directory: Path, sort_key: SortKey, with_stat: bool
+    ) -> tuple[list[ScannedFile], list[Path]]:
+        # 'DirEntry.is_file' is answered from the directory listing itself on most filesystems,
+        # so only the orders based on metadata pay for a 'stat' per file
+        needs_stat = with_stat or sort_key in (SortKey.MTIME, SortKey.SIZE)
+        files: list[ScannedFile] = []
+        subdirs: list[Path] = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    files.append(self._with_stat(entry) if needs_stat else ScannedFile(entry.name))
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(Path(entry.path))
+
+        match sort_key:
+            case SortKey.NAME:
+                files.sort(key=lambda file: file.name)
+            case SortKey.NATURAL:
+                files.sort(key=lambda file: self._natural_key(file.name))
+            case SortKey.MTIME:
+                files.sort(key=lambda file: (file.mtime_ns or 0, file.name))
+            case SortKey.SIZE:
+                files.sort(key=lambda file: (file.size or 0, file.name))
+            case SortKey.NONE:
+                pass
+
+        return files, subdirs
+
+    def _with_stat(self, entry: os.DirEntry[str]) -> ScannedFile:
+        stat = entry.stat()
+        # some filesystems have no inode numbers, and report 0 for every file
+        inode = (stat.st_dev, stat.st_ino) if stat.st_ino else None
+        return ScannedFile(entry.name, stat.st_size, stat.st_mtime_ns, inode)
+
+    def _natural_key(self, name: str) -> list[str | int]:
+        # splitting on a capturing group alternates text and numbers, so the types line up
+        return [
+            int(part) if i % 2 else part.casefold()
+            for i, part in enumerate(_DIGITS_REGEX.split(name))
+        ]
+
+
+class Deduplicator:
+    """Service for finding files with the same content and collapsing them, reading little."""
+
+    _PARTIAL_SIZE = 1 << 16
+
+    _mode: DedupMode
+    _jobs: int
+
+    def __init__(self, mode: DedupMode, jobs: int = 1) -> None:
+        self._mode = mode
+        self._jobs = jobs
+
+    @property
+    def mode(self) -> DedupMode:
+        """What is done with the duplicates."""
+        return self._mode
+
+    def find(self, directory: Path, files: Sequence[ScannedFile]) -> list[DuplicateGroup]:
+        """Group the files with the same content (their sizes must have been scanned)."""
+        # hard links to the same file are never duplicates of each other, so only the first
+        # name of each file is compared
+        linked = {name for group in self.find_links(files) for name in group.duplicates}
+        by_size: dict[int, list[str]] = defaultdict(list)
+        for file in files:
+            if file.size is None:
+                raise InternalError(f"'{file.name}' was scanned without its size.")
+            if file.name not in linked:
+                by_size[file.size].append(file.name)
+
+        # only files whose sizes collide are read, first just their beginning, and only the
+        # ones that still collide after that are read whole
+        candidates = [(size, names) for size, names in by_size.items() if len(names) > 1]
+        candidates = self._refine(
+            directory, candidates, lambda path: self._hash(path, self._PARTIAL_SIZE)
+        )
+        big = [(size, names) for size, names in candidates if size > self._PARTIAL_SIZE]
+        small = [(size, names) for size, names in candidates if size <= self._PARTIAL_SIZE]
+        duplicates = small + self._refine(directory, big, self._hash)
+
+        # the groups follow the order of the files, so the original is the first one listed
+        order = {file.name: idx for idx, file in enumerate(files)}
+        groups = [
+            DuplicateGroup(names[0], tuple(names[1:]), size)
+            for size, names in (
+                (size, sorted(names, key=order.__getitem__)) for size, names in duplicates
+            )
+        ]
+        groups.sort(key=lambda group: order[group.original])
+        return groups
+
+    def find_links(self, files: Sequence[ScannedFile]) -> list[DuplicateGroup]:
+        """Group the files that are already hard links to the same file, which frees nothing."""
+        by_inode: dict[tuple[int, int], list[str]] = defaultdict(list)
+        for file in files:
+            if file.inode is not None:
+                by_inode[file.inode].append(file.name)
+        return [
+            DuplicateGroup(names[0], tuple(names[1:]), 0)
+            for names in by_inode.values()
+            if len(names) > 1
+        ]
+
+    def collapse(self, directory: Path, groups: Sequence[DuplicateGroup]) -> None:
+        """Delete the duplicates, or turn them into hard links to their original."""
+        for group in groups:
+            for duplicate in group.duplicates:
+                # renaming over another link to the same file does nothing, leaving the temporary
+                # link behind
+                if os.path.samefile(directory / group.original, directory / duplicate):
+                    continue
+                match self._mode:
+                    case DedupMode.DELETE:
+                        os.remove(directory / duplicate)
+                    case DedupMode.HARDLINK:
+                        # linking to a temporary name and replacing is atomic for the duplicate
+                        temp_path = directory / f".blossy-{secrets.token_hex(8)}"
+                        os.link(directory / group.original, temp_path)
+                        os.replace(temp_path, directory / duplicate)
+                    case DedupMode.REPORT:
+                        pass
+
+    def _refine(
+        self,
+        directory: Path,
+        groups: Sequence[tuple[int, list[str]]],
+        hash_file: Callable[[Path], bytes],
+    ) -> list[tuple[int, list[str]]]:
+        names = [name for _, group in groups for name in group]
+        if self._jobs == 1 or len(names) <= 1:
+            digests = [hash_file(directory / name) for name in names]
+        else:
+            with ThreadPoolExecutor(max_workers=self._jobs) as executor:
+                digests = list(executor.map(lambda name: hash_file(directory / name), names))
+        digest_of = dict(zip(names, digests))
+
+        refined: list[tuple[int, list[str]]] = []
+        for size, group in groups:
+            by_digest: dict[bytes, list[str]] = defaultdict(list)
+            for name in group:
+                by_digest[digest_of[name]].append(name)
+            refined.extend((size, names) for names in by_digest.values() if len(names) > 1)
+        return refined
+
+    def _hash(self, path: Path, limit: int | None = None) -> bytes:
+        with open(path, "rb") as file:
+            if limit is not None:
+                return hashlib.blake2b(file.read(limit)).digest()
+            return hashlib.file_digest(file, hashlib.blake2b).digest()
+
+
+class RenamePlanner:
+    """Service for ordering renames so that no file is overwritten."""
+
+    def plan(self, directory: Path, targets: Mapping[str, str]) -> RenamePlan:
+        """Plan the renames from each file name to its target name, skipping the ones in place."""
+        # a target may be the name of another file, which then has to be renamed first: these
+        # dependencies form chains, which only need that order, and cycles, which are broken
+        # by renaming one of their files to a temporary name
+        moves = {source: target for source, target in targets.items() if source != target}
+        incoming = set(moves.values())
+        chains: list[tuple[Rename, ...]] = []
+        visited: set[str] = set()
+
+        # chain heads are the files whose names nobody wants
+        for head in moves:
+            if head in incoming:
+                continue
+
+            path = [head]
+            while (successor := moves[path[-1]]) in moves:
+                path.append(successor)
+            visited.update(path)
+            # the last file's target is free, so the chain is renamed back to front
+            chains.append(tuple(Rename(source, moves[source]) for source in reversed(path)))
+
+        # whatever wasn't reached from a head is in a cycle
+        taken = set(targets) | incoming
+        for start in moves:
+            if start in visited:
+                continue
+
+            cycle = [start]
+            while (successor := moves[cycle[-1]]) != start:
+                cycle.append(successor)
+            visited.update(cycle)
+
+            temp_name = self._get_temp_name(taken)
+            taken.add(temp_name)
+            chains.append(
+                (Rename(start, temp_name),)
+                + tuple(Rename(source, moves[source]) for source in reversed(cycle[1:]))
+                + (Rename(temp_name, moves[start]),)
+            )
+
+        return RenamePlan(directory, tuple(chains), len(targets) - len(moves))
+
+    def _get_temp_name(self, taken: set[str]) -> str:
+        while (name := f".blossy-{secrets.token_hex(8)}") in taken:
+            pass
+        return name
+
+
+class RenameExecutor:
+    """Service for running rename plans, with independent chains running concurrently."""
+
+    _jobs: int
+
+    def __init__(self, jobs: int = 1) -> None:
+        self._jobs = jobs
+
+    def execute(
+        self, plan: RenamePlan, on_rename: Callable[[Rename], None] | None = None
+    ) -> RenameStats:
+        """Run every rename of the plan, respecting the order inside each chain."""
+        if self._jobs < 1:
+            raise ValueError("Quantity of jobs must be positive.")
+
+        start = time.perf_counter()
+        with self._open_directory(plan.directory) as dir_fd:
+            if self._jobs == 1 or len(plan.chains) <= 1:
+                for chain in plan.chains:
+                    self._run_chain(plan.directory, dir_fd, chain, on_rename)
+            else:
+                self._run_concurrently(plan, dir_fd, on_rename)
+
+        return RenameStats(plan.qt_renames, time.perf_counter() - start)
+
+    def _run_concurrently(
+        self, plan: RenamePlan, dir_fd: int | None, on_rename: Callable[[Rename], None] | None
+    ) -> None:
+        # workers pull chains one at a time, so slow renames don't hold up a whole batch
+        chains = iter(plan.chains)
+        lock = threading.Lock()
+        failed = threading.Event()
+
+        def work() -> None:
+            while not failed.is_set():
+                with lock:
+                    chain = next(chains, None)
+                if chain is None:
+                    return
+                try:
+                    self._run_chain(plan.directory, dir_fd, chain, on_rename)
+                except BaseException:
+                    failed.set()
+                    raise
+
+        with ThreadPoolExecutor(max_workers=self._jobs) as executor:
+            futures = [executor.submit(work) for _ in range(self._jobs)]
+        for future in futures:
+            future.result()
+
+    def _run_chain(
+        self,
+        directory: Path,
+        dir_fd: int | None,
+        chain: Sequence[Rename],
+        on_rename: Callable[[Rename], None] | None,
+    ) -> None:
+        for step in chain:
+            if dir_fd is None:
+                os.rename(directory / step.source, directory / step.target)
+            else:
+                os.rename(step.source, step.target, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            if on_rename is not None:
+                on_rename(step)
+
+    @contextmanager
+    def _open_directory(self, directory: Path) -> Iterator[int | None]:
+        # renaming relative to an open directory skips resolving the full path every time,
+        # which costs round-trips on network filesystems
+        if os.rename not in os.supports_dir_fd:
+            yield None
+            return
+
+        dir_fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        try:
+            yield dir_fd
+        finally:
+            os.close(dir_fd)
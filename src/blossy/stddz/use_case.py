@@ -1,13 +1,30 @@
 """Module for STANDARDIZE use cases."""
 
-from collections.abc import Iterable
+import os
+import time
+from collections import defaultdict
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from random import choices
-from string import ascii_letters
 from typing import Protocol
 
 import typer
 
+from blossy.shared import tracing
+from blossy.stddz.model import (
+    DedupMode,
+    DuplicateGroup,
+    JournalKind,
+    JournalState,
+    Rename,
+    RenamePlan,
+    RenameStats,
+    ScannedFile,
+    SortKey,
+)
+from blossy.stddz.repository import RenameJournal
+from blossy.stddz.service import Deduplicator, DirectoryScanner, RenameExecutor, RenamePlanner
+
 
 class StandardizeUseCase(Protocol):
     """Use case for standardizing file names."""
@@ -27,14 +44,74 @@ class StandardizeUseCaseFactory:
     """Factory for creating STANDARDIZE use cases."""
 
     @staticmethod
-    def get_use_case() -> StandardizeUseCase:
-        """Get an instance of the STANDARDIZE use case."""
-        return _StandardizeUseCaseOption1()
+    def get_use_case(
+        journal: RenameJournal,
+        sort_key: SortKey = SortKey.NAME,
+        dry_run: bool = False,
+        jobs: int = 1,
+        undo: bool = False,
+        recursive: bool = False,
+        global_seq: bool = False,
+        dedup_mode: DedupMode | None = None,
+    ) -> StandardizeUseCase:
+        """Get an instance of the STANDARDIZE use case based on the flags."""
+        if global_seq and not recursive:
+            raise ValueError("A global sequence needs the recursive mode.")
+        if undo:
+            return _StandardizeUseCaseOption2(journal, jobs, recursive)
+
+        deduplicator = None if dedup_mode is None else Deduplicator(dedup_mode, jobs)
+        if recursive:
+            return _StandardizeUseCaseOption3(
+                DirectoryScanner(),
+                RenamePlanner(),
+                deduplicator,
+                journal,
+                sort_key,
+                dry_run,
+                jobs,
+                global_seq,
+            )
+        return _StandardizeUseCaseOption1(
+            DirectoryScanner(),
+            RenamePlanner(),
+            RenameExecutor(jobs),
+            deduplicator,
+            journal,
+            sort_key,
+            dry_run,
+        )
 
 
 class _StandardizeUseCaseOption1:
     """Use case for standardizing file names."""
 
+    _scanner: DirectoryScanner
+    _planner: RenamePlanner
+    _executor: RenameExecutor
+    _deduplicator: Deduplicator | None
+    _journal: RenameJournal
+    _sort_key: SortKey
+    _dry_run: bool
+
+    def __init__(
+        self,
+        scanner: DirectoryScanner,
+        planner: RenamePlanner,
+        executor: RenameExecutor,
+        deduplicator: Deduplicator | None,
+        journal: RenameJournal,
+        sort_key: SortKey,
+        dry_run: bool,
+    ) -> None:
+        self._scanner = scanner
+        self._planner = planner
+        self._executor = executor
+        self._deduplicator = deduplicator
+        self._journal = journal
+        self._sort_key = sort_key
+        self._dry_run = dry_run
+
     def execute(
         self,
         prefix: str,
@@ -47,44 +124,415 @@ class _StandardizeUseCaseOption1:
             raise typer.BadParameter("Negative starting number.")
 
         dir_abs_path = directory.expanduser().resolve()
-        files = self._get_files(dir_abs_path)
+        if not self._dry_run:
+            state = self._journal.load(dir_abs_path)
+            if state is not None and not state.complete:
+                # the journaled plan wins over a rescan, which would see half-renamed files
+                print(f"Resuming interrupted {state.kind}.")
+                _print_stats(_resume_journaled(self._journal, self._executor, state))
+                return
 
-        last_id = start_idx + len(files) - 1
-        min_qt_digits = len(str(last_id))
-        if min_qt_digits > qt_digits:
-            qt_digits = min_qt_digits
-            qt_readjusted = True
-        else:
-            qt_readjusted = False
+        with tracing.span("stddz.scan", directory=str(dir_abs_path)):
+            files = self._scanner.scan(
+                dir_abs_path, self._sort_key, with_stat=self._deduplicator is not None
+            )
+        tracing.counter("stddz.files", scanned=len(files))
+        links: list[DuplicateGroup] = []
+        if self._deduplicator is not None:
+            files, groups, links = _deduplicate(
+                self._deduplicator, self._dry_run, dir_abs_path, files
+            )
+            _print_duplicates(self._deduplicator.mode, self._dry_run, {dir_abs_path: groups})
 
-        # to prevent overriding previous files
-        temp_prefix = "".join(choices(ascii_letters, k=10))
-        self._rename(dir_abs_path, files, temp_prefix, qt_digits, start_idx)
+        fitted_qt_digits = _fit_qt_digits(start_idx + len(files) - 1, qt_digits)
+        with tracing.span("stddz.plan", directory=str(dir_abs_path)):
+            targets = _build_targets(files, prefix, start_idx, fitted_qt_digits, links)
+            plan = self._planner.plan(dir_abs_path, targets)
 
-        files = self._get_files(dir_abs_path)
-        self._rename(dir_abs_path, files, prefix, qt_digits, start_idx)
+        if self._dry_run:
+            _print_plan(plan)
+            print(f"{plan.qt_renames} renames planned, {plan.qt_skipped} files already in place.")
+        elif plan.chains:
+            self._journal.begin(JournalKind.RUN, plan)
+            _print_stats(_execute_journaled(self._journal, self._executor, plan))
 
-        if qt_readjusted:
+        if fitted_qt_digits > qt_digits:
             print("Quantity of digits had to be readjusted.")
 
-    def _get_files(self, directory_path: Path) -> tuple[Path, ...]:
-        files = []
-        for item in directory_path.iterdir():
-            if item.is_file():
-                files.append(item)
-        return tuple(files)
 
-    def _rename(
-        self, dir_path: Path, files: Iterable[Path], prefix: str, qt_digits: int, start_idx: int
+class _StandardizeUseCaseOption2:
+    """Use case for undoing the last standardization of a directory using its journal."""
+
+    _journal: RenameJournal
+    _jobs: int
+    _recursive: bool
+
+    def __init__(self, journal: RenameJournal, jobs: int, recursive: bool) -> None:
+        self._journal = journal
+        self._jobs = jobs
+        self._recursive = recursive
+
+    def execute(
+        self,
+        prefix: str,  # pylint: disable=unused-argument
+        directory: Path,
+        start_idx: int = 0,  # pylint: disable=unused-argument
+        qt_digits: int = 3,  # pylint: disable=unused-argument
+    ) -> None:
+        """Execute the use case."""
+        dir_abs_path = directory.expanduser().resolve()
+        if not dir_abs_path.exists():
+            raise FileNotFoundError(dir_abs_path)
+        if not dir_abs_path.is_dir():
+            raise NotADirectoryError(dir_abs_path)
+
+        if not self._recursive:
+            stats = _undo_directory(self._journal, RenameExecutor(self._jobs), dir_abs_path)
+            if stats is None:
+                print("Nothing to undo.")
+            else:
+                _print_stats(stats)
+            return
+
+        # only the journals are needed, so the tree is walked without sorting or 'stat'
+        tree = DirectoryScanner().scan_tree(dir_abs_path, SortKey.NONE)
+        start = time.perf_counter()
+        results = _map_directories(
+            lambda path: _undo_directory(self._journal.fork(), RenameExecutor(), path),
+            [path for path, _ in tree],
+            self._jobs,
+        )
+        _print_tree_stats(results, start)
+
+
+class _StandardizeUseCaseOption3:
+    """Use case for standardizing file names in every directory of a tree, in parallel."""
+
+    _scanner: DirectoryScanner
+    _planner: RenamePlanner
+    _deduplicator: Deduplicator | None
+    _journal: RenameJournal
+    _sort_key: SortKey
+    _dry_run: bool
+    _jobs: int
+    _global_seq: bool
+
+    def __init__(
+        self,
+        scanner: DirectoryScanner,
+        planner: RenamePlanner,
+        deduplicator: Deduplicator | None,
+        journal: RenameJournal,
+        sort_key: SortKey,
+        dry_run: bool,
+        jobs: int,
+        global_seq: bool,
+    ) -> None:
+        self._scanner = scanner
+        self._planner = planner
+        self._deduplicator = deduplicator
+        self._journal = journal
+        self._sort_key = sort_key
+        self._dry_run = dry_run
+        self._jobs = jobs
+        self._global_seq = global_seq
+
+    def execute(
+        self,
+        prefix: str,
+        directory: Path,
+        start_idx: int = 0,
+        qt_digits: int = 3,
     ) -> None:
-        idx = start_idx
-        for file_path in files:
-            ext = file_path.suffix
-            new_file = self._build_file_name(prefix, idx, qt_digits) + ext
-            file_path.rename(dir_path / new_file)
+        """Execute the use case."""
+        if start_idx < 0:
+            raise typer.BadParameter("Negative starting number.")
+
+        root = directory.expanduser().resolve()
+        with tracing.span("stddz.scan", directory=str(root)):
+            tree = self._scanner.scan_tree(
+                root, self._sort_key, with_stat=self._deduplicator is not None
+            )
+        tracing.counter(
+            "stddz.files", scanned=sum(len(files) for _, files in tree), directories=len(tree)
+        )
+        links_by_dir = self._deduplicate_tree(tree, root)
+        with tracing.span("stddz.plan", directory=str(root)):
+            plans, fitted_qt_digits = self._plan_tree(
+                tree, links_by_dir, prefix, start_idx, qt_digits
+            )
+
+        if self._dry_run:
+            for plan in plans:
+                _print_plan(plan, root)
+            print(
+                f"{sum(plan.qt_renames for plan in plans)} renames planned in "
+                f"{len(plans)} directories, "
+                f"{sum(plan.qt_skipped for plan in plans)} files already in place."
+            )
+        else:
+            start = time.perf_counter()
+            _print_tree_stats(_map_directories(self._run_directory, plans, self._jobs), start)
+
+        if fitted_qt_digits > qt_digits:
+            print("Quantity of digits had to be readjusted.")
+
+    def _deduplicate_tree(
+        self, tree: list[tuple[Path, list[ScannedFile]]], root: Path
+    ) -> dict[Path, list[DuplicateGroup]]:
+        # the result holds the hard links, which get names of their own
+        links_by_dir: dict[Path, list[DuplicateGroup]] = {}
+        if self._deduplicator is None:
+            return links_by_dir
+
+        # duplicates are collapsed before planning, so that the IDs (even global ones) skip them
+        groups_by_dir: dict[Path, list[DuplicateGroup]] = {}
+        for idx, (path, files) in enumerate(tree):
+            kept, groups_by_dir[path], links_by_dir[path] = _deduplicate(
+                self._deduplicator, self._dry_run, path, files
+            )
+            tree[idx] = (path, kept)
+        _print_duplicates(self._deduplicator.mode, self._dry_run, groups_by_dir, root)
+        return links_by_dir
+
+    def _plan_tree(
+        self,
+        tree: Sequence[tuple[Path, Sequence[ScannedFile]]],
+        links_by_dir: Mapping[Path, Sequence[DuplicateGroup]],
+        prefix: str,
+        start_idx: int,
+        qt_digits: int,
+    ) -> tuple[list[RenamePlan], int]:
+        plans: list[RenamePlan] = []
+        if self._global_seq:
+            # the IDs continue from one directory to the next, in the order of the walk
+            qt_files = sum(len(files) for _, files in tree)
+            fitted_qt_digits = _fit_qt_digits(start_idx + qt_files - 1, qt_digits)
+            for path, files in tree:
+                targets = _build_targets(
+                    files, prefix, start_idx, fitted_qt_digits, links_by_dir.get(path, ())
+                )
+                plans.append(self._planner.plan(path, targets))
+                start_idx += len(files)
+            return plans, fitted_qt_digits
+
+        fitted_qt_digits = qt_digits
+        for path, files in tree:
+            dir_qt_digits = _fit_qt_digits(start_idx + len(files) - 1, qt_digits)
+            targets = _build_targets(
+                files, prefix, start_idx, dir_qt_digits, links_by_dir.get(path, ())
+            )
+            plans.append(self._planner.plan(path, targets))
+            fitted_qt_digits = max(fitted_qt_digits, dir_qt_digits)
+        return plans, fitted_qt_digits
+
+    def _run_directory(self, plan: RenamePlan) -> RenameStats | None:
+        # a journal holds one open file, so each directory gets its own
+        journal = self._journal.fork()
+        executor = RenameExecutor()
+        state = journal.load(plan.directory)
+        if state is not None and not state.complete:
+            return _resume_journaled(journal, executor, state)
+        if not plan.chains:
+            return None
+
+        journal.begin(JournalKind.RUN, plan)
+        return _execute_journaled(journal, executor, plan)
+
+
+def _undo_directory(
+    journal: RenameJournal, executor: RenameExecutor, directory: Path
+) -> RenameStats | None:
+    state = journal.load(directory)
+    if state is None or (state.kind == JournalKind.UNDO and state.complete):
+        return None
+    if state.kind == JournalKind.UNDO:
+        return _resume_journaled(journal, executor, state)
+
+    # renames done by a crashed run may be missing from the journal
+    done = set(state.done).union(_find_unrecorded(state.pending_plan))
+    chains = tuple(
+        tuple(Rename(step.target, step.source) for step in reversed(undone))
+        for chain in state.plan.chains
+        if (undone := [step for step in chain if step in done])
+    )
+    if not chains:
+        return None
+
+    plan = RenamePlan(directory, chains, 0)
+    _check_targets_free(plan)
+    journal.begin(JournalKind.UNDO, plan)
+    return _execute_journaled(journal, executor, plan)
+
+
+def _resume_journaled(
+    journal: RenameJournal, executor: RenameExecutor, state: JournalState
+) -> RenameStats:
+    pending = state.pending_plan
+    unrecorded = _find_unrecorded(pending)
+    chains = tuple(
+        remaining
+        for chain in pending.chains
+        if (remaining := tuple(step for step in chain if step not in unrecorded))
+    )
+    plan = RenamePlan(pending.directory, chains, pending.qt_skipped)
+    _check_targets_free(plan)
+
+    journal.resume(pending.directory)
+    for step in unrecorded:
+        journal.record(step)
+    return _execute_journaled(journal, executor, plan)
+
+
+def _execute_journaled(
+    journal: RenameJournal, executor: RenameExecutor, plan: RenamePlan
+) -> RenameStats:
+    complete = False
+    try:
+        with tracing.span("stddz.rename", directory=str(plan.directory), renames=plan.qt_renames):
+            stats = executor.execute(plan, journal.record)
+        complete = True
+    finally:
+        journal.end(complete)
+    return stats
+
+
+def _map_directories[T](
+    function: Callable[[T], RenameStats | None], tasks: Sequence[T], jobs: int
+) -> list[RenameStats]:
+    if jobs < 1:
+        raise ValueError("Quantity of jobs must be positive.")
+
+    # directories are independent, so each worker runs whole directories sequentially
+    if jobs == 1 or len(tasks) <= 1:
+        results = [function(task) for task in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(function, tasks))
+    return [stats for stats in results if stats is not None]
+
+
+def _fit_qt_digits(last_id: int, qt_digits: int) -> int:
+    return max(qt_digits, len(str(max(last_id, 0))))
+
+
+def _deduplicate(
+    deduplicator: Deduplicator, dry_run: bool, directory: Path, files: Sequence[ScannedFile]
+) -> tuple[list[ScannedFile], list[DuplicateGroup], list[DuplicateGroup]]:
+    # the result also holds the hard links to name after their original, old and new alike
+    groups = deduplicator.find(directory, files)
+    if deduplicator.mode == DedupMode.REPORT:
+        return list(files), groups, []
+
+    if not dry_run:
+        deduplicator.collapse(directory, groups)
+    links = (
+        deduplicator.find_links(files) + groups if deduplicator.mode == DedupMode.HARDLINK else []
+    )
+    removed = {name for group in [*groups, *links] for name in group.duplicates}
+    return [file for file in files if file.name not in removed], groups, links
+
+
+def _build_targets(
+    files: Sequence[ScannedFile],
+    prefix: str,
+    start_idx: int,
+    qt_digits: int,
+    links: Sequence[DuplicateGroup] = (),
+) -> dict[str, str]:
+    targets = {
+        file.name: f"{prefix}-{idx:0{qt_digits}}{os.path.splitext(file.name)[1]}"
+        for idx, file in enumerate(files, start=start_idx)
+    }
+    # hard links share their original's ID, with a suffix counted across all of its groups
+    qts_links: dict[str, int] = defaultdict(int)
+    for group in links:
+        if group.original not in targets:
+            continue
+        stem = os.path.splitext(targets[group.original])[0]
+        for duplicate in group.duplicates:
+            if duplicate not in targets:
+                qts_links[group.original] += 1
+                idx = qts_links[group.original]
+                targets[duplicate] = f"{stem}_{idx}{os.path.splitext(duplicate)[1]}"
+    return targets
+
+
+def _print_duplicates(
+    mode: DedupMode,
+    dry_run: bool,
+    groups_by_dir: Mapping[Path, Sequence[DuplicateGroup]],
+    root: Path | None = None,
+) -> None:
+    groups = [(path, group) for path, groups in groups_by_dir.items() for group in groups]
+    if mode == DedupMode.REPORT or dry_run:
+        for path, group in groups:
+            location = _get_location(path, root)
+            for duplicate in group.duplicates:
+                print(f"{location}{duplicate} is a duplicate of {location}{group.original}.")
+
+    qt_duplicates = sum(len(group.duplicates) for _, group in groups)
+    qt_bytes = sum(len(group.duplicates) * group.size for _, group in groups)
+    if mode == DedupMode.REPORT:
+        print(f"{qt_duplicates} duplicates found ({qt_bytes} bytes).")
+    elif dry_run:
+        print(f"{qt_duplicates} duplicates to {mode} ({qt_bytes} bytes to free).")
+    elif mode == DedupMode.DELETE:
+        print(f"{qt_duplicates} duplicates deleted ({qt_bytes} bytes freed).")
+    else:
+        print(f"{qt_duplicates} duplicates hardlinked ({qt_bytes} bytes freed).")
+
+
+def _print_plan(plan: RenamePlan, root: Path | None = None) -> None:
+    location = _get_location(plan.directory, root)
+    for chain in plan.chains:
+        for step in chain:
+            print(f"{location}{step.source} -> {location}{step.target}")
+
+
+def _get_location(directory: Path, root: Path | None) -> str:
+    # inside a tree, the names are shown relative to its root
+    if root is None or directory == root:
+        return ""
+    return f"{directory.relative_to(root).as_posix()}/"
+
+
+def _print_stats(stats: RenameStats) -> None:
+    print(
+        f"{stats.qt_renames} renames in {stats.elapsed_secs:.2f}s "
+        f"({stats.throughput:.0f} renames/s)."
+    )
+
+
+def _print_tree_stats(results: Sequence[RenameStats], start: float) -> None:
+    # the directories overlap in time, so the throughput comes from the wall-clock time
+    stats = RenameStats(sum(result.qt_renames for result in results), time.perf_counter() - start)
+    print(
+        f"{stats.qt_renames} renames in {len(results)} directories in {stats.elapsed_secs:.2f}s "
+        f"({stats.throughput:.0f} renames/s)."
+    )
+
+
+def _check_targets_free(plan: RenamePlan) -> None:
+    # a replayed plan may be stale, and a rename would silently replace a file created since
+    sources = {step.source for chain in plan.chains for step in chain}
+    for chain in plan.chains:
+        for step in chain:
+            if step.target not in sources and os.path.lexists(plan.directory / step.target):
+                raise typer.BadParameter(
+                    f"'{step.target}' was created in '{plan.directory}' after the journaled "
+                    "renames, so replaying them would overwrite it."
+                )
 
-            idx += 1
 
-    def _build_file_name(self, prefix: str, index: int, qt_digits: int) -> str:
-        num_str = f"{index:0{qt_digits}}"
-        return f"{prefix}-{num_str}"
+def _find_unrecorded(plan: RenamePlan) -> set[Rename]:
+    # a crash between a rename and its record leaves a pending step already applied
+    unrecorded: set[Rename] = set()
+    for chain in plan.chains:
+        for step in chain:
+            if os.path.lexists(plan.directory / step.source) or not os.path.lexists(
+                plan.directory / step.target
+            ):
+                break
+            unrecorded.add(step)
+    return unrecorded
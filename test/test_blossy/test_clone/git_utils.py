@@ -0,0 +1,22 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+
+import subprocess
+from pathlib import Path
+
+
+def git(*args: str) -> str:
+    completed = subprocess.run(
+        ["git", "-c", "user.name=Blossy", "-c", "user.email=blossy@example.com", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return completed.stdout.strip()
+
+
+def commit(work_dir: Path, name: str) -> str:
+    (work_dir / name).write_text(name, encoding="utf-8")
+    git("-C", str(work_dir), "add", name)
+    git("-C", str(work_dir), "commit", "-q", "-m", name)
+    git("-C", str(work_dir), "push", "-q", "origin", "HEAD")
+    return git("-C", str(work_dir), "rev-parse", "HEAD")
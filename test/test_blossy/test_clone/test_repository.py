@@ -0,0 +1,76 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import os
+from pathlib import Path
+
+import pytest
+
+from blossy.clone.repository import MirrorCache
+from blossy.shared.adapter import SubprocessAdapter
+
+from .git_utils import commit, git
+
+
+@pytest.fixture()
+def upstream(tmp_path: Path) -> tuple[str, Path]:
+    bare = tmp_path / "upstream" / "project.git"
+    git("init", "-q", "--bare", str(bare))
+    work_dir = tmp_path / "author"
+    git("clone", "-q", str(bare), str(work_dir))
+    commit(work_dir, "first.txt")
+    return bare.as_uri(), work_dir
+
+
+@pytest.fixture()
+def cache(tmp_path: Path) -> MirrorCache:
+    return MirrorCache(SubprocessAdapter(), 1 << 30, tmp_path / "cache")
+
+
+class TestMirrorCache:
+    def test_clone_creates_mirror(
+        self, cache: MirrorCache, upstream: tuple[str, Path], tmp_path: Path
+    ) -> None:
+        url, _ = upstream
+
+        result = cache.clone(url, tmp_path / "copy")
+
+        assert result.returncode == 0
+        assert cache.get_mirror_path(url).is_dir()
+        assert (tmp_path / "copy" / "first.txt").is_file()
+        assert git("-C", str(tmp_path / "copy"), "remote", "get-url", "origin") == url
+
+    def test_clone_updates_mirror(
+        self, cache: MirrorCache, upstream: tuple[str, Path], tmp_path: Path
+    ) -> None:
+        url, work_dir = upstream
+        cache.clone(url, tmp_path / "copy-1")
+        head = commit(work_dir, "second.txt")
+
+        result = cache.clone(url, tmp_path / "copy-2")
+
+        assert result.returncode == 0
+        assert git("-C", str(tmp_path / "copy-2"), "rev-parse", "HEAD") == head
+
+    def test_clone_missing_upstream_fails(self, cache: MirrorCache, tmp_path: Path) -> None:
+        url = (tmp_path / "missing.git").as_uri()
+
+        result = cache.clone(url, tmp_path / "copy")
+
+        assert result.returncode != 0
+        assert not cache.get_mirror_path(url).exists()
+        assert not (tmp_path / "copy").exists()
+
+    def test_evict_least_recently_used(self, upstream: tuple[str, Path], tmp_path: Path) -> None:
+        url, _ = upstream
+        other_url = url.replace("project.git", "other.git")
+        git("clone", "-q", "--bare", url, other_url.removeprefix("file://"))
+        cache = MirrorCache(SubprocessAdapter(), 0, tmp_path / "cache")
+        cache.clone(url, tmp_path / "copy-1")
+        cache.clone(other_url, tmp_path / "copy-2")
+        os.utime(cache.get_mirror_path(url), (0, 0))
+
+        evicted = cache.evict(keep={cache.get_mirror_path(other_url)})
+
+        assert evicted == [cache.get_mirror_path(url)]
+        assert not cache.get_mirror_path(url).exists()
+        assert cache.get_mirror_path(other_url).exists()
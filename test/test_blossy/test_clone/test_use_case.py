@@ -1,24 +1,45 @@
 # pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
 
+import subprocess
+from collections.abc import Callable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
 import pytest
 
+from blossy.clone.model import CloneFilter, CloneOptions
+from blossy.clone.repository import MirrorCache
 from blossy.clone.use_case import CloneUseCase, CloneUseCaseFactory
-from blossy.shared.error import ConfigError
+from blossy.shared.adapter import SubprocessAdapter
+from blossy.shared.error import ConfigError, SubprocessError
+from blossy.shared.model import ProcessResult
 from blossy.shared.repository import TomlValue
 
+from .git_utils import commit, git
+
 
 class MockConfigRepository:
     get_property_calls: list[tuple[str, str]]
+    get_section_calls: list[str]
 
     get_property_outputs: list[TomlValue | None]
+    get_section_output: dict[str, TomlValue]
 
     def __init__(self) -> None:
         self.get_property_calls = []
+        self.get_section_calls = []
         self.get_property_outputs = []
+        self.get_section_output = {}
 
     def get_property(self, subcommand: str, property_name: str) -> TomlValue | None:
         self.get_property_calls.append((subcommand, property_name))
-        return self.get_property_outputs.pop(0)
+        # properties without a queued output aren't configured
+        return self.get_property_outputs.pop(0) if self.get_property_outputs else None
+
+    def get_section(self, subcommand: str) -> dict[str, TomlValue]:
+        self.get_section_calls.append(subcommand)
+        return self.get_section_output
 
     def set_property(self, subcommand: str, property_name: str, value: TomlValue) -> None:
         """Set a property value for a subcommand."""
@@ -28,12 +49,42 @@ class MockConfigRepository:
 class MockSubprocessAdapter:
     calls: list[tuple[str, ...]]
 
+    capture_returncodes: dict[str, int]
+    capture_timeouts: set[str]
+    capture_errors: set[str]
+    cancelled: bool
+
     def __init__(self) -> None:
         self.calls = []
+        self.capture_returncodes = {}
+        self.capture_timeouts = set()
+        self.capture_errors = set()
+        self.cancelled = False
 
     def run(self, *args: str) -> None:
         self.calls.append(args)
 
+    def capture(self, *args: str) -> ProcessResult:
+        self.calls.append(args)
+        if args[-1] in self.capture_errors:
+            raise KeyboardInterrupt()
+        if args[-1] in self.capture_timeouts:
+            return ProcessResult(-9, "", 0.5, 0.25, timed_out=True)
+        returncode = self.capture_returncodes.get(args[-1], 0)
+        return ProcessResult(returncode, f"Cloning into '{args[-1]}'...\n", 0.5, 0.25)
+
+    def submit[T](self, task: Callable[..., T], *args: Any) -> Future[T]:
+        # tasks run right away, so the calls keep the order of the repositories
+        future: Future[T] = Future()
+        try:
+            future.set_result(task(*args))
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            future.set_exception(e)
+        return future
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
 
 @pytest.fixture()
 def config_repository() -> MockConfigRepository:
@@ -64,6 +115,7 @@ class TestCloneUseCase:
         use_case.execute(["blossy-cli", "harmonics-api"], use_https=False)
 
         assert config_repository.get_property_calls == [("clone", "github-user")]
+        assert config_repository.get_section_calls == ["clone"]
         assert subprocess_adapter.calls == [
             ("git", "clone", "git@github.com:ravensakurai/blossy-cli.git"),
             ("git", "clone", "git@github.com:ravensakurai/harmonics-api.git"),
@@ -108,3 +160,231 @@ class TestCloneUseCase:
             use_case.execute(["blossy-cli"], use_https=False)
 
         assert not subprocess_adapter.calls
+
+
+class TestCloneUseCaseOptions:
+    def test_execute_uses_given_options(
+        self,
+        config_repository: MockConfigRepository,
+        subprocess_adapter: MockSubprocessAdapter,
+    ) -> None:
+        config_repository.get_property_outputs = ["ravensakurai"]
+        options = CloneOptions(1, CloneFilter.BLOBLESS, ("src", "docs"))
+        use_case = CloneUseCaseFactory.get_use_case(
+            config_repository, subprocess_adapter, options=options
+        )
+
+        use_case.execute(["blossy-cli"], use_https=True)
+
+        assert subprocess_adapter.calls == [
+            (
+                "git",
+                "clone",
+                "--depth=1",
+                "--filter=blob:none",
+                "--sparse",
+                "https://github.com/ravensakurai/blossy-cli.git",
+            ),
+            ("git", "-C", "blossy-cli", "sparse-checkout", "set", "src", "docs"),
+        ]
+
+    def test_execute_uses_configured_options(
+        self,
+        config_repository: MockConfigRepository,
+        subprocess_adapter: MockSubprocessAdapter,
+    ) -> None:
+        config_repository.get_property_outputs = ["ravensakurai"]
+        config_repository.get_section_output = {
+            "depth": 5,
+            "filter": "tree:0",
+            "blossy-cli.depth": 1,
+        }
+        use_case = CloneUseCaseFactory.get_use_case(config_repository, subprocess_adapter)
+
+        use_case.execute(["blossy-cli"], use_https=True)
+
+        assert subprocess_adapter.calls == [
+            (
+                "git",
+                "clone",
+                "--depth=1",
+                "--filter=tree:0",
+                "https://github.com/ravensakurai/blossy-cli.git",
+            ),
+        ]
+
+    def test_execute_invalid_configured_option_raises(
+        self,
+        config_repository: MockConfigRepository,
+        subprocess_adapter: MockSubprocessAdapter,
+    ) -> None:
+        config_repository.get_property_outputs = ["ravensakurai"]
+        config_repository.get_section_output = {"depth": "deep"}
+        use_case = CloneUseCaseFactory.get_use_case(config_repository, subprocess_adapter)
+
+        with pytest.raises(ConfigError):
+            use_case.execute(["blossy-cli"], use_https=True)
+
+        assert not subprocess_adapter.calls
+
+
+class TestCloneUseCaseConcurrent:
+    def test_execute_clones_every_repository(
+        self,
+        config_repository: MockConfigRepository,
+        subprocess_adapter: MockSubprocessAdapter,
+        capsys,
+    ) -> None:
+        config_repository.get_property_outputs = ["ravensakurai"]
+        use_case = CloneUseCaseFactory.get_use_case(config_repository, subprocess_adapter, jobs=4)
+
+        use_case.execute(["blossy-cli", "harmonics-api"], use_https=True)
+
+        assert sorted(subprocess_adapter.calls) == [
+            ("git", "clone", "https://github.com/ravensakurai/blossy-cli.git"),
+            ("git", "clone", "https://github.com/ravensakurai/harmonics-api.git"),
+        ]
+        output = capsys.readouterr().out
+        assert (
+            "[blossy-cli] Cloning into 'https://github.com/ravensakurai/blossy-cli.git'..."
+            in output
+        )
+        assert "blossy-cli     ok      0.50s  0.25s" in output
+
+    def test_execute_aggregates_failures(
+        self,
+        config_repository: MockConfigRepository,
+        subprocess_adapter: MockSubprocessAdapter,
+        capsys,
+    ) -> None:
+        config_repository.get_property_outputs = ["ravensakurai"]
+        subprocess_adapter.capture_returncodes = {"git@github.com:ravensakurai/a.git": 128}
+        use_case = CloneUseCaseFactory.get_use_case(config_repository, subprocess_adapter, jobs=2)
+
+        with pytest.raises(SubprocessError, match=r"1 of 3 repositories failed to clone \(a\)"):
+            use_case.execute(["a", "b", "c"], use_https=False)
+
+        assert len(subprocess_adapter.calls) == 3
+        assert "a           failed  0.50s  0.25s" in capsys.readouterr().out
+
+    def test_execute_reports_timeouts(
+        self,
+        config_repository: MockConfigRepository,
+        subprocess_adapter: MockSubprocessAdapter,
+        capsys,
+    ) -> None:
+        config_repository.get_property_outputs = ["ravensakurai"]
+        subprocess_adapter.capture_timeouts = {"git@github.com:ravensakurai/slow.git"}
+        use_case = CloneUseCaseFactory.get_use_case(config_repository, subprocess_adapter, jobs=2)
+
+        with pytest.raises(SubprocessError, match=r"1 of 2 repositories failed to clone \(slow\)"):
+            use_case.execute(["slow", "fast"], use_https=False)
+
+        assert "slow        timed out  0.50s  0.25s" in capsys.readouterr().out
+
+    def test_execute_cancels_pending_on_interrupt(
+        self,
+        config_repository: MockConfigRepository,
+        subprocess_adapter: MockSubprocessAdapter,
+    ) -> None:
+        config_repository.get_property_outputs = ["ravensakurai"]
+        subprocess_adapter.capture_errors = {"git@github.com:ravensakurai/a.git"}
+        use_case = CloneUseCaseFactory.get_use_case(config_repository, subprocess_adapter, jobs=2)
+
+        with pytest.raises(KeyboardInterrupt):
+            use_case.execute(["a", "b"], use_https=False)
+
+        assert subprocess_adapter.cancelled
+
+    def test_execute_clones_local_repositories(
+        self,
+        config_repository: MockConfigRepository,
+        tmp_path: Path,
+        monkeypatch,
+    ) -> None:
+        remote = tmp_path / "remote"
+        for repo in ("first", "second"):
+            subprocess.run(
+                ["git", "init", "-q", "--bare", str(remote / "ravensakurai" / f"{repo}.git")],
+                check=True,
+            )
+        workspace = tmp_path / "workspace"
+        workspace.mkdir()
+        monkeypatch.chdir(workspace)
+        # git rewrites the GitHub URLs into the local bare repositories
+        monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+        monkeypatch.setenv("GIT_CONFIG_KEY_0", f"url.{remote.as_uri()}/.insteadOf")
+        monkeypatch.setenv("GIT_CONFIG_VALUE_0", "https://github.com/")
+        config_repository.get_property_outputs = ["ravensakurai"]
+        use_case = CloneUseCaseFactory.get_use_case(
+            config_repository, SubprocessAdapter(max_workers=2), jobs=2
+        )
+
+        with pytest.raises(SubprocessError):
+            use_case.execute(["first", "second", "missing"], use_https=True)
+
+        assert (workspace / "first" / ".git").is_dir()
+        assert (workspace / "second" / ".git").is_dir()
+        assert not (workspace / "missing").exists()
+
+    def test_execute_clones_through_mirrors(
+        self,
+        config_repository: MockConfigRepository,
+        tmp_path: Path,
+        monkeypatch,
+    ) -> None:
+        remote = tmp_path / "remote"
+        subprocess.run(
+            ["git", "init", "-q", "--bare", str(remote / "ravensakurai" / "first.git")], check=True
+        )
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+        monkeypatch.setenv("GIT_CONFIG_KEY_0", f"url.{remote.as_uri()}/.insteadOf")
+        monkeypatch.setenv("GIT_CONFIG_VALUE_0", "https://github.com/")
+        config_repository.get_property_outputs = ["ravensakurai"]
+        mirror_cache = MirrorCache(SubprocessAdapter(), 1 << 30, tmp_path / "cache")
+        use_case = CloneUseCaseFactory.get_use_case(
+            config_repository, SubprocessAdapter(), mirror_cache=mirror_cache
+        )
+
+        use_case.execute(["first"], use_https=True)
+
+        assert (tmp_path / "first" / ".git").is_dir()
+        assert mirror_cache.get_mirror_path("https://github.com/ravensakurai/first.git").is_dir()
+
+
+class TestCloneUseCaseSync:
+    @pytest.fixture()
+    def author(self, tmp_path: Path, monkeypatch) -> Path:
+        remote = tmp_path / "remote"
+        bare = remote / "ravensakurai" / "project.git"
+        git("init", "-q", "--bare", str(bare))
+        author = tmp_path / "author"
+        git("clone", "-q", str(bare), str(author))
+        commit(author, "first.txt")
+        monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+        monkeypatch.setenv("GIT_CONFIG_KEY_0", f"url.{remote.as_uri()}/.insteadOf")
+        monkeypatch.setenv("GIT_CONFIG_VALUE_0", "https://github.com/")
+        workspace = tmp_path / "workspace"
+        workspace.mkdir()
+        monkeypatch.chdir(workspace)
+        return author
+
+    def _sync(self, config_repository: MockConfigRepository, capsys) -> str:
+        config_repository.get_property_outputs = ["ravensakurai"]
+        use_case = CloneUseCaseFactory.get_use_case(
+            config_repository, SubprocessAdapter(max_workers=2), jobs=2, sync=True
+        )
+        use_case.execute(["project"], use_https=True)
+        return capsys.readouterr().out
+
+    def test_execute_clones_then_skips_then_updates(
+        self, author: Path, config_repository: MockConfigRepository, capsys
+    ) -> None:
+        assert "project     ok" in self._sync(config_repository, capsys)
+        assert "project     skipped" in self._sync(config_repository, capsys)
+
+        head = commit(author, "second.txt")
+
+        assert "project     updated" in self._sync(config_repository, capsys)
+        assert git("-C", "project", "rev-parse", "HEAD") == head
@@ -19,6 +19,8 @@ class TestConfigValidatorIsSubcommandSupported:
             ("clone", True),
             ("CLONE", True),
             ("Clone", True),
+            ("countc", True),
+            ("global", True),
             ("invalid", False),
             ("", False),
         ],
@@ -31,17 +33,28 @@ class TestConfigValidatorIsSubcommandSupported:
 
 class TestConfigValidatorIsKeySupported:
     @pytest.mark.parametrize(
-        "key,expected",
+        "subcommand,key,expected",
         [
-            ("github-user", True),
-            ("GITHUB-USER", True),
-            ("Github-User", True),
-            ("invalid-key", False),
-            ("", False),
+            ("clone", "github-user", True),
+            ("clone", "GITHUB-USER", True),
+            ("CLONE", "Github-User", True),
+            ("clone", "depth", True),
+            ("clone", "blossy-cli.depth", True),
+            ("clone", "blossy-cli.sparse", True),
+            ("clone", "blossy-cli.github-user", False),
+            ("clone", "invalid-key", False),
+            ("clone", "", False),
+            ("countc", "jobs", True),
+            ("countl", "chunk-size", True),
+            ("global", "cache-size", True),
+            ("countl", "jobs", False),
+            ("countc", "github-user", False),
         ],
     )
-    def test_is_key_supported(self, validator: ConfigValidator, key: str, expected: bool) -> None:
-        assert validator.is_key_supported(key) == expected
+    def test_is_key_supported(
+        self, validator: ConfigValidator, subcommand: str, key: str, expected: bool
+    ) -> None:
+        assert validator.is_key_supported(subcommand, key) == expected
 
 
 class TestConfigValidatorIsValueTypeValid:
@@ -53,6 +66,15 @@ class TestConfigValidatorIsValueTypeValid:
             ("github-user", 123, False),
             ("github-user", True, False),
             ("github-user", 1.5, False),
+            ("depth", 1, True),
+            ("blossy-cli.depth", 0, False),
+            ("blossy-cli.depth", True, False),
+            ("filter", "blob:none", True),
+            ("blossy-cli.filter", "tree:0", True),
+            ("filter", "blob:limit=1k", False),
+            ("sparse", ["src", "docs"], True),
+            ("blossy-cli.sparse", ["src", 1], False),
+            ("sparse", "src", False),
             ("invalid-key", "value", False),
             ("", "value", False),
         ],
@@ -60,4 +82,20 @@ class TestConfigValidatorIsValueTypeValid:
     def test_is_value_type_valid(
         self, validator: ConfigValidator, key: str, value: Any, expected: bool
     ) -> None:
-        assert validator.is_value_type_valid(key, value) == expected
+        assert validator.is_value_type_valid("clone", key, value) == expected
+
+    @pytest.mark.parametrize(
+        "subcommand,key,value,expected",
+        [
+            ("countc", "jobs", 4, True),
+            ("countc", "jobs", 0, False),
+            ("rand", "buffer-size", 1 << 20, True),
+            ("rand", "buffer-size", "1MiB", False),
+            ("global", "cache-size", 0, True),
+            ("global", "jobs", 4, False),
+        ],
+    )
+    def test_is_value_type_valid_tuning(
+        self, validator: ConfigValidator, subcommand: str, key: str, value: Any, expected: bool
+    ) -> None:
+        assert validator.is_value_type_valid(subcommand, key, value) == expected
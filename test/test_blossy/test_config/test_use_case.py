@@ -1,18 +1,24 @@
 # pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
 
+from collections.abc import Mapping
+from pathlib import Path
 from typing import Any
 
 import pytest
 
-from blossy.config.use_case import ConfigureUseCase, ConfigureUseCaseFactory
+from blossy.config.use_case import (
+    ConfigureBatchUseCase,
+    ConfigureUseCase,
+    ConfigureUseCaseFactory,
+)
 from blossy.shared.error import ConfigError
 from blossy.shared.repository import TomlValue
 
 
 class MockConfigValidator:
     is_subcommand_supported_calls: list[str]
-    is_key_supported_calls: list[str]
-    is_value_type_valid_calls: list[tuple[str, Any]]
+    is_key_supported_calls: list[tuple[str, str]]
+    is_value_type_valid_calls: list[tuple[str, str, Any]]
 
     is_subcommand_supported_outputs: list[bool]
     is_key_supported_outputs: list[bool]
@@ -31,24 +37,29 @@ class MockConfigValidator:
         self.is_subcommand_supported_calls.append(subcommand)
         return self.is_subcommand_supported_outputs.pop(0)
 
-    def is_key_supported(self, key: str) -> bool:
-        self.is_key_supported_calls.append(key)
+    def is_key_supported(self, subcommand: str, key: str) -> bool:
+        self.is_key_supported_calls.append((subcommand, key))
         return self.is_key_supported_outputs.pop(0)
 
-    def is_value_type_valid(self, key: str, value: Any) -> bool:
-        self.is_value_type_valid_calls.append((key, value))
+    def is_value_type_valid(self, subcommand: str, key: str, value: Any) -> bool:
+        self.is_value_type_valid_calls.append((subcommand, key, value))
         return self.is_value_type_valid_outputs.pop(0)
 
 
 class MockConfigRepository:
     set_property_calls: list[tuple[str, str, TomlValue]]
+    set_properties_calls: list[Mapping[str, Mapping[str, TomlValue]]]
 
     def __init__(self) -> None:
         self.set_property_calls = []
+        self.set_properties_calls = []
 
     def set_property(self, subcommand: str, property_name: str, value: TomlValue) -> None:
         self.set_property_calls.append((subcommand, property_name, value))
 
+    def set_properties(self, properties: Mapping[str, Mapping[str, TomlValue]]) -> None:
+        self.set_properties_calls.append(properties)
+
 
 @pytest.fixture()
 def config_validator() -> MockConfigValidator:
@@ -68,6 +79,14 @@ def use_case(
     return ConfigureUseCaseFactory.get_use_case(config_validator, config_repository)
 
 
+@pytest.fixture()
+def batch_use_case(
+    config_validator: MockConfigValidator,
+    config_repository: MockConfigRepository,
+) -> ConfigureBatchUseCase:
+    return ConfigureUseCaseFactory.get_batch_use_case(config_validator, config_repository)
+
+
 class TestConfigureUseCase:
     def test_execute_valid_configuration(
         self,
@@ -82,8 +101,8 @@ class TestConfigureUseCase:
         use_case.execute("clone", "github-user", "octocat")
 
         assert config_validator.is_subcommand_supported_calls == ["clone"]
-        assert config_validator.is_key_supported_calls == ["github-user"]
-        assert config_validator.is_value_type_valid_calls == [("github-user", "octocat")]
+        assert config_validator.is_key_supported_calls == [("clone", "github-user")]
+        assert config_validator.is_value_type_valid_calls == [("clone", "github-user", "octocat")]
         assert config_repository.set_property_calls == [("clone", "github-user", "octocat")]
 
     def test_execute_unsupported_subcommand(
@@ -127,3 +146,77 @@ class TestConfigureUseCase:
             use_case.execute("clone", "github-user", 123)
 
         assert not config_repository.set_property_calls
+
+
+class TestConfigureBatchUseCase:
+    def test_execute_toml_file(
+        self,
+        batch_use_case: ConfigureBatchUseCase,
+        config_validator: MockConfigValidator,
+        config_repository: MockConfigRepository,
+        tmp_path: Path,
+    ) -> None:
+        file = tmp_path / "batch.toml"
+        file.write_text('[clone]\ngithub-user = "octocat"\nbig-monorepo.depth = 1\n')
+        config_validator.is_subcommand_supported_outputs = [True, True]
+        config_validator.is_key_supported_outputs = [True, True]
+        config_validator.is_value_type_valid_outputs = [True, True]
+
+        batch_use_case.execute(file)
+
+        assert config_validator.is_key_supported_calls == [
+            ("clone", "github-user"),
+            ("clone", "big-monorepo.depth"),
+        ]
+        assert config_repository.set_properties_calls == [
+            {"clone": {"github-user": "octocat", "big-monorepo.depth": 1}}
+        ]
+
+    def test_execute_json_file(
+        self,
+        batch_use_case: ConfigureBatchUseCase,
+        config_validator: MockConfigValidator,
+        config_repository: MockConfigRepository,
+        tmp_path: Path,
+    ) -> None:
+        file = tmp_path / "batch.json"
+        file.write_text('{"clone": {"sparse": ["src", "docs"]}}')
+        config_validator.is_subcommand_supported_outputs = [True]
+        config_validator.is_key_supported_outputs = [True]
+        config_validator.is_value_type_valid_outputs = [True]
+
+        batch_use_case.execute(file)
+
+        assert config_repository.set_properties_calls == [{"clone": {"sparse": ["src", "docs"]}}]
+
+    def test_execute_invalid_entry_writes_nothing(
+        self,
+        batch_use_case: ConfigureBatchUseCase,
+        config_validator: MockConfigValidator,
+        config_repository: MockConfigRepository,
+        tmp_path: Path,
+    ) -> None:
+        file = tmp_path / "batch.toml"
+        file.write_text('[clone]\ngithub-user = "octocat"\ninvalid-key = 1\n')
+        config_validator.is_subcommand_supported_outputs = [True, True]
+        config_validator.is_key_supported_outputs = [True, False]
+        config_validator.is_value_type_valid_outputs = [True]
+
+        with pytest.raises(ConfigError):
+            batch_use_case.execute(file)
+
+        assert not config_repository.set_properties_calls
+
+    def test_execute_unparsable_file(
+        self,
+        batch_use_case: ConfigureBatchUseCase,
+        config_repository: MockConfigRepository,
+        tmp_path: Path,
+    ) -> None:
+        file = tmp_path / "batch.toml"
+        file.write_text("[clone")
+
+        with pytest.raises(ConfigError):
+            batch_use_case.execute(file)
+
+        assert not config_repository.set_properties_calls
@@ -0,0 +1,65 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import functools
+from pathlib import Path
+
+import pytest
+
+from blossy.countc.model import CharacterCount
+from blossy.countc.service import count_bytes, count_text, split_ranges
+
+TEXT = "  héllo \t wörld 日本\r\n\r\n  end  "
+
+
+class TestCountText:
+    @pytest.mark.parametrize(
+        "text,total,non_whitespace,necessary",
+        [
+            ("", 0, 0, 0),
+            ("abc", 3, 3, 3),
+            ("a  b", 4, 2, 3),
+            ("  a b  ", 7, 2, 3),
+            ("\t\n ", 3, 0, -1),
+        ],
+    )
+    def test_count_text(self, text: str, total: int, non_whitespace: int, necessary: int) -> None:
+        count = count_text(text)
+
+        assert count.total == total
+        assert count.non_whitespace == non_whitespace
+        assert count.necessary == necessary
+
+    @pytest.mark.parametrize("split", range(1, 12))
+    def test_merged_pieces_match_whole_text(self, split: int) -> None:
+        text = "ab  c \t d  "
+
+        merged = count_text(text[:split]).merge(count_text(text[split:]))
+
+        assert merged == count_text(text)
+
+
+class TestCountBytes:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64])
+    def test_ranges_match_text_mode(self, tmp_path: Path, chunk_size: int) -> None:
+        file = tmp_path / "text.txt"
+        content = TEXT.encode()
+        file.write_bytes(content)
+        with open(file, "r", encoding="utf-8") as f:
+            expected = count_text(f.read())
+
+        ranges = split_ranges(memoryview(content), chunk_size)
+        counts = (count_bytes(content[start:end]) for start, end in ranges)
+
+        assert functools.reduce(CharacterCount.merge, counts, CharacterCount()) == expected
+
+    def test_ranges_cover_content_without_splitting_characters(self) -> None:
+        content = TEXT.encode()
+
+        ranges = split_ranges(memoryview(content), 1)
+
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(content)
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        for start, end in ranges:
+            content[start:end].decode("utf-8")
+            assert content[start:end] != b"\n" or content[start - 1 : start] != b"\r"
@@ -0,0 +1,90 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+import typer
+
+from blossy.countc.use_case import CountCharactersUseCaseFactory
+from blossy.shared import tracing
+
+TEXT = "  Blossy is my   favorite puppy.\n\nDid somebody say meatloaf?\n\n"
+
+
+class MockFileAdapter:
+    read_text_chunks_calls: list[tuple[Path, int]]
+
+    _content: str
+
+    def __init__(self, content: str) -> None:
+        self.read_text_chunks_calls = []
+        self._content = content
+
+    def read_text_chunks(self, path: Path, block_size: int) -> Iterator[str]:
+        self.read_text_chunks_calls.append((path, block_size))
+        for i in range(0, len(self._content), block_size):
+            yield self._content[i : i + block_size]
+
+    @contextmanager
+    def map_view(self, path: Path) -> Iterator[memoryview]:
+        assert path.is_absolute()
+        yield memoryview(self._content.encode())
+
+
+@pytest.fixture()
+def file_adapter() -> MockFileAdapter:
+    return MockFileAdapter(TEXT)
+
+
+class TestCountCharactersUseCase:
+    @pytest.mark.parametrize(
+        "ignore_unnec,ignore_ws,expected",
+        [
+            (False, False, len(TEXT)),
+            (False, True, len("".join(TEXT.split()))),
+            (True, False, len(" ".join(TEXT.split()))),
+        ],
+    )
+    @pytest.mark.parametrize("chunk_size", [1, 4, 1 << 20])
+    def test_execute_counts_chunks(
+        self,
+        capsys,
+        file_adapter: MockFileAdapter,
+        ignore_unnec: bool,
+        ignore_ws: bool,
+        expected: int,
+        chunk_size: int,
+    ) -> None:
+        use_case = CountCharactersUseCaseFactory.get_use_case(
+            file_adapter, ignore_unnec, ignore_ws, False, chunk_size=chunk_size
+        )
+
+        use_case.execute(Path("file.txt"))
+
+        assert capsys.readouterr().out == f"{expected}\n"
+        assert file_adapter.read_text_chunks_calls == [(Path.cwd() / "file.txt", chunk_size)]
+
+    def test_execute_invalid_jobs_raises(self, file_adapter: MockFileAdapter) -> None:
+        use_case = CountCharactersUseCaseFactory.get_use_case(file_adapter, False, False, True, 0)
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(Path("file.txt"))
+
+    def test_execute_traces_chunks_of_workers(
+        self, capsys, file_adapter: MockFileAdapter, tmp_path: Path
+    ) -> None:
+        use_case = CountCharactersUseCaseFactory.get_use_case(
+            file_adapter, False, False, False, jobs=2, chunk_size=8
+        )
+
+        tracing.enable()
+        use_case.execute(Path("file.txt"))
+        tracing.export(tmp_path / "trace.jsonl")
+
+        assert capsys.readouterr().out == f"{len(TEXT)}\n"
+        events = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+        assert {event["name"] for event in events} == {"countc.chunk"}
+        assert sum(event["args"]["size"] for event in events) == len(TEXT.encode())
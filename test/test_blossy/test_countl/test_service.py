@@ -0,0 +1,40 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import io
+
+import pytest
+
+from blossy.countl.service import count_lines
+
+TEXTS = [
+    "",
+    "one",
+    "one\n",
+    "one\ntwo",
+    "one\n\n  \ntwo\n",
+    "\n\n\n",
+    "  \t\n x \n",
+]
+
+
+def _split(text: str, chunk_size: int) -> list[str]:
+    return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+
+class TestCountLines:
+    @pytest.mark.parametrize("text", TEXTS)
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 1 << 20])
+    def test_count_lines_matches_line_iteration(self, text: str, chunk_size: int) -> None:
+        expected = len(io.StringIO(text).readlines())
+
+        assert count_lines(_split(text, chunk_size), ignore_blank=False) == expected
+
+    @pytest.mark.parametrize("text", TEXTS)
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 1 << 20])
+    def test_count_lines_ignore_blank_matches_line_iteration(
+        self, text: str, chunk_size: int
+    ) -> None:
+        lines = io.StringIO(text).readlines()
+        expected = sum(1 for line in lines if line and not line.isspace())
+
+        assert count_lines(_split(text, chunk_size), ignore_blank=True) == expected
@@ -0,0 +1,34 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from blossy.countl.use_case import CountLinesUseCaseFactory
+
+TEXT = "import random\n\n  \ndef main():\n    print(random.random())\n"
+
+
+class MockFileAdapter:
+    _chunks: list[str]
+
+    def __init__(self, chunks: list[str]) -> None:
+        self._chunks = chunks
+
+    def read_text_chunks(self, path: Path, block_size: int) -> Iterator[str]:
+        assert path.is_absolute() and block_size > 0
+        yield from self._chunks
+
+
+class TestCountLinesUseCase:
+    @pytest.mark.parametrize("ignore_blank,expected", [(True, 3), (False, 5)])
+    def test_execute_counts_chunks(self, capsys, ignore_blank: bool, expected: int) -> None:
+        chunks = [TEXT[i : i + 3] for i in range(0, len(TEXT), 3)]
+        use_case = CountLinesUseCaseFactory.get_use_case(
+            MockFileAdapter(chunks), ignore_blank, True
+        )
+
+        use_case.execute(Path("one_piece.py"))
+
+        assert capsys.readouterr().out == f"Line count: {expected}\n"
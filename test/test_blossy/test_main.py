@@ -0,0 +1,99 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from blossy.main import app
+from blossy.shared import tracing
+
+
+def _script(tmp_path: Path, content: str) -> str:
+    # the test runner's stdin raises EOFError when iterated to its end, so scripts are files
+    path = tmp_path / "script.txt"
+    path.write_text(content)
+    return str(path)
+
+
+@pytest.fixture()
+def runner(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CliRunner:
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.delenv("BLOSSY_TRACE", raising=False)
+    return CliRunner()
+
+
+class TestRun:
+    def test_run_executes_lines_in_order(self, runner: CliRunner, tmp_path: Path) -> None:
+        script = 'calc "1+1"\n\n# a comment\ncalc "2*3"\ncalc 4\n'
+
+        result = runner.invoke(app, ["run", _script(tmp_path, script)])
+
+        assert result.exit_code == 0
+        assert result.stdout == "2\n6\n4\n"
+        assert result.stderr == ""
+
+    def test_run_reports_errors_with_line_numbers(self, runner: CliRunner, tmp_path: Path) -> None:
+        script = 'calc "1+"\ncalc 2\nnope\ncalc "unclosed\n'
+
+        result = runner.invoke(app, ["run", _script(tmp_path, script)])
+
+        assert result.exit_code == 1
+        assert result.stdout == "2\n"
+        errors = result.stderr.splitlines()
+        assert [error.split(":")[0] for error in errors] == ["Line 1", "Line 3", "Line 4"]
+        assert "No such command 'nope'." in errors[1]
+        assert errors[2] == "Line 4: No closing quotation."
+
+    def test_run_fail_fast_stops_at_first_error(self, runner: CliRunner, tmp_path: Path) -> None:
+        script = 'calc 1\ncalc "1+"\ncalc 3\n'
+
+        result = runner.invoke(app, ["run", "--fail-fast", _script(tmp_path, script)])
+
+        assert result.exit_code == 1
+        assert result.stdout == "1\n"
+        assert result.stderr.startswith("Line 2: ")
+
+    def test_run_rejects_nested_scripts(self, runner: CliRunner, tmp_path: Path) -> None:
+        inner = tmp_path / "inner.txt"
+        inner.write_text("calc 1\n")
+
+        result = runner.invoke(app, ["run", _script(tmp_path, f"run {inner}\ncalc 2\n")])
+
+        assert result.exit_code == 1
+        assert result.stdout == "2\n"
+        assert result.stderr == "Line 1: Scripts can't run other scripts.\n"
+
+    def test_run_keeps_a_single_trace(
+        self, runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        trace_path = tmp_path / "trace.jsonl"
+        monkeypatch.setenv("BLOSSY_TRACE", str(trace_path))
+
+        result = runner.invoke(app, ["run", _script(tmp_path, "calc 1\ncalc 2\n")])
+
+        assert result.exit_code == 0
+        assert not tracing.is_enabled()
+        events = [json.loads(line) for line in trace_path.read_text().splitlines()]
+        assert [event["name"] for event in events if event["ph"] == "X"].count("calc.lex") == 2
+
+    def test_run_keeps_a_single_profile(self, runner: CliRunner, tmp_path: Path) -> None:
+        report_path = tmp_path / "report.txt"
+
+        result = runner.invoke(
+            app,
+            [
+                "--profile",
+                "mem",
+                "--profile-output",
+                str(report_path),
+                "run",
+                _script(tmp_path, "calc 1\ncalc 2\n"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert result.stdout == "1\n2\n"
+        report = report_path.read_text()
+        assert sum(line.startswith("execute ") for line in report.splitlines()) == 1
@@ -0,0 +1,96 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import json
+from pathlib import Path
+
+import pytest
+import typer
+
+from blossy.perc import use_case as perc_use_case
+from blossy.perc.model import BatchOutputFormat
+from blossy.perc.use_case import PercentageUseCaseFactory
+
+FILE_1 = """name,whole,part
+a,100,25
+b,0,5
+c,50,x
+d,8,2
+"""
+
+
+@pytest.fixture()
+def csv_file(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(perc_use_case, "_CHUNK_SIZE", 2)
+    file = tmp_path / "input.csv"
+    file.write_text(FILE_1, encoding="utf-8")
+    return file
+
+
+class TestPercentageBatchUseCase:
+    def test_execute_solves_ratio_as_csv(self, capsys, csv_file: Path) -> None:
+        use_case = PercentageUseCaseFactory.get_batch_use_case(
+            "whole", "part", None, BatchOutputFormat.CSV
+        )
+
+        use_case.execute(csv_file)
+
+        captured = capsys.readouterr()
+        assert captured.out == (
+            "name,whole,part,ratio\na,100,25,0.25\nb,0,5,\nc,50,x,\nd,8,2,0.25\n"
+        )
+        assert captured.err == "Row 2: Result does not exist.\nRow 3: Invalid number.\n"
+
+    def test_execute_solves_part_as_jsonl(self, capsys, tmp_path: Path) -> None:
+        file = tmp_path / "input.csv"
+        file.write_text("whole,ratio\n200,0.5\n", encoding="utf-8")
+        use_case = PercentageUseCaseFactory.get_batch_use_case(
+            "whole", None, "ratio", BatchOutputFormat.JSONL
+        )
+
+        use_case.execute(file)
+
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert rows == [{"whole": "200", "ratio": "0.5", "part": 100.0}]
+
+    def test_execute_non_finite_results_are_errors(self, capsys, tmp_path: Path) -> None:
+        file = tmp_path / "input.csv"
+        file.write_text("whole,ratio\ninf,0.5\nnan,1\n1e308,10\n", encoding="utf-8")
+        use_case = PercentageUseCaseFactory.get_batch_use_case(
+            "whole", None, "ratio", BatchOutputFormat.JSONL
+        )
+
+        use_case.execute(file)
+
+        captured = capsys.readouterr()
+        rows = [json.loads(line) for line in captured.out.splitlines()]
+        assert [row["part"] for row in rows] == [None, None, None]
+        assert captured.err.count("Result does not exist.") == 3
+
+    def test_execute_solves_whole(self, capsys, tmp_path: Path) -> None:
+        file = tmp_path / "input.csv"
+        file.write_text("part,ratio\n25,0.25\n1,0\n", encoding="utf-8")
+        use_case = PercentageUseCaseFactory.get_batch_use_case(
+            None, "part", "ratio", BatchOutputFormat.CSV
+        )
+
+        use_case.execute(file)
+
+        captured = capsys.readouterr()
+        assert captured.out == "part,ratio,whole\n25,0.25,100.0\n1,0,\n"
+        assert captured.err == "Row 2: Result does not exist.\n"
+
+    def test_execute_missing_column_raises(self, csv_file: Path) -> None:
+        use_case = PercentageUseCaseFactory.get_batch_use_case(
+            "whole", None, "ratio", BatchOutputFormat.CSV
+        )
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(csv_file)
+
+    def test_execute_less_than_two_columns_raises(self, csv_file: Path) -> None:
+        use_case = PercentageUseCaseFactory.get_batch_use_case(
+            "whole", None, None, BatchOutputFormat.CSV
+        )
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(csv_file)
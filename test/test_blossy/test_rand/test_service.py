@@ -0,0 +1,116 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import io
+import random
+import struct
+
+import pytest
+
+from blossy.rand.model import OutputFormat
+from blossy.rand.service import (
+    FeistelPermutation,
+    NumberWriterFactory,
+    SeedSequence,
+    encode_chunk,
+    floyd_sample,
+    permute_chunk,
+    shuffle_sample,
+)
+
+
+class TestSeedSequence:
+    def test_generate_state_deterministic(self) -> None:
+        assert SeedSequence(42).generate_state() == SeedSequence(42).generate_state()
+
+    def test_spawn_children_are_independent(self) -> None:
+        children = SeedSequence(42).spawn(3)
+
+        states = {child.generate_state() for child in children}
+        assert len(states) == 3
+        assert SeedSequence(42).generate_state() not in states
+
+    def test_spawn_continues_numbering(self) -> None:
+        parent = SeedSequence(42)
+        first = parent.spawn(2)
+        second = parent.spawn(1)
+
+        assert [child.spawn_key for child in first + second] == [(0,), (1,), (2,)]
+
+
+class TestSampling:
+    @pytest.mark.parametrize("size,quantity", [(10, 10), (100, 7), (1, 1), (2**63 + 1, 50)])
+    def test_floyd_sample_distinct_in_range(self, size: int, quantity: int) -> None:
+        sample = floyd_sample(random.Random(1), size, quantity)
+
+        assert len(set(sample)) == quantity
+        assert all(0 <= offset < size for offset in sample)
+
+    @pytest.mark.parametrize("size,quantity", [(10, 10), (100, 70), (1, 1)])
+    def test_shuffle_sample_distinct_in_range(self, size: int, quantity: int) -> None:
+        sample = list(shuffle_sample(random.Random(1), size, quantity))
+
+        assert len(set(sample)) == quantity
+        assert all(0 <= offset < size for offset in sample)
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 17, 1000, 4096])
+    def test_feistel_permutation_is_bijection(self, size: int) -> None:
+        permutation = FeistelPermutation(size, SeedSequence(42).generate_state())
+
+        assert sorted(permutation.permute(i) for i in range(size)) == list(range(size))
+
+    def test_feistel_permutation_huge_range(self) -> None:
+        permutation = FeistelPermutation(2**130, SeedSequence(42).generate_state())
+
+        values = {permutation.permute(i) for i in range(100)}
+        assert len(values) == 100
+        assert all(0 <= value < 2**130 for value in values)
+
+    def test_permute_chunk_matches_whole_permutation(self) -> None:
+        state = SeedSequence(42).generate_state()
+
+        whole = permute_chunk(state, 10, 109, 0, 100)
+        split = permute_chunk(state, 10, 109, 0, 30) + permute_chunk(state, 10, 109, 30, 100)
+
+        assert whole == split
+        assert sorted(whole) == list(range(10, 110))
+
+
+class TestNumberWriter:
+    @pytest.mark.parametrize(
+        "output_format,expected",
+        [
+            (OutputFormat.TEXT, b"1 -2 3 4\n"),
+            (OutputFormat.CSV, b"value\n1\n-2\n3\n4\n"),
+            (
+                OutputFormat.BIN64,
+                struct.pack("<4q", 1, -2, 3, 4),
+            ),
+        ],
+    )
+    def test_write_chunks(self, output_format: OutputFormat, expected: bytes) -> None:
+        stream = io.BytesIO()
+        writer = NumberWriterFactory.get_writer(output_format, stream, 4)
+
+        writer.begin()
+        writer.write(encode_chunk(output_format, [1, -2]))
+        writer.write(encode_chunk(output_format, [3, 4]))
+        writer.end()
+
+        assert stream.getvalue() == expected
+
+    def test_write_npy_header_is_aligned(self) -> None:
+        stream = io.BytesIO()
+        writer = NumberWriterFactory.get_writer(OutputFormat.NPY, stream, 2)
+
+        writer.begin()
+        writer.write(encode_chunk(OutputFormat.NPY, [7, 8]))
+        writer.end()
+
+        content = stream.getvalue()
+        header_len = int.from_bytes(content[8:10], "little")
+        header = content[10 : 10 + header_len].decode("latin1")
+        assert content.startswith(b"\x93NUMPY\x01\x00")
+        assert (10 + header_len) % 64 == 0
+        assert "'shape': (2,)" in header
+        assert header.endswith("\n")
+        assert content[10 + header_len :] == struct.pack("<2q", 7, 8)
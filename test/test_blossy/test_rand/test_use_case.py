@@ -0,0 +1,159 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import struct
+from pathlib import Path
+
+import pytest
+import typer
+
+from blossy.rand import use_case as rand_use_case
+from blossy.rand.model import OutputFormat, SamplingAlgorithm
+from blossy.rand.use_case import RandomUseCaseFactory
+from blossy.shared.adapter import FileAdapter
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(rand_use_case, "_CHUNK_SIZE", 7)
+
+
+def _run(
+    capsys,
+    seed: int | None,
+    jobs: int,
+    quantity: int = 50,
+    output_format: OutputFormat = OutputFormat.TEXT,
+) -> str:
+    use_case = RandomUseCaseFactory.get_use_case(
+        FileAdapter(), seed, jobs, output_format=output_format
+    )
+    use_case.execute(1, 1000, quantity)
+    return capsys.readouterr().out
+
+
+class TestRandomUseCaseSeeded:
+    def test_execute_same_seed_same_output(self, capsys) -> None:
+        assert _run(capsys, seed=42, jobs=1) == _run(capsys, seed=42, jobs=1)
+
+    def test_execute_different_seeds_different_output(self, capsys) -> None:
+        assert _run(capsys, seed=42, jobs=1) != _run(capsys, seed=43, jobs=1)
+
+    def test_execute_output_independent_of_jobs(self, capsys) -> None:
+        assert _run(capsys, seed=42, jobs=1) == _run(capsys, seed=42, jobs=3)
+
+    def test_execute_csv_output_independent_of_jobs(self, capsys) -> None:
+        output = _run(capsys, seed=42, jobs=3, output_format=OutputFormat.CSV)
+
+        assert output == _run(capsys, seed=42, jobs=1, output_format=OutputFormat.CSV)
+        assert output.splitlines()[1:] == _run(capsys, seed=42, jobs=1).split()
+
+    def test_execute_output_format(self, capsys) -> None:
+        output = _run(capsys, seed=42, jobs=1, quantity=20)
+
+        assert output.endswith("\n")
+        numbers = [int(number) for number in output.split(" ")]
+        assert len(numbers) == 20
+        assert all(1 <= number <= 1000 for number in numbers)
+
+    def test_execute_invalid_range_raises(self) -> None:
+        use_case = RandomUseCaseFactory.get_use_case(FileAdapter(), seed=42)
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(10, 1, 5)
+
+    def test_execute_invalid_jobs_raises(self) -> None:
+        use_case = RandomUseCaseFactory.get_use_case(FileAdapter(), seed=42, jobs=0)
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(1, 10, 5)
+
+
+class TestRandomUseCaseUnique:
+    @pytest.mark.parametrize(
+        "algorithm",
+        [
+            SamplingAlgorithm.AUTO,
+            SamplingAlgorithm.FLOYD,
+            SamplingAlgorithm.SHUFFLE,
+            SamplingAlgorithm.FEISTEL,
+        ],
+    )
+    def test_execute_numbers_are_distinct(self, capsys, algorithm: SamplingAlgorithm) -> None:
+        use_case = RandomUseCaseFactory.get_use_case(
+            FileAdapter(), seed=42, unique=True, algorithm=algorithm
+        )
+
+        use_case.execute(1, 100, 100)
+
+        numbers = [int(number) for number in capsys.readouterr().out.split(" ")]
+        assert sorted(numbers) == list(range(1, 101))
+
+    def test_execute_feistel_output_independent_of_jobs(self, capsys) -> None:
+        outputs = []
+        for jobs in (1, 3):
+            use_case = RandomUseCaseFactory.get_use_case(
+                FileAdapter(), seed=42, jobs=jobs, unique=True, algorithm=SamplingAlgorithm.FEISTEL
+            )
+            use_case.execute(0, 2**63, 50)
+            outputs.append(capsys.readouterr().out)
+
+        assert outputs[0] == outputs[1]
+        assert len(set(outputs[0].split(" "))) == 50
+
+    def test_execute_quantity_exceeds_range_raises(self) -> None:
+        use_case = RandomUseCaseFactory.get_use_case(FileAdapter(), unique=True)
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(1, 10, 11)
+
+    def test_execute_range_too_big_to_shuffle_raises(self) -> None:
+        use_case = RandomUseCaseFactory.get_use_case(
+            FileAdapter(), unique=True, algorithm=SamplingAlgorithm.SHUFFLE
+        )
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(0, 2**63 - 2, 5)
+
+
+class TestRandomUseCaseOutput:
+    def test_execute_writes_to_file(self, capsys, tmp_path: Path) -> None:
+        output = tmp_path / "numbers.bin"
+        use_case = RandomUseCaseFactory.get_use_case(
+            FileAdapter(), seed=42, output_format=OutputFormat.BIN64, output=output
+        )
+
+        use_case.execute(1, 1000, 50)
+
+        assert not capsys.readouterr().out
+        numbers = struct.unpack("<50q", output.read_bytes())
+        assert all(1 <= number <= 1000 for number in numbers)
+
+    def test_execute_binary_matches_text(self, capsys, tmp_path: Path) -> None:
+        output = tmp_path / "numbers.bin"
+        RandomUseCaseFactory.get_use_case(FileAdapter(), seed=42).execute(1, 1000, 50)
+        RandomUseCaseFactory.get_use_case(
+            FileAdapter(), seed=42, output_format=OutputFormat.BIN64, output=output
+        ).execute(1, 1000, 50)
+
+        text_numbers = tuple(int(number) for number in capsys.readouterr().out.split(" "))
+        assert struct.unpack("<50q", output.read_bytes()) == text_numbers
+
+    @pytest.mark.parametrize("unique", [False, True])
+    def test_execute_no_numbers_writes_empty_npy(self, tmp_path: Path, unique: bool) -> None:
+        output = tmp_path / "numbers.npy"
+        use_case = RandomUseCaseFactory.get_use_case(
+            FileAdapter(), seed=42, unique=unique, output_format=OutputFormat.NPY, output=output
+        )
+
+        use_case.execute(1, 1000, 0)
+
+        content = output.read_bytes()
+        assert content.startswith(b"\x93NUMPY")
+        assert b"'shape': (0,)" in content
+        assert len(content) % 64 == 0
+
+    def test_execute_range_too_big_for_binary_raises(self) -> None:
+        use_case = RandomUseCaseFactory.get_use_case(FileAdapter(), output_format=OutputFormat.NPY)
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(0, 2**64, 5)
@@ -0,0 +1,123 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import io
+import random
+from pathlib import Path
+
+import pytest
+
+from blossy.randl import service as randl_service
+from blossy.randl.service import ExternalShuffler, ReservoirSampler
+
+
+@pytest.fixture()
+def lines() -> list[bytes]:
+    return [f"line {i}\n".encode() for i in range(1000)]
+
+
+class TestExternalShuffler:
+    @pytest.mark.parametrize("memory_budget", [1 << 20, 512, 64])
+    def test_shuffle_is_permutation(
+        self, tmp_path: Path, lines: list[bytes], memory_budget: int
+    ) -> None:
+        file = tmp_path / "input.txt"
+        file.write_bytes(b"".join(lines))
+        shuffler = ExternalShuffler(random.Random(1), memory_budget, tmp_path)
+        output = io.BytesIO()
+
+        shuffler.shuffle(file, output)
+
+        shuffled = output.getvalue().splitlines(keepends=True)
+        assert shuffled != lines
+        assert sorted(shuffled) == sorted(lines)
+        assert [path.name for path in tmp_path.iterdir()] == ["input.txt"]
+
+    def test_shuffle_caps_buckets(self, monkeypatch, tmp_path: Path, lines: list[bytes]) -> None:
+        file = tmp_path / "input.txt"
+        file.write_bytes(b"".join(lines))
+        monkeypatch.setattr(randl_service, "_MAX_BUCKETS", 3)
+        qts_buckets: list[int] = []
+        scatter = ExternalShuffler._scatter  # pylint: disable=protected-access
+
+        def spy(
+            shuffler: ExternalShuffler, source: Path, buckets: list[Path]
+        ) -> list[tuple[int, int]]:
+            qts_buckets.append(len(buckets))
+            return scatter(shuffler, source, buckets)
+
+        monkeypatch.setattr(ExternalShuffler, "_scatter", spy)
+        output = io.BytesIO()
+
+        ExternalShuffler(random.Random(1), 512, tmp_path).shuffle(file, output)
+
+        assert max(qts_buckets) == 3
+        assert len(qts_buckets) > 1
+        assert sorted(output.getvalue().splitlines(keepends=True)) == sorted(lines)
+
+    def test_shuffle_counts_line_overhead(
+        self, monkeypatch, tmp_path: Path, lines: list[bytes]
+    ) -> None:
+        file = tmp_path / "input.txt"
+        file.write_bytes(b"".join(lines))
+        qts_buckets: list[int] = []
+        scatter = ExternalShuffler._scatter  # pylint: disable=protected-access
+
+        def spy(
+            shuffler: ExternalShuffler, source: Path, buckets: list[Path]
+        ) -> list[tuple[int, int]]:
+            qts_buckets.append(len(buckets))
+            return scatter(shuffler, source, buckets)
+
+        monkeypatch.setattr(ExternalShuffler, "_scatter", spy)
+        output = io.BytesIO()
+
+        # the file's bytes fit, but not once every short line is an object of its own
+        budget = 2 * file.stat().st_size
+        ExternalShuffler(random.Random(1), budget, tmp_path).shuffle(file, output)
+
+        assert qts_buckets[0] > 2
+        assert sorted(output.getvalue().splitlines(keepends=True)) == sorted(lines)
+
+    def test_shuffle_terminates_last_line(self, tmp_path: Path) -> None:
+        file = tmp_path / "input.txt"
+        file.write_bytes(b"a\nb\nc")
+        output = io.BytesIO()
+
+        ExternalShuffler(random.Random(1), 1, tmp_path).shuffle(file, output)
+
+        assert sorted(output.getvalue().splitlines(keepends=True)) == [b"a\n", b"b\n", b"c\n"]
+
+    def test_shuffle_same_seed_same_output(self, tmp_path: Path, lines: list[bytes]) -> None:
+        file = tmp_path / "input.txt"
+        file.write_bytes(b"".join(lines))
+        outputs = [io.BytesIO(), io.BytesIO()]
+
+        for output in outputs:
+            ExternalShuffler(random.Random(1), 512, tmp_path).shuffle(file, output)
+
+        assert outputs[0].getvalue() == outputs[1].getvalue()
+
+
+class TestReservoirSampler:
+    def test_sample_distinct_lines(self, lines: list[bytes]) -> None:
+        sample = ReservoirSampler(random.Random(1)).sample(lines, 10)
+
+        assert len(set(sample)) == 10
+        assert set(sample) <= set(lines)
+
+    def test_sample_more_than_available(self) -> None:
+        sample = ReservoirSampler(random.Random(1)).sample([b"a\n", b"b"], 5)
+
+        assert sorted(sample) == [b"a\n", b"b\n"]
+
+    def test_sample_is_uniform(self) -> None:
+        rng = random.Random(1)
+        population = [f"{i}\n".encode() for i in range(10)]
+        counts = dict.fromkeys(population, 0)
+
+        for _ in range(2000):
+            for line in ReservoirSampler(rng).sample(population, 3):
+                counts[line] += 1
+
+        # every line is expected 600 times
+        assert all(450 < count < 750 for count in counts.values())
@@ -0,0 +1,72 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+from pathlib import Path
+
+import pytest
+import typer
+
+from blossy.randl.use_case import RandomLinesUseCaseFactory
+from blossy.shared.adapter import FileAdapter
+
+
+@pytest.fixture()
+def file(tmp_path: Path) -> Path:
+    file = tmp_path / "input.txt"
+    file.write_text("".join(f"line {i}\n" for i in range(200)), encoding="utf-8")
+    return file
+
+
+class TestRandomLinesUseCaseShuffle:
+    def test_execute_writes_permutation_to_file(self, tmp_path: Path, file: Path) -> None:
+        output = tmp_path / "output.txt"
+        use_case = RandomLinesUseCaseFactory.get_use_case(
+            FileAdapter(), seed=42, memory_budget=256, temp_dir=tmp_path, output=output
+        )
+
+        use_case.execute(file)
+
+        shuffled = output.read_text(encoding="utf-8").splitlines()
+        original = file.read_text(encoding="utf-8").splitlines()
+        assert shuffled != original
+        assert sorted(shuffled) == sorted(original)
+
+    def test_execute_same_seed_same_output(self, capsys, file: Path) -> None:
+        outputs = []
+        for _ in range(2):
+            RandomLinesUseCaseFactory.get_use_case(FileAdapter(), seed=42).execute(file)
+            outputs.append(capsys.readouterr().out)
+
+        assert outputs[0] == outputs[1]
+
+    def test_execute_missing_file_raises(self, tmp_path: Path) -> None:
+        use_case = RandomLinesUseCaseFactory.get_use_case(FileAdapter())
+
+        with pytest.raises(FileNotFoundError):
+            use_case.execute(tmp_path / "missing.txt")
+
+    def test_execute_directory_raises(self, tmp_path: Path) -> None:
+        use_case = RandomLinesUseCaseFactory.get_use_case(FileAdapter())
+
+        with pytest.raises(IsADirectoryError):
+            use_case.execute(tmp_path)
+
+    def test_execute_non_positive_memory_raises(self, file: Path) -> None:
+        use_case = RandomLinesUseCaseFactory.get_use_case(FileAdapter(), memory_budget=0)
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(file)
+
+
+class TestRandomLinesUseCaseSample:
+    def test_execute_prints_distinct_lines(self, capsys, file: Path) -> None:
+        RandomLinesUseCaseFactory.get_use_case(FileAdapter(), seed=42, sample=5).execute(file)
+
+        sample = capsys.readouterr().out.splitlines()
+        assert len(set(sample)) == 5
+        assert set(sample) <= set(file.read_text(encoding="utf-8").splitlines())
+
+    def test_execute_negative_sample_raises(self, file: Path) -> None:
+        use_case = RandomLinesUseCaseFactory.get_use_case(FileAdapter(), sample=-1)
+
+        with pytest.raises(typer.BadParameter):
+            use_case.execute(file)
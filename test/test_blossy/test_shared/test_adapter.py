@@ -0,0 +1,213 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from blossy.shared.adapter import FileAdapter, SubprocessAdapter
+
+
+@pytest.fixture()
+def file_adapter() -> FileAdapter:
+    return FileAdapter()
+
+
+class TestReadChunks:
+    def test_read_chunks_yields_blocks(self, file_adapter: FileAdapter, tmp_path: Path) -> None:
+        file = tmp_path / "file.bin"
+        file.write_bytes(b"abcdefg")
+
+        assert list(file_adapter.read_chunks(file, 3)) == [b"abc", b"def", b"g"]
+
+    @pytest.mark.parametrize("block_size", [1, 2, 3, 1 << 20])
+    def test_read_text_chunks_matches_text_mode(
+        self, file_adapter: FileAdapter, tmp_path: Path, block_size: int
+    ) -> None:
+        file = tmp_path / "file.txt"
+        file.write_bytes("héllo\r\nwörld\r日本\n".encode())
+
+        text = "".join(file_adapter.read_text_chunks(file, block_size))
+
+        assert text == file.read_text(encoding="utf-8")
+
+    def test_read_text_chunks_missing_file_raises(
+        self, file_adapter: FileAdapter, tmp_path: Path
+    ) -> None:
+        with pytest.raises(FileNotFoundError):
+            list(file_adapter.read_text_chunks(tmp_path / "missing.txt", 16))
+
+
+class TestMapView:
+    def test_map_view_exposes_content(self, file_adapter: FileAdapter, tmp_path: Path) -> None:
+        file = tmp_path / "file.bin"
+        file.write_bytes(b"abcdefg")
+
+        with file_adapter.map_view(file) as view:
+            assert view[2:5].tobytes() == b"cde"
+            assert len(view) == 7
+
+    def test_map_view_empty_file(self, file_adapter: FileAdapter, tmp_path: Path) -> None:
+        file = tmp_path / "file.bin"
+        file.touch()
+
+        with file_adapter.map_view(file) as view:
+            assert len(view) == 0
+
+
+class TestWriters:
+    def test_open_writer_writes_on_close(self, file_adapter: FileAdapter, tmp_path: Path) -> None:
+        file = tmp_path / "file.bin"
+
+        with file_adapter.open_writer(file, 1 << 16) as stream:
+            stream.write(b"abc")
+            stream.write(b"def")
+
+        assert file.read_bytes() == b"abcdef"
+
+    def test_write_text_replaces_file(self, file_adapter: FileAdapter, tmp_path: Path) -> None:
+        file = tmp_path / "file.txt"
+        file.write_text("old")
+
+        file_adapter.write_text(file, "new")
+
+        assert file.read_text() == "new"
+        assert [path.name for path in tmp_path.iterdir()] == ["file.txt"]
+
+
+@pytest.fixture()
+def subprocess_adapter() -> Iterator[SubprocessAdapter]:
+    adapter = SubprocessAdapter(max_workers=2, timeout=5)
+    yield adapter
+    adapter.shutdown()
+
+
+class TestSubprocessCapture:
+    def test_capture_merges_output_and_streams_lines(
+        self, subprocess_adapter: SubprocessAdapter
+    ) -> None:
+        lines: list[str] = []
+
+        result = subprocess_adapter.capture(
+            sys.executable,
+            "-c",
+            "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)",
+            on_output=lines.append,
+        )
+
+        assert result.returncode == 3
+        assert sorted(result.output.splitlines()) == ["err", "out"]
+        assert "".join(lines) == result.output
+        assert not result.timed_out
+
+    def test_capture_reports_cpu_time(self, subprocess_adapter: SubprocessAdapter) -> None:
+        result = subprocess_adapter.capture(sys.executable, "-c", "sum(range(3_000_000))")
+
+        assert result.returncode == 0
+        assert 0 < result.cpu_secs <= result.elapsed_secs + 0.1
+
+    def test_capture_kills_on_timeout(self) -> None:
+        adapter = SubprocessAdapter(timeout=0.2)
+
+        result = adapter.capture(sys.executable, "-c", "import time; time.sleep(30)")
+
+        assert result.timed_out
+        assert result.returncode != 0
+        assert result.elapsed_secs < 10
+
+    def test_capture_kills_grandchildren_on_timeout(self) -> None:
+        adapter = SubprocessAdapter(timeout=0.5)
+
+        # the sleep inherits the output, so killing only the shell would leave it open
+        result = adapter.capture("sh", "-c", "sleep 30; echo done")
+
+        assert result.timed_out
+        assert result.elapsed_secs < 10
+
+    def test_capture_stops_timer_before_returning(self) -> None:
+        adapter = SubprocessAdapter(timeout=30)
+
+        result = adapter.capture(sys.executable, "-c", "pass")
+
+        assert not result.timed_out
+        assert not any(isinstance(thread, threading.Timer) for thread in threading.enumerate())
+
+    def test_run_raises_on_failure(self, subprocess_adapter: SubprocessAdapter) -> None:
+        with pytest.raises(subprocess.CalledProcessError):
+            subprocess_adapter.run(sys.executable, "-c", "raise SystemExit(1)")
+
+
+class TestSubprocessPool:
+    def test_submit_runs_concurrently(self, subprocess_adapter: SubprocessAdapter) -> None:
+        start = time.perf_counter()
+        futures = [
+            subprocess_adapter.submit(
+                subprocess_adapter.capture, sys.executable, "-c", "import time; time.sleep(0.5)"
+            )
+            for _ in range(2)
+        ]
+
+        results = [future.result() for future in futures]
+
+        assert all(result.returncode == 0 for result in results)
+        assert time.perf_counter() - start < 2 * min(result.elapsed_secs for result in results)
+
+    def test_submit_is_bounded(self) -> None:
+        adapter = SubprocessAdapter(max_workers=1)
+        running: list[int] = []
+        peak: list[int] = []
+        lock = threading.Lock()
+
+        def task() -> None:
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        for future in [adapter.submit(task) for _ in range(4)]:
+            future.result()
+        adapter.shutdown()
+
+        assert max(peak) == 1
+
+    def test_capture_async_kills_when_cancelled(
+        self, subprocess_adapter: SubprocessAdapter
+    ) -> None:
+        async def cancel_capture() -> None:
+            task = asyncio.create_task(
+                subprocess_adapter.capture_async(
+                    sys.executable, "-c", "import time; time.sleep(30)"
+                )
+            )
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        start = time.perf_counter()
+        asyncio.run(cancel_capture())
+        subprocess_adapter.shutdown()
+
+        # without the kill, the pool would only be released by the 5 seconds timeout
+        assert time.perf_counter() - start < 3
+
+    def test_cancel_kills_running_and_drops_pending(self) -> None:
+        adapter = SubprocessAdapter(max_workers=1)
+        running = adapter.submit(adapter.capture, "sh", "-c", "sleep 30; echo done")
+        pending = adapter.submit(adapter.capture, "sh", "-c", "echo never")
+        time.sleep(0.2)
+
+        start = time.perf_counter()
+        adapter.cancel()
+
+        assert running.result().returncode != 0
+        assert pending.cancelled()
+        assert time.perf_counter() - start < 3
+        adapter.shutdown()
@@ -1,9 +1,12 @@
 # pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
 
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
 
+from blossy.shared.error import ConfigError
 from blossy.shared.model import TomlValue
 from blossy.shared.repository import ConfigRepository
 
@@ -22,26 +25,37 @@ github-user = "monkeydluffy"
 
 
 class MockFileAdapter:
-    create_if_not_exists_calls: list[Path]
+    stat_calls: list[Path]
     read_text_calls: list[Path]
     write_text_calls: list[tuple[Path, str]]
+    write_bytes_calls: list[Path]
+    lock_calls: list[Path]
 
+    stat_output: tuple[int, int] | None
     _read_text_outputs: list[str]
+    _bytes_content: bytes | None
+    _lock_timed_out: bool
 
     def __init__(
         self,
-        create_if_not_exists_calls: list[Path],
+        stat_calls: list[Path],
         read_text_calls: list[Path],
         write_text_calls: list[tuple[Path, str]],
     ) -> None:
-        self.create_if_not_exists_calls = create_if_not_exists_calls
+        self.stat_calls = stat_calls
         self.read_text_calls = read_text_calls
         self.write_text_calls = write_text_calls
+        self.write_bytes_calls = []
+        self.lock_calls = []
 
+        self.stat_output = (1, 1)
         self._read_text_outputs = []
+        self._bytes_content = None
+        self._lock_timed_out = False
 
-    def create_if_not_exists(self, path: Path) -> None:
-        self.create_if_not_exists_calls.append(path)
+    def stat(self, path: Path) -> tuple[int, int] | None:
+        self.stat_calls.append(path)
+        return self.stat_output
 
     def read_text(self, path: Path) -> str:
         self.read_text_calls.append(path)
@@ -50,11 +64,27 @@ class MockFileAdapter:
     def write_text(self, path: Path, content: str) -> None:
         self.write_text_calls.append((path, content))
 
+    def read_bytes(self, path: Path) -> bytes:
+        if self._bytes_content is None:
+            raise FileNotFoundError(path)
+        return self._bytes_content
+
+    def write_bytes(self, path: Path, content: bytes) -> None:
+        self.write_bytes_calls.append(path)
+        self._bytes_content = content
+
+    @contextmanager
+    def lock(self, path: Path, timeout: float) -> Iterator[None]:
+        self.lock_calls.append(path)
+        if self._lock_timed_out:
+            raise TimeoutError(f"{path} {timeout}")
+        yield
+
 
 @pytest.fixture()
 def file_adapter() -> MockFileAdapter:
     return MockFileAdapter(
-        create_if_not_exists_calls=[],
+        stat_calls=[],
         read_text_calls=[],
         write_text_calls=[],
     )
@@ -119,6 +149,146 @@ class TestGetProperty:
         assert len(file_adapter.read_text_calls) == 1
 
 
+class TestGetSection:
+    def test_get_section_existing_subcommand(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_2])
+
+        result = repository.get_section("clone")
+
+        assert result == {"github-user": "ravensakurai", "new-key": "value"}
+
+    def test_get_section_missing_subcommand(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_1])
+
+        result = repository.get_section("invalid")
+
+        assert not result
+
+
+class TestConfigCache:
+    def test_unchanged_file_is_parsed_once(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_1])
+
+        repository.get_property("clone", "github-user")
+        repository.get_section("clone")
+        result = repository.get_property("clone", "github-user")
+
+        assert result == "ravensakurai"
+        assert len(file_adapter.read_text_calls) == 1
+        assert len(file_adapter.stat_calls) == 3
+
+    def test_changed_file_is_read_again(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_1, FILE_3])
+
+        repository.get_property("clone", "github-user")
+        file_adapter.stat_output = (2, 1)
+        result = repository.get_property("clone", "github-user")
+
+        assert result == "monkeydluffy"
+        assert len(file_adapter.read_text_calls) == 2
+
+    def test_parsed_file_is_reused_from_cache_file(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_1])
+        repository.get_property("clone", "github-user")
+
+        result = ConfigRepository(file_adapter).get_property("clone", "github-user")
+
+        assert result == "ravensakurai"
+        assert len(file_adapter.read_text_calls) == 1
+        assert len(file_adapter.write_bytes_calls) == 1
+
+    def test_stale_cache_file_is_ignored(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_1, FILE_3])
+        repository.get_property("clone", "github-user")
+        file_adapter.stat_output = (2, 1)
+
+        result = ConfigRepository(file_adapter).get_property("clone", "github-user")
+
+        assert result == "monkeydluffy"
+        assert len(file_adapter.read_text_calls) == 2
+
+    @pytest.mark.parametrize(
+        "content",
+        [b"\xff\xfe", b"{", b"[]", b'{"signature": [1, 1], "document": []}'],
+    )
+    def test_corrupt_cache_file_is_rebuilt(
+        self,
+        monkeypatch,
+        repository: ConfigRepository,
+        file_adapter: MockFileAdapter,
+        content: bytes,
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_1])
+        monkeypatch.setattr(file_adapter, "_bytes_content", content)
+
+        result = repository.get_property("clone", "github-user")
+
+        assert result == "ravensakurai"
+        assert len(file_adapter.read_text_calls) == 1
+        assert len(file_adapter.write_bytes_calls) == 1
+
+    def test_file_with_dates_is_not_cached(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", ["[clone]\nsince = 2024-01-01\n"])
+
+        result = repository.get_property("clone", "since")
+
+        assert str(result) == "2024-01-01"
+        assert not file_adapter.write_bytes_calls
+
+    def test_section_flattens_dotted_keys(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        content = '[clone]\nbig.depth = 3\n"flat.depth" = 1\n\n[clone.small]\nfilter = "tree:0"\n'
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [content])
+
+        result = repository.get_section("clone")
+
+        assert result == {"big.depth": 3, "flat.depth": 1, "small.filter": "tree:0"}
+
+    def test_invalid_file_raises(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", ["[clone"])
+
+        with pytest.raises(ConfigError):
+            repository.get_property("clone", "github-user")
+
+    def test_missing_file_is_empty(
+        self, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        file_adapter.stat_output = None
+
+        result = repository.get_property("clone", "github-user")
+
+        assert result is None
+        assert not file_adapter.read_text_calls
+
+    def test_written_file_is_not_read_again(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_1])
+
+        repository.set_property("clone", "github-user", "monkeydluffy")
+        result = repository.get_property("clone", "github-user")
+
+        assert result == "monkeydluffy"
+        assert len(file_adapter.read_text_calls) == 1
+
+
 class TestSetProperty:
     def test_set_property_new_subcommand_and_key(
         self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
@@ -192,3 +362,29 @@ class TestSetProperty:
         assert len(file_adapter.write_text_calls) == 1
         _, written_content = file_adapter.write_text_calls[0]
         assert f"test_key = {expected_repr}" in written_content
+
+
+class TestSetProperties:
+    def test_set_properties_writes_once_under_lock(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_read_text_outputs", [FILE_1])
+
+        repository.set_properties(
+            {"clone": {"github-user": "monkeydluffy", "depth": 1}, "countl": {"chunk-size": 4}}
+        )
+
+        assert len(file_adapter.lock_calls) == 1
+        assert len(file_adapter.write_text_calls) == 1
+        _, written_content = file_adapter.write_text_calls[0]
+        assert written_content == FILE_3 + "depth = 1\n\n[countl]\nchunk-size = 4\n"
+
+    def test_set_properties_lock_timeout_raises(
+        self, monkeypatch, repository: ConfigRepository, file_adapter: MockFileAdapter
+    ) -> None:
+        monkeypatch.setattr(file_adapter, "_lock_timed_out", True)
+
+        with pytest.raises(ConfigError):
+            repository.set_properties({"clone": {"github-user": "monkeydluffy"}})
+
+        assert not file_adapter.write_text_calls
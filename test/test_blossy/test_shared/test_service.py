@@ -0,0 +1,44 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import time
+import tracemalloc
+
+from blossy.shared.model import ProfilingMode
+from blossy.shared.service import Profiler
+
+
+def _profile(mode: ProfilingMode) -> str:
+    started_at = time.perf_counter()
+    profiler = Profiler(mode, started_at, started_at)
+    profiler.start()
+    profiler.mark("construction")
+    profiler.mark("execute")
+    kept = [bytearray(1 << 20)]
+    report = profiler.stop()
+    del kept
+    return report
+
+
+class TestProfiler:
+    def test_stop_reports_every_phase(self) -> None:
+        report = _profile(ProfilingMode.BOTH)
+
+        phases = [line.split()[0] for line in report.splitlines()[1:6]]
+        assert phases == ["import", "parsing", "construction", "execute", "total"]
+
+    def test_stop_reports_peak_memory_of_phase(self) -> None:
+        report = _profile(ProfilingMode.MEM)
+
+        lines = report.splitlines()
+        assert lines[1].endswith("  -")
+        assert float(lines[4].split()[-2]) >= 1.0
+        assert "Largest allocations" in report
+        assert "function calls" not in report
+        assert not tracemalloc.is_tracing()
+
+    def test_stop_reports_hot_functions(self) -> None:
+        report = _profile(ProfilingMode.CPU)
+
+        assert "Ordered by: internal time" in report
+        assert "Largest allocations" not in report
+        assert report.splitlines()[4].endswith("  -")
@@ -0,0 +1,86 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from blossy.shared import tracing
+
+
+def _export(path: Path) -> list[dict[str, Any]]:
+    tracing.export(path)
+    if path.suffix == ".jsonl":
+        return [json.loads(line) for line in path.read_text().splitlines()]
+    return json.loads(path.read_text())["traceEvents"]
+
+
+@pytest.fixture()
+def trace_path(tmp_path: Path) -> Iterator[Path]:
+    tracing.enable()
+    yield tmp_path / "trace.json"
+    if tracing.is_enabled():
+        tracing.export(tmp_path / "leftover.json")
+
+
+class TestTracingDisabled:
+    def test_span_records_nothing(self, tmp_path: Path) -> None:
+        with tracing.span("outer"):
+            tracing.counter("items", done=1)
+
+        assert not tracing.is_enabled()
+        assert not _export(tmp_path / "trace.json")
+
+    def test_traced_returns_items_unchanged(self) -> None:
+        items = [1, 2, 3]
+
+        assert tracing.traced("item", items) is items
+
+
+class TestTracingEnabled:
+    def test_spans_nest(self, trace_path: Path) -> None:
+        with tracing.span("outer", file="a.txt"):
+            with tracing.span("inner"):
+                pass
+
+        inner, outer = _export(trace_path)
+        assert (inner["name"], outer["name"]) == ("inner", "outer")
+        assert outer["ph"] == inner["ph"] == "X"
+        assert outer["args"] == {"file": "a.txt"}
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+    def test_counter_records_values(self, trace_path: Path) -> None:
+        tracing.counter("items", done=3, failed=1)
+
+        (event,) = _export(trace_path)
+        assert event["ph"] == "C"
+        assert event["args"] == {"done": 3, "failed": 1}
+
+    def test_traced_records_span_per_item(self, trace_path: Path) -> None:
+        assert list(tracing.traced("item", "abc")) == ["a", "b", "c"]
+
+        events = _export(trace_path)
+        assert [event["args"]["index"] for event in events] == [0, 1, 2]
+
+    def test_capture_keeps_events_apart(self, trace_path: Path) -> None:
+        with tracing.span("before"):
+            pass
+        with tracing.capture(True) as events:
+            with tracing.span("worker"):
+                pass
+        tracing.record(events)
+
+        assert [event["name"] for event in events] == ["worker"]
+        assert [event["name"] for event in _export(trace_path)] == ["before", "worker"]
+
+    def test_export_jsonl(self, trace_path: Path) -> None:
+        with tracing.span("outer"):
+            pass
+
+        events = _export(trace_path.with_suffix(".jsonl"))
+
+        assert [event["name"] for event in events] == ["outer"]
+        assert not tracing.is_enabled()
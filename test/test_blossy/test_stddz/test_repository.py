@@ -0,0 +1,76 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+from pathlib import Path
+
+import pytest
+
+from blossy.stddz.model import JournalKind, Rename, RenamePlan
+from blossy.stddz.repository import RenameJournal
+
+_PLAN = RenamePlan(
+    Path("/photos"),
+    ((Rename("b", "c"), Rename("a", "b")), (Rename("x", "y"),)),
+    2,
+)
+
+
+@pytest.fixture()
+def journal(tmp_path: Path) -> RenameJournal:
+    return RenameJournal(tmp_path)
+
+
+class TestRenameJournal:
+    def test_load_without_journal(self, journal: RenameJournal) -> None:
+        assert journal.load(_PLAN.directory) is None
+
+    def test_load_round_trip(self, journal: RenameJournal) -> None:
+        journal.begin(JournalKind.RUN, _PLAN)
+        journal.record(Rename("b", "c"))
+        journal.end(complete=False)
+
+        state = journal.load(_PLAN.directory)
+
+        assert state is not None
+        assert state.kind == JournalKind.RUN
+        assert state.plan == _PLAN
+        assert state.done == (Rename("b", "c"),)
+        assert not state.complete
+        assert state.pending_plan.chains == ((Rename("a", "b"),), (Rename("x", "y"),))
+
+    def test_load_complete(self, journal: RenameJournal) -> None:
+        journal.begin(JournalKind.RUN, _PLAN)
+        journal.end(complete=True)
+
+        state = journal.load(_PLAN.directory)
+
+        assert state is not None
+        assert state.complete
+
+    def test_load_ignores_half_written_record(self, journal: RenameJournal, tmp_path: Path) -> None:
+        journal.begin(JournalKind.RUN, _PLAN)
+        journal.record(Rename("b", "c"))
+        journal.end(complete=False)
+        (path,) = tmp_path.iterdir()
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('{"done": ["a", ')
+
+        journal.resume(_PLAN.directory)
+        journal.record(Rename("a", "b"))
+        journal.end(complete=False)
+        state = journal.load(_PLAN.directory)
+
+        assert state is not None
+        assert state.done == (Rename("b", "c"), Rename("a", "b"))
+
+    def test_begin_replaces_previous_journal(self, journal: RenameJournal) -> None:
+        journal.begin(JournalKind.RUN, _PLAN)
+        journal.record(Rename("b", "c"))
+        journal.end(complete=True)
+
+        journal.begin(JournalKind.UNDO, _PLAN)
+        journal.end(complete=False)
+        state = journal.load(_PLAN.directory)
+
+        assert state is not None
+        assert state.kind == JournalKind.UNDO
+        assert not state.done
@@ -0,0 +1,235 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+import os
+from pathlib import Path
+
+import pytest
+
+from blossy.stddz.model import DedupMode, DuplicateGroup, Rename, RenamePlan, SortKey
+from blossy.stddz.service import Deduplicator, DirectoryScanner, RenameExecutor, RenamePlanner
+
+
+@pytest.fixture()
+def planner() -> RenamePlanner:
+    return RenamePlanner()
+
+
+@pytest.fixture()
+def scanner() -> DirectoryScanner:
+    return DirectoryScanner()
+
+
+def _simulate(plan: RenamePlan, names: set[str]) -> set[str]:
+    names = set(names)
+    for chain in plan.chains:
+        for step in chain:
+            assert step.source in names
+            assert step.target not in names
+            names.remove(step.source)
+            names.add(step.target)
+    return names
+
+
+class TestRenamePlanner:
+    def test_plan_skips_files_in_place(self, planner: RenamePlanner) -> None:
+        plan = planner.plan(Path("."), {"a-000.png": "a-000.png", "cat.png": "a-001.png"})
+
+        assert plan.chains == ((Rename("cat.png", "a-001.png"),),)
+        assert plan.qt_skipped == 1
+
+    def test_plan_orders_chain_back_to_front(self, planner: RenamePlanner) -> None:
+        targets = {"x": "y", "y": "z", "z": "w"}
+
+        plan = planner.plan(Path("."), targets)
+
+        assert plan.chains == ((Rename("z", "w"), Rename("y", "z"), Rename("x", "y")),)
+        assert _simulate(plan, set(targets)) == {"y", "z", "w"}
+
+    def test_plan_breaks_cycle_with_single_temp_name(self, planner: RenamePlanner) -> None:
+        targets = {"a": "b", "b": "c", "c": "a"}
+
+        plan = planner.plan(Path("."), targets)
+
+        assert plan.qt_renames == 4
+        (chain,) = plan.chains
+        assert chain[0].source == "a"
+        assert chain[-1].target == "b"
+        assert _simulate(plan, set(targets)) == {"a", "b", "c"}
+
+    def test_plan_swap(self, planner: RenamePlanner) -> None:
+        targets = {"a": "b", "b": "a", "c": "c"}
+
+        plan = planner.plan(Path("."), targets)
+
+        assert plan.qt_renames == 3
+        assert plan.qt_skipped == 1
+        assert _simulate(plan, set(targets)) == {"a", "b", "c"}
+
+    def test_plan_mixed_chains_and_cycles(self, planner: RenamePlanner) -> None:
+        targets = {"a": "b", "b": "a", "c": "d", "d": "e", "f": "g", "h": "h"}
+
+        plan = planner.plan(Path("."), targets)
+
+        assert plan.qt_renames == 3 + 2 + 1
+        assert _simulate(plan, set(targets)) == {"a", "b", "d", "e", "g", "h"}
+
+
+class TestDirectoryScanner:
+    @pytest.fixture()
+    def directory(self, tmp_path: Path) -> Path:
+        # (name, size, mtime)
+        for name, size, mtime in (
+            ("img10.png", 3, 300),
+            ("IMG2.png", 1, 100),
+            ("img1.png", 2, 200),
+        ):
+            file = tmp_path / name
+            file.write_bytes(b"x" * size)
+            os.utime(file, (mtime, mtime))
+        (tmp_path / "img0.dir").mkdir()
+        return tmp_path
+
+    @pytest.mark.parametrize(
+        "sort_key,expected",
+        [
+            (SortKey.NAME, ["IMG2.png", "img1.png", "img10.png"]),
+            (SortKey.NATURAL, ["img1.png", "IMG2.png", "img10.png"]),
+            (SortKey.MTIME, ["IMG2.png", "img1.png", "img10.png"]),
+            (SortKey.SIZE, ["IMG2.png", "img1.png", "img10.png"]),
+        ],
+    )
+    def test_scan_sorts_files(
+        self, scanner: DirectoryScanner, directory: Path, sort_key: SortKey, expected: list[str]
+    ) -> None:
+        files = scanner.scan(directory, sort_key)
+
+        assert [file.name for file in files] == expected
+
+    def test_scan_unsorted_skips_directories(
+        self, scanner: DirectoryScanner, directory: Path
+    ) -> None:
+        files = scanner.scan(directory, SortKey.NONE)
+
+        assert sorted(file.name for file in files) == ["IMG2.png", "img1.png", "img10.png"]
+        assert all(file.size is None for file in files)
+
+    def test_scan_collects_stat_when_needed(
+        self, scanner: DirectoryScanner, directory: Path
+    ) -> None:
+        files = scanner.scan(directory, SortKey.SIZE)
+
+        assert [(file.size, file.mtime_ns) for file in files] == [
+            (1, 100 * 10**9),
+            (2, 200 * 10**9),
+            (3, 300 * 10**9),
+        ]
+
+    def test_scan_tree_lists_every_directory(
+        self, scanner: DirectoryScanner, directory: Path
+    ) -> None:
+        (directory / "img0.dir" / "inner").mkdir()
+        (directory / "img0.dir" / "b.png").write_bytes(b"")
+
+        tree = scanner.scan_tree(directory, SortKey.NAME)
+
+        assert [(path, [file.name for file in files]) for path, files in tree] == [
+            (directory, ["IMG2.png", "img1.png", "img10.png"]),
+            (directory / "img0.dir", ["b.png"]),
+            (directory / "img0.dir" / "inner", []),
+        ]
+
+
+class TestDeduplicator:
+    @pytest.fixture()
+    def directory(self, tmp_path: Path) -> Path:
+        big = os.urandom(1 << 17)
+        for name, content in (
+            ("a.bin", b"same"),
+            ("b.bin", b"diff"),
+            ("c.bin", b"same"),
+            ("d.bin", big),
+            ("e.bin", big[:-1] + bytes([big[-1] ^ 1])),
+            ("f.bin", big),
+            ("g.bin", b"unique size"),
+        ):
+            (tmp_path / name).write_bytes(content)
+        return tmp_path
+
+    @pytest.mark.parametrize("jobs", [1, 4])
+    def test_find_groups_same_content(
+        self, scanner: DirectoryScanner, directory: Path, jobs: int
+    ) -> None:
+        files = scanner.scan(directory, SortKey.NAME, with_stat=True)
+
+        groups = Deduplicator(DedupMode.REPORT, jobs).find(directory, files)
+
+        assert groups == [
+            DuplicateGroup("a.bin", ("c.bin",), 4),
+            DuplicateGroup("d.bin", ("f.bin",), 1 << 17),
+        ]
+
+    def test_collapse_hardlink(self, scanner: DirectoryScanner, directory: Path) -> None:
+        deduplicator = Deduplicator(DedupMode.HARDLINK)
+        groups = deduplicator.find(directory, scanner.scan(directory, SortKey.NAME, with_stat=True))
+
+        deduplicator.collapse(directory, groups)
+
+        assert (directory / "a.bin").samefile(directory / "c.bin")
+        assert (directory / "d.bin").samefile(directory / "f.bin")
+        assert not (directory / "d.bin").samefile(directory / "e.bin")
+        assert len(list(directory.iterdir())) == 7
+
+    def test_find_skips_existing_links(self, scanner: DirectoryScanner, directory: Path) -> None:
+        os.link(directory / "a.bin", directory / "h.bin")
+        deduplicator = Deduplicator(DedupMode.HARDLINK)
+        files = scanner.scan(directory, SortKey.NAME, with_stat=True)
+
+        groups = deduplicator.find(directory, files)
+
+        assert deduplicator.find_links(files) == [DuplicateGroup("a.bin", ("h.bin",), 0)]
+        assert DuplicateGroup("a.bin", ("c.bin",), 4) in groups
+        assert all("h.bin" not in group.duplicates for group in groups)
+
+    def test_collapse_skips_existing_links(self, directory: Path) -> None:
+        os.link(directory / "a.bin", directory / "h.bin")
+
+        Deduplicator(DedupMode.HARDLINK).collapse(
+            directory, [DuplicateGroup("a.bin", ("h.bin",), 4)]
+        )
+
+        assert sorted(path.name for path in directory.iterdir())[-1] == "h.bin"
+        assert len(list(directory.iterdir())) == 8
+
+    def test_collapse_delete(self, scanner: DirectoryScanner, directory: Path) -> None:
+        deduplicator = Deduplicator(DedupMode.DELETE)
+        groups = deduplicator.find(directory, scanner.scan(directory, SortKey.NAME, with_stat=True))
+
+        deduplicator.collapse(directory, groups)
+
+        assert sorted(path.name for path in directory.iterdir()) == [
+            "a.bin",
+            "b.bin",
+            "d.bin",
+            "e.bin",
+            "g.bin",
+        ]
+
+
+class TestRenameExecutor:
+    @pytest.mark.parametrize("jobs", [1, 4])
+    def test_execute_runs_plan(self, tmp_path: Path, planner: RenamePlanner, jobs: int) -> None:
+        targets = {f"{i}.txt": f"{(i + 1) % 10}.txt" for i in range(10)}
+        targets.update({f"extra-{i}": f"{i}.txt" for i in range(10, 20)})
+        for name in targets:
+            (tmp_path / name).write_text(name, encoding="utf-8")
+        plan = planner.plan(tmp_path, targets)
+
+        stats = RenameExecutor(jobs).execute(plan)
+
+        assert stats.qt_renames == plan.qt_renames
+        for source, target in targets.items():
+            assert (tmp_path / target).read_text(encoding="utf-8") == source
+
+    def test_execute_invalid_jobs_raises(self, tmp_path: Path, planner: RenamePlanner) -> None:
+        with pytest.raises(ValueError):
+            RenameExecutor(0).execute(planner.plan(tmp_path, {}))
@@ -0,0 +1,337 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,redefined-outer-name
+
+from pathlib import Path
+
+import pytest
+import typer
+
+from blossy.stddz.model import DedupMode, JournalKind, Rename
+from blossy.stddz.repository import RenameJournal
+from blossy.stddz.service import RenamePlanner
+from blossy.stddz.use_case import StandardizeUseCaseFactory
+
+
+@pytest.fixture()
+def directory(tmp_path: Path) -> Path:
+    directory = tmp_path / "files"
+    directory.mkdir()
+    for name in ("b.png", "a.jpg", "pic-001.png", "c.txt"):
+        (directory / name).write_text(name, encoding="utf-8")
+    (directory / "subdir").mkdir()
+    return directory
+
+
+@pytest.fixture()
+def journal(tmp_path: Path) -> RenameJournal:
+    return RenameJournal(tmp_path / "journal")
+
+
+def _contents(directory: Path) -> dict[str, str]:
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in directory.iterdir()
+        if path.is_file()
+    }
+
+
+class TestStandardizeUseCase:
+    def test_execute_renames_in_name_order(self, directory: Path, journal: RenameJournal) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal).execute("pic", directory)
+
+        assert _contents(directory) == {
+            "pic-000.jpg": "a.jpg",
+            "pic-001.png": "b.png",
+            "pic-002.txt": "c.txt",
+            "pic-003.png": "pic-001.png",
+        }
+        assert (directory / "subdir").is_dir()
+
+    def test_execute_twice_is_noop(self, directory: Path, journal: RenameJournal, capsys) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal).execute("pic", directory)
+        before = _contents(directory)
+        capsys.readouterr()
+
+        StandardizeUseCaseFactory.get_use_case(journal, dry_run=True).execute("pic", directory)
+
+        assert _contents(directory) == before
+        assert capsys.readouterr().out == "0 renames planned, 4 files already in place.\n"
+
+    def test_execute_dry_run_renames_nothing(
+        self, directory: Path, journal: RenameJournal, capsys
+    ) -> None:
+        before = _contents(directory)
+
+        StandardizeUseCaseFactory.get_use_case(journal, dry_run=True).execute("pic", directory)
+
+        assert _contents(directory) == before
+        assert "a.jpg -> pic-000.jpg" in capsys.readouterr().out
+
+    def test_execute_readjusts_digits(
+        self, directory: Path, journal: RenameJournal, capsys
+    ) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal).execute(
+            "pic", directory, start_idx=9, qt_digits=1
+        )
+
+        assert sorted(_contents(directory)) == [
+            "pic-09.jpg",
+            "pic-10.png",
+            "pic-11.txt",
+            "pic-12.png",
+        ]
+        assert capsys.readouterr().out.endswith("Quantity of digits had to be readjusted.\n")
+
+    def test_execute_negative_start_raises(self, directory: Path, journal: RenameJournal) -> None:
+        with pytest.raises(typer.BadParameter):
+            StandardizeUseCaseFactory.get_use_case(journal).execute("pic", directory, start_idx=-1)
+
+    def test_execute_concurrently_reports_throughput(
+        self, directory: Path, journal: RenameJournal, capsys
+    ) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal, jobs=4).execute("pic", directory)
+
+        assert sorted(_contents(directory)) == [
+            "pic-000.jpg",
+            "pic-001.png",
+            "pic-002.txt",
+            "pic-003.png",
+        ]
+        assert capsys.readouterr().out.startswith("4 renames in ")
+
+
+class TestStandardizeUseCaseJournal:
+    def test_execute_undo_restores_names(self, directory: Path, journal: RenameJournal) -> None:
+        before = _contents(directory)
+        StandardizeUseCaseFactory.get_use_case(journal).execute("pic", directory)
+
+        StandardizeUseCaseFactory.get_use_case(journal, undo=True).execute("pic", directory)
+
+        assert _contents(directory) == before
+
+    def test_execute_undo_keeps_files_created_since(
+        self, directory: Path, journal: RenameJournal
+    ) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal).execute("pic", directory)
+        (directory / "a.jpg").write_text("new", encoding="utf-8")
+        before = _contents(directory)
+
+        with pytest.raises(typer.BadParameter):
+            StandardizeUseCaseFactory.get_use_case(journal, undo=True).execute("pic", directory)
+
+        assert _contents(directory) == before
+
+    def test_execute_undo_twice_is_noop(
+        self, directory: Path, journal: RenameJournal, capsys
+    ) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal).execute("pic", directory)
+        StandardizeUseCaseFactory.get_use_case(journal, undo=True).execute("pic", directory)
+        before = _contents(directory)
+        capsys.readouterr()
+
+        StandardizeUseCaseFactory.get_use_case(journal, undo=True).execute("pic", directory)
+
+        assert _contents(directory) == before
+        assert capsys.readouterr().out == "Nothing to undo.\n"
+
+    def test_execute_resumes_interrupted_run(
+        self, directory: Path, journal: RenameJournal, capsys
+    ) -> None:
+        plan = RenamePlanner().plan(
+            directory.resolve(), {"a.jpg": "x.jpg", "b.png": "a.jpg", "c.txt": "y.txt"}
+        )
+        journal.begin(JournalKind.RUN, plan)
+        # the first rename of the chain is recorded, the second one happened but wasn't
+        first, second = plan.chains[0][0], plan.chains[0][1]
+        for step in (first, second):
+            (directory / step.source).rename(directory / step.target)
+        journal.record(first)
+        journal.end(complete=False)
+
+        StandardizeUseCaseFactory.get_use_case(journal).execute("pic", directory)
+
+        contents = _contents(directory)
+        assert capsys.readouterr().out.startswith("Resuming interrupted run.")
+        assert contents["x.jpg"] == "a.jpg"
+        assert contents["a.jpg"] == "b.png"
+        assert contents["y.txt"] == "c.txt"
+        assert "pic-000.jpg" not in contents
+
+    def test_execute_resume_keeps_files_created_since(
+        self, directory: Path, journal: RenameJournal
+    ) -> None:
+        plan = RenamePlanner().plan(directory.resolve(), {"a.jpg": "x.jpg", "c.txt": "y.txt"})
+        journal.begin(JournalKind.RUN, plan)
+        journal.end(complete=False)
+        (directory / "y.txt").write_text("new", encoding="utf-8")
+        before = _contents(directory)
+
+        with pytest.raises(typer.BadParameter):
+            StandardizeUseCaseFactory.get_use_case(journal).execute("pic", directory)
+
+        assert _contents(directory) == before
+
+    def test_execute_undo_interrupted_run(self, directory: Path, journal: RenameJournal) -> None:
+        before = _contents(directory)
+        plan = RenamePlanner().plan(directory.resolve(), {"a.jpg": "x.jpg", "c.txt": "y.txt"})
+        journal.begin(JournalKind.RUN, plan)
+        done = next(step for chain in plan.chains for step in chain if step.source == "a.jpg")
+        (directory / done.source).rename(directory / done.target)
+        journal.record(done)
+        journal.end(complete=False)
+
+        StandardizeUseCaseFactory.get_use_case(journal, undo=True).execute("pic", directory)
+
+        assert _contents(directory) == before
+        state = journal.load(directory.resolve())
+        assert state is not None
+        assert state.kind == JournalKind.UNDO
+        assert state.done == (Rename("x.jpg", "a.jpg"),)
+
+
+class TestStandardizeUseCaseRecursive:
+    @pytest.fixture()
+    def tree(self, tmp_path: Path) -> Path:
+        root = tmp_path / "tree"
+        for subdir, names in (("a", ["y.png", "x.png"]), ("b", ["z.txt"]), ("b/c", ["w.png"])):
+            (root / subdir).mkdir(parents=True)
+            for name in names:
+                (root / subdir / name).write_text(f"{subdir}/{name}", encoding="utf-8")
+        (root / "top.png").write_text("top.png", encoding="utf-8")
+        return root
+
+    def test_execute_independent_sequences(
+        self, tree: Path, journal: RenameJournal, capsys
+    ) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal, jobs=2, recursive=True).execute("pic", tree)
+
+        assert _contents(tree) == {"pic-000.png": "top.png"}
+        assert _contents(tree / "a") == {"pic-000.png": "a/x.png", "pic-001.png": "a/y.png"}
+        assert _contents(tree / "b") == {"pic-000.txt": "b/z.txt"}
+        assert _contents(tree / "b" / "c") == {"pic-000.png": "b/c/w.png"}
+        assert capsys.readouterr().out.startswith("5 renames in 4 directories in ")
+
+    def test_execute_global_sequence(self, tree: Path, journal: RenameJournal) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal, recursive=True, global_seq=True).execute(
+            "pic", tree, qt_digits=1
+        )
+
+        assert _contents(tree) == {"pic-0.png": "top.png"}
+        assert _contents(tree / "a") == {"pic-1.png": "a/x.png", "pic-2.png": "a/y.png"}
+        assert _contents(tree / "b") == {"pic-3.txt": "b/z.txt"}
+        assert _contents(tree / "b" / "c") == {"pic-4.png": "b/c/w.png"}
+
+    def test_execute_dry_run_shows_relative_paths(
+        self, tree: Path, journal: RenameJournal, capsys
+    ) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal, dry_run=True, recursive=True).execute(
+            "pic", tree
+        )
+
+        output = capsys.readouterr().out
+        assert "top.png -> pic-000.png" in output
+        assert "b/c/w.png -> b/c/pic-000.png" in output
+        assert output.endswith("5 renames planned in 4 directories, 0 files already in place.\n")
+        assert _contents(tree / "a") == {"x.png": "a/x.png", "y.png": "a/y.png"}
+
+    def test_execute_undo(self, tree: Path, journal: RenameJournal) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal, recursive=True).execute("pic", tree)
+
+        StandardizeUseCaseFactory.get_use_case(journal, jobs=2, undo=True, recursive=True).execute(
+            "pic", tree
+        )
+
+        assert _contents(tree) == {"top.png": "top.png"}
+        assert _contents(tree / "b" / "c") == {"w.png": "b/c/w.png"}
+
+    def test_global_sequence_without_recursive_raises(self, journal: RenameJournal) -> None:
+        with pytest.raises(ValueError):
+            StandardizeUseCaseFactory.get_use_case(journal, global_seq=True)
+
+
+class TestStandardizeUseCaseDedup:
+    @pytest.fixture()
+    def directory(self, tmp_path: Path) -> Path:
+        for name, content in (("a.png", "x"), ("b.png", "y"), ("c.png", "x"), ("d.jpg", "x")):
+            (tmp_path / name).write_text(content, encoding="utf-8")
+        return tmp_path / "."
+
+    def test_execute_report_keeps_everything(
+        self, directory: Path, journal: RenameJournal, capsys
+    ) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal, dedup_mode=DedupMode.REPORT).execute(
+            "pic", directory
+        )
+
+        output = capsys.readouterr().out
+        assert "c.png is a duplicate of a.png." in output
+        assert "2 duplicates found (2 bytes)." in output
+        assert sorted(_contents(directory)) == [
+            "pic-000.png",
+            "pic-001.png",
+            "pic-002.png",
+            "pic-003.jpg",
+        ]
+
+    def test_execute_delete_skips_ids(self, directory: Path, journal: RenameJournal) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal, dedup_mode=DedupMode.DELETE).execute(
+            "pic", directory
+        )
+
+        assert _contents(directory) == {"pic-000.png": "x", "pic-001.png": "y"}
+
+    def test_execute_hardlink_names_after_original(
+        self, directory: Path, journal: RenameJournal
+    ) -> None:
+        StandardizeUseCaseFactory.get_use_case(journal, dedup_mode=DedupMode.HARDLINK).execute(
+            "pic", directory
+        )
+
+        assert _contents(directory) == {
+            "pic-000.png": "x",
+            "pic-000_1.png": "x",
+            "pic-000_2.jpg": "x",
+            "pic-001.png": "y",
+        }
+        assert (directory / "pic-000.png").samefile(directory / "pic-000_2.jpg")
+
+    def test_execute_hardlink_twice_is_noop(
+        self, directory: Path, journal: RenameJournal, capsys
+    ) -> None:
+        use_case = StandardizeUseCaseFactory.get_use_case(journal, dedup_mode=DedupMode.HARDLINK)
+        use_case.execute("pic", directory)
+        before = sorted(path.name for path in directory.iterdir())
+        capsys.readouterr()
+
+        use_case.execute("pic", directory)
+
+        assert sorted(path.name for path in directory.iterdir()) == before
+        assert capsys.readouterr().out == "0 duplicates hardlinked (0 bytes freed).\n"
+
+    def test_execute_recursive_hardlink_keeps_duplicates(
+        self, tmp_path: Path, journal: RenameJournal
+    ) -> None:
+        subdir = tmp_path / "tree" / "sub"
+        subdir.mkdir(parents=True)
+        for name, content in (("a.png", "x"), ("b.png", "y"), ("pic-001.png", "x")):
+            (subdir / name).write_text(content, encoding="utf-8")
+
+        StandardizeUseCaseFactory.get_use_case(
+            journal, recursive=True, dedup_mode=DedupMode.HARDLINK
+        ).execute("pic", tmp_path / "tree")
+
+        assert _contents(subdir) == {"pic-000.png": "x", "pic-000_1.png": "x", "pic-001.png": "y"}
+        assert (subdir / "pic-000.png").samefile(subdir / "pic-000_1.png")
+
+    def test_execute_dry_run_changes_nothing(
+        self, directory: Path, journal: RenameJournal, capsys
+    ) -> None:
+        before = _contents(directory)
+
+        StandardizeUseCaseFactory.get_use_case(
+            journal, dry_run=True, dedup_mode=DedupMode.DELETE
+        ).execute("pic", directory)
+
+        assert _contents(directory) == before
+        output = capsys.readouterr().out
+        assert "2 duplicates to delete (2 bytes to free)." in output
+        assert "2 renames planned" in output